@@ -0,0 +1,33 @@
+"""Add stage_timings JSONB column to research_jobs table.
+
+Revision ID: b3c4d5e6f7a8
+Revises: 7f4bf2748828
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3c4d5e6f7a8'
+down_revision: Union[str, None] = '7f4bf2748828'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "research_jobs",
+        sa.Column(
+            "stage_timings",
+            postgresql.JSONB(astext_type=sa.Text()),
+            nullable=True,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("research_jobs", "stage_timings")
@@ -0,0 +1,39 @@
+"""Add suno_submitted_at and suno_next_poll_at to production_tracks table.
+
+Revision ID: d5e6f7a8b9c0
+Revises: c4d5e6f7a8b9
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5e6f7a8b9c0'
+down_revision: Union[str, None] = 'c4d5e6f7a8b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "production_tracks",
+        sa.Column("suno_submitted_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.add_column(
+        "production_tracks",
+        sa.Column("suno_next_poll_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "ix_production_tracks_suno_polling",
+        "production_tracks",
+        ["suno_status", "suno_next_poll_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_production_tracks_suno_polling", table_name="production_tracks")
+    op.drop_column("production_tracks", "suno_next_poll_at")
+    op.drop_column("production_tracks", "suno_submitted_at")
@@ -0,0 +1,44 @@
+"""Add kling_attempts, kling_submitted_at and kling_next_poll_at to production_scenes table.
+
+Revision ID: e6f7a8b9c0d1
+Revises: d5e6f7a8b9c0
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6f7a8b9c0d1'
+down_revision: Union[str, None] = 'd5e6f7a8b9c0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "production_scenes",
+        sa.Column("kling_attempts", sa.Integer(), nullable=True),
+    )
+    op.add_column(
+        "production_scenes",
+        sa.Column("kling_submitted_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.add_column(
+        "production_scenes",
+        sa.Column("kling_next_poll_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "ix_production_scenes_kling_polling",
+        "production_scenes",
+        ["kling_status", "kling_next_poll_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_production_scenes_kling_polling", table_name="production_scenes")
+    op.drop_column("production_scenes", "kling_next_poll_at")
+    op.drop_column("production_scenes", "kling_submitted_at")
+    op.drop_column("production_scenes", "kling_attempts")
@@ -1,6 +1,6 @@
 """
 Curation API endpoints — Guide §13
-Includes: start, list, get, approve, and edit brief.
+Includes: start, list, get, approve, edit and regenerate brief.
 """
 from datetime import datetime, timezone
 
@@ -153,6 +153,38 @@ async def edit_brief(
     return result.scalar_one()
 
 
+@router.post("/{job_id}/regenerate", response_model=CurationJobResponse)
+async def regenerate_brief(
+    job_id: UUID,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Re-run the briefing pipeline with a fresh Claude response.
+    Bypasses the response cache; status must be 'ready' or 'failed'.
+    """
+    result = await db.execute(
+        select(CurationJob).where(CurationJob.id == job_id)
+    )
+    job = result.scalar_one_or_none()
+    if not job:
+        raise HTTPException(status_code=404, detail="Curation job not found")
+    if job.status not in ("ready", "failed"):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Cannot regenerate in status '{job.status}'. Must be 'ready' or 'failed'.",
+        )
+
+    background_tasks.add_task(
+        run_briefing_pipeline,
+        str(job.id),
+        str(job.research_job_id),
+        job.selected_video_ids,
+        True,
+    )
+    return job
+
+
 @router.put("/{job_id}/approve", response_model=CurationJobResponse)
 async def approve_brief(
     job_id: UUID,
@@ -5,7 +5,8 @@ from sqlalchemy import text
 from app.db.session import get_db
 import redis.asyncio as redis
 from app.core.config import settings
-import httpx
+from app.services.http_clients import http_clients
+from app.services.llm_gateway import llm_gateway
 
 router = APIRouter()
 
@@ -37,18 +38,25 @@ async def health_check(db: AsyncSession = Depends(get_db)):
     health_status["redis"] = "disabled"
     # 3. Check CometAPI
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(
-                "https://api.cometapi.com/v1/dashboard/billing/subscription",
-                headers={"Authorization": f"Bearer {settings.COMETAPI_API_KEY}"}
-            )
-            if response.status_code == 200:
-                health_status["cometapi"] = "ok"
-            elif response.status_code == 401:
-                health_status["cometapi"] = "unauthorized"
-            else:
-                health_status["cometapi"] = f"api_error: {response.status_code}"
+        url = "https://api.cometapi.com/v1/dashboard/billing/subscription"
+        response = await http_clients.get(url).get(
+            url,
+            headers={"Authorization": f"Bearer {settings.COMETAPI_API_KEY}"},
+            timeout=5.0,
+        )
+        if response.status_code == 200:
+            health_status["cometapi"] = "ok"
+        elif response.status_code == 401:
+            health_status["cometapi"] = "unauthorized"
+        else:
+            health_status["cometapi"] = f"api_error: {response.status_code}"
     except Exception as e:
         health_status["cometapi"] = f"error: {str(e)}"
 
+    # 4. Claude gateway usage since process start
+    health_status["llm"] = llm_gateway.metrics()
+
+    # 5. Outbound connection pools (reuse per upstream host)
+    health_status["http"] = http_clients.metrics()
+
     return health_status
@@ -1,13 +1,17 @@
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import uuid
+from app.core.config import settings
 from app.db.session import get_db
 from app.models import ProductionJob, CurationJob, ProductionTrack, ProductionScene
 from pydantic import BaseModel
-from datetime import datetime
-# from tasks.production import start_production_job # Add this only when Stage 3 is ready
+from datetime import datetime, timezone
+from celery.result import AsyncResult
+from tasks.celery_app import celery_app
+from tasks.production import start_production_job
 
 router = APIRouter()
 
@@ -18,8 +22,9 @@ class ProductionJobResponse(BaseModel):
     id: uuid.UUID
     status: str
     created_at: datetime
-    num_scenes: int
+    num_scenes: Optional[int] = None
     num_tracks: int
+    pipeline_nodes: Optional[Dict[str, Any]] = None
 
     class Config:
         from_attributes = True
@@ -35,6 +40,8 @@ async def start_production(request: ProductionStartRequest, db: AsyncSession = D
     
     if not curation_job:
         raise HTTPException(status_code=404, detail="Curation job not found")
+    if not curation_job.user_approved_brief:
+        raise HTTPException(status_code=409, detail="Curation brief has not been approved")
     
     # Check if production job already exists
     result = await db.execute(select(ProductionJob).where(ProductionJob.curation_job_id == request.curation_job_id))
@@ -46,21 +53,62 @@ async def start_production(request: ProductionStartRequest, db: AsyncSession = D
     new_job = ProductionJob(
         curation_job_id=request.curation_job_id,
         status="pending",
-        num_scenes=len(curation_job.user_approved_brief.get('storyboard', [])),
+        num_scenes=len(curation_job.user_approved_brief.get('scenes', [])),
         num_tracks=1 # Default 1 track for now
     )
     db.add(new_job)
     await db.commit()
     await db.refresh(new_job)
 
-    # Trigger Celery task
-    # task = start_production_job.delay(str(new_job.id))
-    # new_job.celery_task_id = task.id
     new_job.status = "queued"
+    new_job.queued_at = datetime.now(timezone.utc)
     await db.commit()
 
+    # Trigger Celery task — it builds the production DAG and records its id
+    start_production_job.delay(str(new_job.id))
+
     return new_job
 
+async def _pipeline_dead(job: ProductionJob) -> bool:
+    """
+    True when no DAG can still be working on the job: its canvas ended in
+    FAILURE or was REVOKED without the job being marked failed, or it has
+    sat "queued" with no canvas for PRODUCTION_QUEUED_STALE_SEC (the start
+    task was lost before launching one).
+    """
+    if not job.celery_task_id:
+        if job.status != "queued" or job.queued_at is None:
+            return False
+        age = (datetime.now(timezone.utc) - job.queued_at).total_seconds()
+        return age >= settings.PRODUCTION_QUEUED_STALE_SEC
+    # Result-backend lookup is a blocking Redis call
+    state = await asyncio.to_thread(
+        lambda: AsyncResult(job.celery_task_id, app=celery_app).state
+    )
+    return state in ("FAILURE", "REVOKED")
+
+@router.post("/{job_id}/resume", response_model=ProductionJobResponse)
+async def resume_production(job_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    """
+    Resume a failed production job. Completed work (tracks, images, clips,
+    finished pipeline nodes) is kept; only missing steps are re-enqueued.
+    Jobs whose DAG may still be running are refused with 409 — a second DAG
+    would submit (and pay for) the same Suno, image and Kling work twice.
+    """
+    result = await db.execute(select(ProductionJob).where(ProductionJob.id == job_id))
+    job = result.scalar_one_or_none()
+    if not job:
+        raise HTTPException(status_code=404, detail="Production job not found")
+    if job.status != "failed" and not await _pipeline_dead(job):
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}; only failed jobs can be resumed")
+
+    job.status = "queued"
+    job.celery_task_id = None  # the new start task records its own canvas
+    job.queued_at = datetime.now(timezone.utc)
+    await db.commit()
+    start_production_job.delay(str(job.id))
+    return job
+
 @router.get("/")
 async def list_production_jobs(skip: int = 0, limit: int = 20, db: AsyncSession = Depends(get_db)):
     """
@@ -16,7 +16,7 @@ from app.core.config import settings
 from app.schemas.research import ResearchBriefResponse
 from app.services.intake_service import (
     generate_research_brief,
-    _extract_audio_metadata,
+    extract_audio_metadata,
 )
 from tasks.research import _orchestrate_research
 
@@ -30,6 +30,7 @@ class ResearchCreate(BaseModel):
     topic: str
     research_depth: str = "standard"
     research_brief: Optional[dict] = None
+    refresh_transcripts: bool = False  # bypass the transcript cache
 
 
 class ResearchVideoSchema(BaseModel):
@@ -53,6 +54,7 @@ class ResearchJobSchema(BaseModel):
     status: str
     genre_topic: str
     research_summary: str | None = None
+    stage_timings: dict | None = None
     created_at: datetime
 
     class Config:
@@ -109,7 +111,7 @@ async def create_research_brief(
         raw_audio = await reference_audio.read()
         if len(raw_audio) > MAX_AUDIO_SIZE:
             raise HTTPException(status_code=413, detail="Audio exceeds 20 MB limit.")
-        audio_meta = _extract_audio_metadata(raw_audio)
+        audio_meta = await extract_audio_metadata(raw_audio)
 
     # 3. Call Claude Sonnet via intake service
     try:
@@ -151,7 +153,11 @@ async def start_research(
 
     # Trigger Background task
     background_tasks.add_task(
-        _orchestrate_research, str(job.id), data.topic, data.research_brief
+        _orchestrate_research,
+        str(job.id),
+        data.topic,
+        data.research_brief,
+        data.refresh_transcripts,
     )
 
     return job
@@ -28,7 +28,87 @@ class Settings(BaseSettings):
     # Kling 3.0 Direct API (JWT auth)
     KLING_ACCESS_KEY: str = ""
     KLING_SECRET_KEY: str = ""
+    KLING_API_BASE: str = "https://api.klingai.com"
+    KLING_JWT_TTL_SEC: int = 1800
+    KLING_JWT_REFRESH_SEC: int = 300      # re-sign this long before expiry
     
+    # Shared Claude gateway — concurrency, TPM budget and retry policy
+    LLM_MAX_CONCURRENCY: int = 8          # per event loop (one per worker process)
+    LLM_MODEL_CONCURRENCY: int = 4        # per model, per event loop
+    LLM_TOKENS_PER_MINUTE: int = 400000
+    LLM_MAX_RETRIES: int = 5
+    LLM_TIMEOUT_SEC: float = 300.0
+    IMAGE_PROMPT_BATCH_SIZE: int = 8
+    CLAUDE_CACHE_TTL_HOURS: float = 168   # response cache in Redis; 0 disables
+    IMAGE_PROMPT_FALLBACK_CONCURRENCY: int = 4
+
+    # Vision input preparation (thumbnails sent to Claude)
+    VISION_MAX_EDGE: int = 768
+    VISION_JPEG_QUALITY: int = 80
+    VISION_IMAGE_CACHE_DIR: str = "./cache/vision"
+    VISION_IMAGE_CACHE_TTL_HOURS: float = 720
+    VISION_IMAGE_CACHE_MAX_MB: int = 256
+
+    # Audio analysis — tracks longer than this are analysed block by block
+    AUDIO_STREAMING_THRESHOLD_SEC: float = 600.0
+    AUDIO_STREAM_BLOCK_FRAMES: int = 1024
+
+    # Reference-audio intake (POST /api/research/brief) — runs in a process pool
+    AUDIO_INTAKE_WORKERS: int = 2
+    AUDIO_INTAKE_TIMEOUT_SEC: float = 20.0
+    AUDIO_INTAKE_WINDOW_SEC: float = 60.0  # only this much is decoded for BPM
+    AUDIO_INTAKE_SR: int = 11025
+
+    # Stage 3 production pipeline
+    # Central Suno poller: each track's poll interval starts at MIN and grows
+    # by SUNO_POLL_BACKOFF seconds per second of track age, capped at MAX
+    SUNO_POLL_MIN_INTERVAL_SEC: float = 5.0
+    SUNO_POLL_MAX_INTERVAL_SEC: float = 60.0
+    SUNO_POLL_BACKOFF: float = 0.1
+    SUNO_TRACK_TIMEOUT_SEC: float = 1200.0
+    SUNO_FEED_BATCH_SIZE: int = 20        # clip IDs per /feed request
+    # Central Kling scheduler (tasks/kling_poller.py), shared by all jobs:
+    # at most KLING_MAX_CONCURRENT_TASKS tasks in flight (the account's
+    # parallel-task quota); polls back off with task age like Suno's
+    KLING_MAX_CONCURRENT_TASKS: int = 5
+    KLING_POLL_MIN_INTERVAL_SEC: float = 10.0
+    KLING_POLL_MAX_INTERVAL_SEC: float = 60.0
+    KLING_POLL_BACKOFF: float = 0.1
+    KLING_TASK_TIMEOUT_SEC: float = 900.0
+    KLING_ATTEMPTS_PER_MODE: int = 2      # per step of the std/pro fallback chain
+    KLING_WAIT_TIMEOUT_SEC: float = 7200.0  # animate_scene falls back to Ken Burns after this
+    # A job still "queued" with no DAG id after this long lost its start task
+    PRODUCTION_QUEUED_STALE_SEC: float = 600.0
+    YOUTUBE_CREDENTIALS_PATH: str = "youtube_credentials.json"  # OAuth2 user creds for upload
+    YOUTUBE_UPLOAD_PRIVACY: str = "private"  # private | unlisted | public — public is an explicit opt-in
+
+    # Pooled outbound HTTP clients (app/services/http_clients.py), per upstream host
+    HTTP2_ENABLED: bool = True
+    HTTP_MAX_CONNECTIONS: int = 20
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    HTTP_KEEPALIVE_EXPIRY_SEC: float = 30.0
+    HTTP_CONNECT_TIMEOUT_SEC: float = 10.0
+    HTTP_TIMEOUT_SEC: float = 60.0        # default; calls may pass their own
+
+    # ffmpeg batch encodes (app/services/ffmpeg_service.py)
+    FFMPEG_MAX_PARALLEL: int = 0          # 0 = available cores // FFMPEG_THREADS_PER_ENCODE
+    FFMPEG_THREADS_PER_ENCODE: int = 2
+    FFMPEG_CLIP_RETRIES: int = 1
+    FFMPEG_CLIP_TIMEOUT_SEC: float = 600.0
+    # "clips": normalize each clip (cached), concat, then merge — Guide §9
+    # "single_pass": one filter_complex, every frame encoded once
+    # bench_assembly: single_pass ~1.7x faster than a cold clip run, on par
+    # with a warm-cache re-run; clips stays default for cheap re-assembly
+    ASSEMBLY_MODE: str = "clips"
+    # "numpy": app/services/ken_burns.py; "zoompan": the Guide §9 filter on an 8000px upscale
+    KEN_BURNS_ENGINE: str = "numpy"
+
+    # Generated-media downloads (app/services/downloader.py)
+    DOWNLOAD_CONCURRENCY: int = 8         # per worker process
+    DOWNLOAD_CHUNK_BYTES: int = 256 * 1024
+    DOWNLOAD_RETRIES: int = 3             # resumed with a Range request
+    DOWNLOAD_TIMEOUT_SEC: float = 120.0
+
     # Local storage for intermediate generation files
     JOB_FILES_DIR: str = "./jobs"
     
@@ -38,6 +118,23 @@ class Settings(BaseSettings):
     # Celery Performance
     CELERY_CONCURRENCY: int = 8
 
+    # Research engine (Stage 1) — worker pool and per-host rate limits
+    RESEARCH_MAX_WORKERS: int = 8
+    RESEARCH_SEARCH_CONCURRENCY: int = 4
+    RESEARCH_TRANSCRIPT_CONCURRENCY: int = 4
+    YOUTUBE_API_RATE_LIMIT: float = 5.0   # requests/sec to googleapis.com
+    YTDLP_RATE_LIMIT: float = 2.0         # requests/sec to youtube.com
+    YTDLP_MAX_WORKERS: int = 6            # curation metadata extraction pool
+
+    # Persistent transcript cache (keyed by video_id + language)
+    TRANSCRIPT_CACHE_DIR: str = "./cache/transcripts"
+    TRANSCRIPT_CACHE_TTL_HOURS: float = 720
+    TRANSCRIPT_CACHE_MAX_MB: int = 512
+
+    # Transcript condensation before AI analysis
+    RESEARCH_ANALYSIS_TOKEN_BUDGET: int = 12000
+    RESEARCH_CHUNK_WORDS: int = 150
+
     model_config = SettingsConfigDict(
         env_file=os.path.join(os.path.dirname(__file__), "..", "..", "..", "env", ".env"),
         env_file_encoding="utf-8",
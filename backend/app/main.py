@@ -21,6 +21,8 @@ logger = logging.getLogger(__name__)
 
 from app.api import health, research, curation, production
 from app.core.config import settings
+from app.services.http_clients import http_clients
+from app.services.intake_service import shutdown_audio_pool
 
 app = FastAPI(
     title="YouTube Movie Factory v3 API",
@@ -61,3 +63,5 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("YouTube Movie Factory API shutting down...")
+    shutdown_audio_pool()
+    await http_clients.aclose()
@@ -16,6 +16,7 @@ class ResearchJob(Base):
     error_message = Column(Text)
     research_summary = Column(Text)
     research_brief = Column(JSONB)
+    stage_timings = Column(JSONB)  # {"search_sec", "transcripts_sec", "analysis_sec", "total_sec"}
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     completed_at = Column(DateTime(timezone=True))
 
@@ -57,7 +58,7 @@ class ProductionJob(Base):
     __tablename__ = 'production_jobs'
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     curation_job_id = Column(UUID(as_uuid=True), ForeignKey('curation_jobs.id'))
-    status = Column(String(30))  # pending | generating_music | generating_images | animating | assembling | merging | uploading | published | failed
+    status = Column(String(30))  # pending | queued | generating_assets | directing | animating | assembling | uploading | completed | published | failed
     job_dir = Column(Text)
     num_tracks = Column(Integer, default=2)
     num_scenes = Column(Integer)
@@ -76,6 +77,8 @@ class ProductionJob(Base):
     file_size_bytes = Column(BigInteger)
     error_message = Column(Text)
     celery_task_id = Column(String(255))
+    queued_at = Column(DateTime(timezone=True))  # last start/resume request; cleared once the DAG is launched
+    pipeline_nodes = Column(JSONB)  # {node: {status, started_at, finished_at, error, ...}}
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     published_at = Column(DateTime(timezone=True))
 
@@ -87,6 +90,8 @@ class ProductionTrack(Base):
     song_prompt = Column(Text)
     suno_task_id = Column(String(255))
     suno_status = Column(String(20), default='pending')  # pending | processing | succeed | failed
+    suno_submitted_at = Column(DateTime(timezone=True))
+    suno_next_poll_at = Column(DateTime(timezone=True))  # set by the central Suno poller
     title = Column(Text)
     duration_seconds = Column(Numeric)
     audio_url = Column(Text)
@@ -129,7 +134,10 @@ class ProductionScene(Base):
     negative_prompt = Column(Text)
     kling_request_dur = Column(Integer)
     kling_task_id = Column(String(255))
-    kling_status = Column(String(20), default='pending')  # pending | submitted | processing | succeed | failed
+    kling_status = Column(String(20), default='pending')  # pending | queued | submitted | processing | succeed | failed
+    kling_attempts = Column(Integer, default=0)
+    kling_submitted_at = Column(DateTime(timezone=True))
+    kling_next_poll_at = Column(DateTime(timezone=True))  # set by the central Kling scheduler
     raw_video_url = Column(Text)
     raw_video_path = Column(Text)
     local_video_path = Column(Text)
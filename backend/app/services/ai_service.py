@@ -1,21 +1,34 @@
+import asyncio
 import logging
-from typing import List, Dict, Any
-from anthropic import AsyncAnthropic
+from typing import List, Dict, Any, Optional
 from app.core.config import settings
+from app.services.llm_gateway import llm_gateway
+from app.services.transcript_condenser import condense_transcripts
 
 logger = logging.getLogger(__name__)
 
 
 class AIService:
-    def __init__(self):
-        self.anthropic_api_key = settings.ANTHROPIC_API_KEY
-
-    async def analyze_transcripts(self, topic: str, transcripts: List[str]) -> Dict[str, Any]:
+    async def analyze_transcripts(
+        self,
+        topic: str,
+        transcripts: List[str],
+        research_brief: Optional[dict] = None,
+    ) -> Dict[str, Any]:
         """
         Analyze multiple transcripts to extract key insights and a summary.
-        Uses Anthropic SDK directly for reliability.
+        All transcripts are condensed to the most relevant passages within
+        RESEARCH_ANALYSIS_TOKEN_BUDGET before being sent.
+        Routed through the shared LLM gateway (pooling, limits, retries).
         """
-        combined_text = "\n\n---\n\n".join(transcripts[:3])
+        combined_text = await asyncio.to_thread(
+            condense_transcripts,
+            transcripts,
+            topic,
+            research_brief,
+            settings.RESEARCH_ANALYSIS_TOKEN_BUDGET,
+            settings.RESEARCH_CHUNK_WORDS,
+        )
 
         system_prompt = f"""
         You are an expert researcher for a YouTube documentary production.
@@ -31,8 +44,7 @@ class AIService:
         user_prompt = f"Topic: {topic}\n\nTranscripts:\n{combined_text}"
 
         try:
-            client = AsyncAnthropic(api_key=self.anthropic_api_key)
-            response = await client.messages.create(
+            response = await llm_gateway.create_message(
                 model=settings.CLAUDE_FAST_MODEL,
                 max_tokens=4000,
                 system=system_prompt,
@@ -1,50 +1,242 @@
+import os
+import zipfile
 import librosa
 import numpy as np
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from app.core.config import settings
 logger = logging.getLogger(__name__)
 
+# Fixed analysis parameters — every stage sees the same frame grid
+ANALYSIS_SR = 22050
+HOP_LENGTH = 512
+FADE_BUFFER_SEC = 2.0   # Reserve 2s at end for fade-out (Guide §5.3)
+FEATURES_SUFFIX = ".features.npz"
+TEMPOGRAM_BLOCK_FRAMES = 8192
+
+
 class AudioAnalysisService:
     def __init__(self):
         pass
 
-    def analyze_beats(self, audio_path: str) -> Dict[str, Any]:
+    def analyze(
+        self,
+        audio_path: str,
+        top_db: int = 30,
+        use_cache: bool = True,
+        streaming: Optional[bool] = None,
+    ) -> Dict[str, Any]:
         """
-        Analyze audio file to find tempo and beat timestamps.
-        Useful for syncing video cuts to music.
+        Decode the track once and compute tempo, beat times, onset times,
+        non-silent segments and the combined beat/onset boundary grid from a
+        single shared onset envelope.
+        Tracks longer than AUDIO_STREAMING_THRESHOLD_SEC (or streaming=True)
+        are analysed block by block with bounded memory; shorter ones are
+        loaded whole as mono float32 @ ANALYSIS_SR.
+        Feature arrays are persisted next to the audio as <audio>.features.npz
+        and reused by later stages while the audio file is unchanged.
         """
+        features_path = audio_path + FEATURES_SUFFIX
         try:
-            y, sr = librosa.load(audio_path)
-            tempo, beat_frames = librosa.beat.beat_track(y=y, sr=sr)
-            
-            # Convert beat frames to timestamps
-            beat_times = librosa.frames_to_time(beat_frames, sr=sr)
-            
-            return {
-                "tempo": float(tempo),
-                "beat_count": len(beat_times),
-                "beat_intervals": beat_times.tolist(),
-                "duration": float(librosa.get_duration(y=y, sr=sr))
-            }
+            if use_cache:
+                cached = self._load_features(audio_path, features_path, top_db)
+                if cached is not None:
+                    return cached
+
+            if streaming is None:
+                streaming = (
+                    librosa.get_duration(path=audio_path)
+                    > settings.AUDIO_STREAMING_THRESHOLD_SEC
+                )
+            if streaming:
+                features = self._compute_streaming(audio_path, top_db)
+            else:
+                features = self._compute_full(audio_path, top_db)
+
+            self._save_features(features_path, features)
+            return self._to_result(features)
         except Exception as e:
             logger.error(f"Audio analysis error for {audio_path}: {e}")
             return {"error": str(e)}
 
+    def _compute_full(self, audio_path: str, top_db: int) -> Dict[str, Any]:
+        """Whole-file decode at ANALYSIS_SR. Peak memory grows with track length."""
+        y, sr = librosa.load(audio_path, sr=ANALYSIS_SR, mono=True, dtype=np.float32)
+        duration = float(librosa.get_duration(y=y, sr=sr))
+
+        onset_env = librosa.onset.onset_strength(y=y, sr=sr, hop_length=HOP_LENGTH)
+        intervals = librosa.effects.split(y, top_db=top_db, hop_length=HOP_LENGTH)
+        segments = librosa.samples_to_time(intervals, sr=sr).reshape(-1, 2)
+        return self._features_from_envelope(onset_env, sr, HOP_LENGTH, duration, segments, top_db)
+
+    def _compute_streaming(self, audio_path: str, top_db: int) -> Dict[str, Any]:
+        """
+        Block-wise decode via librosa.stream at the file's native rate.
+        Only the per-frame onset envelope and RMS (one float per hop each)
+        are kept, so memory stays bounded regardless of track length.
+        """
+        sr = librosa.get_samplerate(audio_path)
+        # Scale the frame grid so time resolution matches the full-load path
+        hop_length = int(round(HOP_LENGTH * sr / ANALYSIS_SR))
+        frame_length = 4 * hop_length
+
+        onset_blocks = []
+        rms_blocks = []
+        stream = librosa.stream(
+            audio_path,
+            block_length=settings.AUDIO_STREAM_BLOCK_FRAMES,
+            frame_length=frame_length,
+            hop_length=hop_length,
+            mono=True,
+            fill_value=0,
+            dtype=np.float32,
+        )
+        for block in stream:
+            onset_blocks.append(librosa.onset.onset_strength(
+                y=block, sr=sr, n_fft=frame_length, hop_length=hop_length, center=False
+            ))
+            rms_blocks.append(librosa.feature.rms(
+                y=block, frame_length=frame_length, hop_length=hop_length, center=False
+            )[0])
+
+        onset_env = np.concatenate(onset_blocks)
+        rms = np.concatenate(rms_blocks)
+        duration = float(librosa.get_duration(path=audio_path))
+        # Uncentered frames are indexed by their first sample; shift to frame centres
+        time_offset = frame_length / 2 / sr
+
+        # Same criterion as librosa.effects.split: frames within top_db of the peak
+        non_silent = librosa.amplitude_to_db(rms, ref=np.max) > -top_db
+        edges = np.flatnonzero(np.diff(np.concatenate([[0], non_silent.astype(np.int8), [0]])))
+        frame_intervals = edges.reshape(-1, 2)
+        segments = np.clip(
+            librosa.frames_to_time(frame_intervals, sr=sr, hop_length=hop_length) + time_offset,
+            0.0,
+            duration,
+        ).reshape(-1, 2)
+        return self._features_from_envelope(
+            onset_env, sr, hop_length, duration, segments, top_db, time_offset
+        )
+
+    def _features_from_envelope(
+        self,
+        onset_env: np.ndarray,
+        sr: int,
+        hop_length: int,
+        duration: float,
+        segments: np.ndarray,
+        top_db: int,
+        time_offset: float = 0.0,
+    ) -> Dict[str, Any]:
+        tempo = self._estimate_tempo(onset_env, sr, hop_length)
+        _, beat_frames = librosa.beat.beat_track(
+            onset_envelope=onset_env, sr=sr, hop_length=hop_length, bpm=tempo
+        )
+        onset_frames = librosa.onset.onset_detect(
+            onset_envelope=onset_env, sr=sr, hop_length=hop_length, delta=0.05
+        )
+        return {
+            "duration": np.float64(duration),
+            "tempo": np.float64(np.squeeze(tempo)),
+            "beat_times": librosa.frames_to_time(beat_frames, sr=sr, hop_length=hop_length) + time_offset,
+            "onset_times": librosa.frames_to_time(onset_frames, sr=sr, hop_length=hop_length) + time_offset,
+            "segments": segments,
+            "top_db": np.int64(top_db),
+        }
+
+    def _estimate_tempo(self, onset_env: np.ndarray, sr: int, hop_length: int) -> float:
+        """
+        Global tempo from a block-averaged tempogram.
+        beat_track's own estimate builds a (384 x n_frames) float64 tempogram,
+        which dominates peak memory on long tracks; averaging per block gives
+        the same mean-aggregated estimate with bounded memory.
+        """
+        total = None
+        n_frames = 0
+        for start in range(0, len(onset_env), TEMPOGRAM_BLOCK_FRAMES):
+            tg = librosa.feature.tempogram(
+                onset_envelope=onset_env[start:start + TEMPOGRAM_BLOCK_FRAMES],
+                sr=sr,
+                hop_length=hop_length,
+            )
+            block_sum = tg.sum(axis=1, keepdims=True)
+            total = block_sum if total is None else total + block_sum
+            n_frames += tg.shape[1]
+        tempo = librosa.feature.tempo(tg=total / n_frames, sr=sr, hop_length=hop_length)
+        return float(np.squeeze(tempo))
+
+    def analyze_beats(self, audio_path: str) -> Dict[str, Any]:
+        """
+        Analyze audio file to find tempo and beat timestamps.
+        Useful for syncing video cuts to music.
+        """
+        result = self.analyze(audio_path)
+        if "error" in result:
+            return result
+        return {
+            "tempo": result["tempo_bpm"],
+            "beat_count": len(result["beat_times"]),
+            "beat_intervals": result["beat_times"],
+            "duration": result["audio_duration_sec"],
+        }
+
     def extract_segments(self, audio_path: str, top_db: int = 30) -> List[Dict[str, Any]]:
         """
         Detect non-silent segments in the audio.
         """
-        try:
-            y, sr = librosa.load(audio_path)
-            intervals = librosa.effects.split(y, top_db=top_db)
-            times = librosa.frames_to_time(intervals, sr=sr)
-            
-            return [
-                {"start": float(start), "end": float(end)} 
-                for start, end in times
-            ]
-        except Exception as e:
-            logger.error(f"Segment extraction error: {e}")
+        result = self.analyze(audio_path, top_db=top_db)
+        if "error" in result:
             return []
+        return result["segments"]
+
+    def _to_result(self, features: Dict[str, Any]) -> Dict[str, Any]:
+        beat_times = features["beat_times"]
+        onset_times = features["onset_times"]
+        tempo = float(features["tempo"])
+        duration = float(features["duration"])
+
+        # Combined sorted boundary grid (Guide §5.3)
+        boundaries = np.unique(np.concatenate([beat_times, onset_times]))
+        boundaries = np.concatenate([[0.0], boundaries[boundaries > 0.05]])
+
+        return {
+            "audio_duration_sec": duration,
+            "tempo_bpm": tempo,
+            "beat_interval_sec": 60.0 / tempo if tempo > 0 else 0.0,
+            "beat_times": beat_times.tolist(),
+            "onset_times": onset_times.tolist(),
+            "all_boundaries": boundaries.tolist(),
+            "usable_duration_sec": duration - FADE_BUFFER_SEC,
+            "segments": [
+                {"start": float(start), "end": float(end)}
+                for start, end in features["segments"]
+            ],
+        }
+
+    def _load_features(self, audio_path: str, features_path: str, top_db: int):
+        """Cached features, or None (recompute) if missing, stale or unreadable."""
+        try:
+            if os.path.getmtime(features_path) < os.path.getmtime(audio_path):
+                return None
+        except OSError:
+            return None
+        try:
+            with np.load(features_path) as data:
+                features = {key: data[key] for key in data.files}
+            if int(features.get("top_db", -1)) != top_db:
+                return None
+            return self._to_result(features)
+        except (OSError, ValueError, EOFError, KeyError, IndexError, zipfile.BadZipFile) as e:
+            # Truncated or corrupt archive — treat as a miss; the rewrite replaces it
+            logger.warning(f"Ignoring unreadable audio feature cache {features_path}: {e}")
+            return None
+
+    def _save_features(self, features_path: str, features: Dict[str, Any]):
+        tmp_path = features_path + ".tmp.npz"
+        try:
+            np.savez(tmp_path, **features)
+            os.replace(tmp_path, features_path)
+        except OSError as e:
+            logger.warning(f"Could not persist audio features to {features_path}: {e}")
 
 audio_analysis_service = AudioAnalysisService()
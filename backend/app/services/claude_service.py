@@ -3,17 +3,17 @@ Claude AI service — Creative Brief generation with vision input.
 Guide §3.4 — Generates structured Creative Brief JSON from inspiration video metadata.
 Also contains music prompt and image prompt generators for Stage 3.
 """
+import asyncio
 import json
 import logging
-from typing import Any
+from typing import Any, Callable
 
-from anthropic import AsyncAnthropic
 from app.core.config import settings
+from app.services.llm_gateway import llm_gateway
+from app.services.response_cache import response_cache
 
 logger = logging.getLogger(__name__)
 
-client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
-
 # ---------------------------------------------------------------------------
 # §3.4 — Creative Brief System Prompt
 # ---------------------------------------------------------------------------
@@ -68,6 +68,17 @@ The prompt must specify: art style, subject, setting, lighting, camera angle,
 colour palette, mood. Under 120 words. No negative prompts here.
 """.strip()
 
+IMAGE_PROMPT_BATCH_SYSTEM = """
+You are a visual art director. Given an overall theme and a numbered list of
+scene descriptions, generate one detailed image generation prompt per scene,
+each optimised for a 16:9 cinematic still.
+Return ONLY a JSON array, one object per scene in the order given:
+[{"scene_number": int, "prompt": "string"}]
+No markdown fences, no prose.
+Each prompt must specify: art style, subject, setting, lighting, camera angle,
+colour palette, mood. Under 120 words. No negative prompts here.
+""".strip()
+
 # ---------------------------------------------------------------------------
 # §7.1 — Creative Direction System
 # ---------------------------------------------------------------------------
@@ -92,6 +103,65 @@ RULES:
 - Always include in negative_prompt: distortion, watermark, face morphing
 """.strip()
 
+# ---------------------------------------------------------------------------
+# §10.1 — SEO Metadata System
+# ---------------------------------------------------------------------------
+
+SEO_SYSTEM = """
+You are a YouTube SEO specialist. Given a music video brief, generate optimised
+YouTube metadata. Return ONLY valid JSON with this exact schema:
+{
+  "title": "string — max 70 chars, compelling, keyword-rich",
+  "description": "string — 3-5 sentences, includes keywords naturally, no spam",
+  "tags": ["string", ...],
+  "hashtags": ["#string", ...],
+  "category_id": "10"
+}
+tags: 10-15, mix of broad and specific. hashtags: 5-8, for the description footer.
+category_id 10 = Music.
+Do not include 'AI generated' or 'AI video' in the title — it suppresses reach.
+""".strip()
+
+
+
+# ---------------------------------------------------------------------------
+# Cached Claude calls
+# ---------------------------------------------------------------------------
+
+def _parse_json(raw: str) -> Any:
+    """Parse a JSON response, stripping any accidental markdown fences."""
+    if raw.startswith("```"):
+        raw = raw.split("```")[1]
+        if raw.startswith("json"):
+            raw = raw[4:]
+        raw = raw.strip()
+    return json.loads(raw)
+
+
+async def _complete(
+    parse: Callable[[str], Any] | None = None,
+    bypass_cache: bool = False,
+    **request: Any,
+) -> Any:
+    """
+    Call Claude through the gateway with the response cache in front.
+    `parse` turns the raw text into the return value; only responses that
+    parse cleanly are cached. bypass_cache skips the lookup (user-requested
+    regeneration) but still stores the fresh response.
+    """
+    key = response_cache.key(request)
+    if not bypass_cache:
+        cached = await response_cache.get(key)
+        if cached is not None:
+            logger.info(f"Claude response cache hit ({request['model']})")
+            return parse(cached) if parse else cached
+
+    response = await llm_gateway.create_message(**request)
+    raw = response.content[0].text.strip()
+    result = parse(raw) if parse else raw
+    await response_cache.set(key, raw)
+    return result
+
 
 # ---------------------------------------------------------------------------
 # Main Creative Brief Generation (Stage 2)
@@ -102,6 +172,7 @@ async def generate_creative_brief(
     genre_mood: str,
     num_scenes: int,
     audio_duration_hint: float,
+    bypass_cache: bool = False,
 ) -> dict:
     """
     Generate a structured Creative Brief from inspiration video metadata.
@@ -128,7 +199,7 @@ async def generate_creative_brief(
                 "type": "image",
                 "source": {
                     "type": "base64",
-                    "media_type": "image/jpeg",
+                    "media_type": v.get("thumbnail_media_type", "image/jpeg"),
                     "data": v["thumbnail_b64"],
                 },
             })
@@ -141,28 +212,23 @@ async def generate_creative_brief(
         ),
     })
 
-    response = await client.messages.create(
+    return await _complete(
+        parse=_parse_json,
+        bypass_cache=bypass_cache,
         model=settings.CLAUDE_CREATIVE_MODEL,
         max_tokens=6000,
         system=BRIEF_SYSTEM,
         messages=[{"role": "user", "content": content}],
     )
 
-    raw = response.content[0].text.strip()
-    # Strip any accidental markdown fences
-    if raw.startswith("```"):
-        raw = raw.split("```")[1]
-        if raw.startswith("json"):
-            raw = raw[4:]
-        raw = raw.strip()
-    return json.loads(raw)
-
 
 # ---------------------------------------------------------------------------
 # Music Prompt Generation (Stage 3 — Phase A)
 # ---------------------------------------------------------------------------
 
-async def generate_music_prompts(brief: dict, num_tracks: int) -> list[str]:
+async def generate_music_prompts(
+    brief: dict, num_tracks: int, bypass_cache: bool = False
+) -> list[str]:
     """Generate Suno V5 music prompts from Creative Brief. Guide §5.2"""
     md = brief.get("suno_music_direction", {})
     prompt = (
@@ -172,47 +238,111 @@ async def generate_music_prompts(brief: dict, num_tracks: int) -> list[str]:
         f"Style tags: {', '.join(md.get('style_tags', []))}\n"
         f"Generate {num_tracks} distinct Suno V5 instrumental prompts."
     )
-    response = await client.messages.create(
+    return await _complete(
+        parse=_parse_json,
+        bypass_cache=bypass_cache,
         model=settings.CLAUDE_CREATIVE_MODEL,
         max_tokens=800,
         system=MUSIC_PROMPT_SYSTEM,
         messages=[{"role": "user", "content": prompt}],
     )
-    raw = response.content[0].text.strip()
-    if raw.startswith("```"):
-        raw = raw.split("```")[1].lstrip("json").strip()
-    return json.loads(raw)
 
 
 # ---------------------------------------------------------------------------
 # Image Prompt Generation (Stage 3 — Phase B)
 # ---------------------------------------------------------------------------
 
-async def generate_image_prompts(brief: dict) -> list[str]:
-    """Generate one image prompt per scene. Guide §6.1"""
-    theme = brief["theme"]
-    palette = ", ".join(brief.get("palette", []))
-    prompts = []
-
-    for scene in brief["scenes"]:
-        user_msg = (
-            f"Theme: {theme}\n"
-            f"Palette: {palette}\n"
-            f"Scene: {scene['description']}\n"
-            f"Mood: {brief.get('mood', '')}\n"
-            "Generate a 16:9 cinematic image generation prompt for this scene."
-        )
-        r = await client.messages.create(
+async def generate_image_prompts(brief: dict, bypass_cache: bool = False) -> list[str]:
+    """
+    Generate one image prompt per scene, in scene order. Guide §6.1
+    Scenes are sent IMAGE_PROMPT_BATCH_SIZE at a time as structured
+    multi-scene calls (run concurrently); any scene missing or malformed in a
+    batch response is regenerated with a single-scene call.
+    """
+    scenes = brief["scenes"]
+    size = settings.IMAGE_PROMPT_BATCH_SIZE
+    batches = [
+        list(range(start, min(start + size, len(scenes))))
+        for start in range(0, len(scenes), size)
+    ]
+    batch_results = await asyncio.gather(
+        *(_image_prompt_batch(brief, scenes, indices, bypass_cache) for indices in batches)
+    )
+
+    prompts: dict[int, str] = {}
+    for result in batch_results:
+        prompts.update(result)
+
+    missing = [i for i in range(len(scenes)) if i not in prompts]
+    if missing:
+        logger.warning(f"Image prompt batch missed {len(missing)} scenes; falling back per scene")
+        semaphore = asyncio.Semaphore(settings.IMAGE_PROMPT_FALLBACK_CONCURRENCY)
+
+        async def single(i: int):
+            async with semaphore:
+                prompts[i] = await _image_prompt_single(brief, scenes[i], bypass_cache)
+
+        await asyncio.gather(*(single(i) for i in missing))
+
+    return [prompts[i] for i in range(len(scenes))]
+
+
+async def _image_prompt_batch(
+    brief: dict, scenes: list[dict], indices: list[int], bypass_cache: bool = False
+) -> dict[int, str]:
+    """One structured call for several scenes. Returns {scene index: prompt} for valid entries."""
+    # Number scenes by position so the mapping back never depends on brief numbering
+    scene_lines = "\n".join(
+        f"Scene {i + 1}: {scenes[i]['description']}" for i in indices
+    )
+    user_msg = (
+        f"Theme: {brief['theme']}\n"
+        f"Palette: {', '.join(brief.get('palette', []))}\n"
+        f"Mood: {brief.get('mood', '')}\n\n"
+        f"{scene_lines}\n\n"
+        f"Generate a 16:9 cinematic image generation prompt for each of these {len(indices)} scenes."
+    )
+    try:
+        entries = await _complete(
+            parse=_parse_json,
+            bypass_cache=bypass_cache,
             model=settings.CLAUDE_CREATIVE_MODEL,
-            max_tokens=200,
-            system=IMAGE_PROMPT_SYSTEM,
+            max_tokens=220 * len(indices),
+            system=IMAGE_PROMPT_BATCH_SYSTEM,
             messages=[{"role": "user", "content": user_msg}],
         )
-        prompts.append(r.content[0].text.strip())
-
+    except Exception as e:
+        logger.warning(f"Image prompt batch for scenes {indices[0] + 1}-{indices[-1] + 1} failed: {e}")
+        return {}
+
+    wanted = set(indices)
+    prompts = {}
+    for entry in entries if isinstance(entries, list) else []:
+        if not isinstance(entry, dict):
+            continue
+        number, prompt = entry.get("scene_number"), entry.get("prompt")
+        if isinstance(number, int) and (number - 1) in wanted and isinstance(prompt, str) and prompt.strip():
+            prompts[number - 1] = prompt.strip()
     return prompts
 
 
+async def _image_prompt_single(brief: dict, scene: dict, bypass_cache: bool = False) -> str:
+    user_msg = (
+        f"Theme: {brief['theme']}\n"
+        f"Palette: {', '.join(brief.get('palette', []))}\n"
+        f"Scene: {scene['description']}\n"
+        f"Mood: {brief.get('mood', '')}\n"
+        "Generate a 16:9 cinematic image generation prompt for this scene."
+    )
+    return await _complete(
+        bypass_cache=bypass_cache,
+        model=settings.CLAUDE_CREATIVE_MODEL,
+        max_tokens=200,
+        system=IMAGE_PROMPT_SYSTEM,
+        messages=[{"role": "user", "content": user_msg}],
+    )
+
+
 # ---------------------------------------------------------------------------
 # Per-Scene Creative Direction (Stage 3 — Phase C)
 # ---------------------------------------------------------------------------
@@ -224,9 +354,12 @@ async def direct_scene(
     beat_start: float,
     beat_end: float,
     has_image_tail: bool,
+    bypass_cache: bool = False,
 ) -> dict:
     """AI creative direction for a single scene. Guide §7.1"""
-    response = await client.messages.create(
+    return await _complete(
+        parse=_parse_json,
+        bypass_cache=bypass_cache,
         model=settings.CLAUDE_CREATIVE_MODEL,
         max_tokens=400,
         system=DIRECTION_SYSTEM,
@@ -252,7 +385,29 @@ async def direct_scene(
             },
         ]}],
     )
-    raw = response.content[0].text.strip()
-    if raw.startswith("```"):
-        raw = raw.split("```")[1].lstrip("json").strip()
-    return json.loads(raw)
+
+
+# ---------------------------------------------------------------------------
+# SEO Metadata (Stage 3 — Phase F)
+# ---------------------------------------------------------------------------
+
+async def generate_seo_metadata(brief: dict, bypass_cache: bool = False) -> dict:
+    """YouTube title/description/tags/hashtags for the finished video. Guide §10.1"""
+    scenes = brief.get("scenes", [])
+    total_sec = sum(float(s.get("target_duration_sec") or 0) for s in scenes)
+    prompt = (
+        f"Music video brief:\n"
+        f"Theme: {brief.get('theme', '')}\n"
+        f"Genre: {brief.get('genre', '')}\n"
+        f"Mood: {brief.get('mood', '')}\n"
+        f"Scenes: {len(scenes)} scenes, {total_sec:.0f}s\n"
+        "Generate YouTube SEO metadata."
+    )
+    return await _complete(
+        parse=_parse_json,
+        bypass_cache=bypass_cache,
+        model=settings.CLAUDE_CREATIVE_MODEL,
+        max_tokens=600,
+        system=SEO_SYSTEM,
+        messages=[{"role": "user", "content": prompt}],
+    )
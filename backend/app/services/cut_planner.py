@@ -0,0 +1,113 @@
+"""
+Beat-matched scene cut planning (Guide §5.3).
+Chooses every scene's end cut jointly: candidate cuts per scene come from
+np.searchsorted over the sorted beat/onset boundary grid, and a dynamic
+programming pass picks the sequence that minimises total duration drift
+subject to the 3s minimum scene length and the fade-out buffer.
+Output rows match the guide's assign_scene_cuts().
+"""
+import logging
+from typing import Any, Dict, List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MIN_SCENE_SEC = 3.0
+# Extra cost (seconds of drift) for cutting off the boundary grid
+OFF_GRID_PENALTY_SEC = 1.0
+# Candidate window when the track has no usable tempo
+MIN_WINDOW_SEC = 0.5
+
+
+def plan_scene_cuts(
+    analysis: Dict[str, Any],
+    scene_targets: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """
+    Snap scene boundaries to the beat/onset grid with minimum total drift.
+
+    analysis:      output of audio_analysis_service.analyze()
+    scene_targets: ordered [{scene_number, target_duration_sec}]
+
+    Returns [{scene_number, beat_start_sec, beat_end_sec, beat_duration_sec,
+    beat_drift_ms}] in scene order. Targets that overrun usable_duration_sec
+    are scaled down to fit; raises ValueError when not even MIN_SCENE_SEC
+    per scene fits.
+    """
+    n = len(scene_targets)
+    if n == 0:
+        return []
+
+    usable = float(analysis["usable_duration_sec"])
+    if n * MIN_SCENE_SEC > usable:
+        raise ValueError(
+            f"{n} scenes need at least {n * MIN_SCENE_SEC:.1f}s; "
+            f"only {usable:.1f}s of audio is usable"
+        )
+
+    boundaries = np.asarray(analysis["all_boundaries"], dtype=np.float64)
+    window = max(float(analysis.get("beat_interval_sec") or 0.0) * 1.5, MIN_WINDOW_SEC)
+
+    targets = np.array([float(s["target_duration_sec"]) for s in scene_targets])
+    if targets.sum() > usable:
+        logger.warning(
+            f"Scene targets sum to {targets.sum():.1f}s > usable {usable:.1f}s; scaling down"
+        )
+        targets *= usable / targets.sum()
+
+    # Earliest/latest end for each scene that still leaves room for the others
+    index = np.arange(1, n + 1)
+    earliest = index * MIN_SCENE_SEC
+    latest = usable - (n - index) * MIN_SCENE_SEC
+
+    # Feasible off-grid anchor per scene: cumulative ideal end, pushed apart
+    # to honour the minimum and clipped to the latest allowed end
+    anchors = np.minimum(np.cumsum(targets), latest)
+    anchors = np.maximum.accumulate(np.maximum(anchors - earliest, 0.0)) + earliest
+
+    # Boundary candidates inside [anchor ± window] ∩ [earliest, latest]
+    lo = np.searchsorted(boundaries, np.maximum(anchors - window, earliest), side="left")
+    hi = np.searchsorted(boundaries, np.minimum(anchors + window, latest), side="right")
+
+    prev_cuts = np.zeros(1)
+    prev_cost = np.zeros(1)
+    candidates = []
+    back_pointers = []
+    for i in range(n):
+        cuts = np.append(boundaries[lo[i]:hi[i]], anchors[i])
+        penalty = np.zeros(len(cuts))
+        penalty[-1] = OFF_GRID_PENALTY_SEC
+
+        durations = cuts[None, :] - prev_cuts[:, None]
+        cost = prev_cost[:, None] + np.abs(durations - targets[i]) + penalty[None, :]
+        cost[durations < MIN_SCENE_SEC - 1e-9] = np.inf
+
+        best_prev = np.argmin(cost, axis=0)
+        prev_cost = cost[best_prev, np.arange(len(cuts))]
+        prev_cuts = cuts
+        candidates.append(cuts)
+        back_pointers.append(best_prev)
+
+    # Walk back from the cheapest final cut
+    ends = np.empty(n)
+    k = int(np.argmin(prev_cost))
+    for i in range(n - 1, -1, -1):
+        ends[i] = candidates[i][k]
+        k = int(back_pointers[i][k])
+
+    ends = np.round(ends, 4)
+    starts = np.concatenate([[0.0], ends[:-1]])
+    durations = np.round(ends - starts, 4)
+    drift_ms = np.round((durations - targets) * 1000, 1)
+
+    return [
+        {
+            "scene_number": scene["scene_number"],
+            "beat_start_sec": float(starts[i]),
+            "beat_end_sec": float(ends[i]),
+            "beat_duration_sec": float(durations[i]),
+            "beat_drift_ms": float(drift_ms[i]),
+        }
+        for i, scene in enumerate(scene_targets)
+    ]
@@ -0,0 +1,126 @@
+"""
+Streaming downloads of generated media (Suno audio, generated images,
+animation clips) into a job directory.
+Bodies are streamed to "<dest>.part" in DOWNLOAD_CHUNK_BYTES chunks, never
+buffered whole, and renamed into place only once the byte count matches
+the advertised length and the Content-Type is plausible. A dropped
+connection resumes from the partial file with an HTTP Range request.
+At most DOWNLOAD_CONCURRENCY downloads run at once per event loop; they
+share the pooled per-host clients from app.services.http_clients.
+"""
+import asyncio
+import logging
+import os
+import re
+import weakref
+from typing import Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+
+from app.core.config import settings
+from app.services.http_clients import http_clients
+
+logger = logging.getLogger(__name__)
+
+# CDNs often serve generated media without a specific type
+GENERIC_CONTENT_TYPES = ("application/octet-stream", "binary/octet-stream")
+
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+class DownloadError(Exception):
+    """The response was unusable: wrong type, short body or failed request."""
+
+
+def url_suffix(url: str, default: str) -> str:
+    """File extension of the URL path, or default if it has none."""
+    suffix = os.path.splitext(urlparse(url).path)[1].lower()
+    return suffix if 1 < len(suffix) <= 5 else default
+
+
+def _semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    sem = _semaphores.get(loop)
+    if sem is None:
+        sem = asyncio.Semaphore(settings.DOWNLOAD_CONCURRENCY)
+        _semaphores[loop] = sem
+    return sem
+
+
+def _check_content_type(response: httpx.Response, expected: Optional[str], url: str):
+    if not expected:
+        return
+    content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type and not content_type.startswith(expected) and content_type not in GENERIC_CONTENT_TYPES:
+        raise DownloadError(f"Expected {expected}* from {url}, got {content_type}")
+
+
+def _expected_total(response: httpx.Response, offset: int) -> Optional[int]:
+    """Full file size from Content-Range (206) or Content-Length (200)."""
+    if response.status_code == 206:
+        match = re.search(r"/(\d+)$", response.headers.get("content-range", ""))
+        return int(match.group(1)) if match else None
+    length = response.headers.get("content-length")
+    # Compressed bodies decode to a different size than Content-Length
+    if length is None or response.headers.get("content-encoding"):
+        return None
+    return int(length)
+
+
+async def _fetch(client: httpx.AsyncClient, url: str, part_path: str, expected_type: Optional[str]) -> Tuple[int, Optional[int]]:
+    """Stream url into part_path, resuming from its current size. Returns (written, expected)."""
+    offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    headers = {"Range": f"bytes={offset}-"} if offset else {}
+
+    async with client.stream(
+        "GET", url, headers=headers,
+        follow_redirects=True, timeout=settings.DOWNLOAD_TIMEOUT_SEC,
+    ) as response:
+        if response.status_code == 416:
+            # Partial file is already complete (or stale) — start over
+            os.remove(part_path)
+            raise httpx.TransportError("Range not satisfiable, restarting")
+        response.raise_for_status()
+        _check_content_type(response, expected_type, url)
+
+        if response.status_code != 206:
+            offset = 0  # server ignored the Range header
+        expected = _expected_total(response, offset)
+        with open(part_path, "ab" if offset else "wb") as f:
+            async for chunk in response.aiter_bytes(settings.DOWNLOAD_CHUNK_BYTES):
+                f.write(chunk)
+        return os.path.getsize(part_path), expected
+
+
+async def download(url: str, dest_path: str, expected_type: Optional[str] = None) -> str:
+    """
+    Download url to dest_path atomically. expected_type is a Content-Type
+    prefix such as "image/" or "audio/"; anything else (e.g. an HTML error
+    page) raises DownloadError. Transport errors and short bodies are
+    retried up to DOWNLOAD_RETRIES times, resuming where they stopped.
+    """
+    part_path = dest_path + ".part"
+    client = http_clients.get(url)
+    async with _semaphore():
+        for attempt in range(settings.DOWNLOAD_RETRIES + 1):
+            try:
+                written, expected = await _fetch(client, url, part_path, expected_type)
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                if isinstance(e, httpx.HTTPStatusError) and e.response.status_code < 500:
+                    raise DownloadError(f"Download of {url} failed: {e}") from e
+                error = str(e)
+            else:
+                if written == 0:
+                    error = "empty body"
+                elif expected is not None and written != expected:
+                    error = f"got {written} of {expected} bytes"
+                else:
+                    os.replace(part_path, dest_path)
+                    return dest_path
+            logger.warning(f"Download of {url} interrupted ({error}), attempt {attempt + 1}")
+            await asyncio.sleep(min(2 ** attempt, 10))
+
+    raise DownloadError(f"Download of {url} failed after {settings.DOWNLOAD_RETRIES + 1} attempts: {error}")
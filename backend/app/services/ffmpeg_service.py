@@ -0,0 +1,413 @@
+"""
+FFmpeg operations for Stage 3 Phase E (Guide §9): audio concatenation,
+Ken Burns fallback, frame-perfect trim + normalize, concat and final merge.
+All functions are blocking subprocess calls — run them from worker threads.
+"""
+import hashlib
+import json
+import logging
+import os
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+TARGET_RES = "1920:1080"
+TARGET_FPS = "24"
+FADE_SEC = 2.0
+NORM_CRF = 17
+NORM_PRESET = "fast"
+
+KEN_BURNS_DIRECTIONS = ("zoom_in", "zoom_out", "pan_right", "pan_left")
+
+
+def _run(cmd: List[str], what: str, tail: int = 300, timeout: Optional[float] = None):
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        raise RuntimeError(f"{what} timed out after {timeout:.0f}s")
+    if result.returncode != 0:
+        raise RuntimeError(f"{what} failed: {result.stderr[-tail:]}")
+
+
+def available_cores() -> int:
+    """CPUs this process may run on (respects affinity / container cpusets)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def encode_slots() -> tuple:
+    """
+    (parallel ffmpeg processes, -threads per process) for batch encodes, so
+    processes x threads stays within the cores instead of every ffmpeg
+    spawning one thread per core.
+    """
+    cores = available_cores()
+    threads = max(1, min(settings.FFMPEG_THREADS_PER_ENCODE, cores))
+    workers = settings.FFMPEG_MAX_PARALLEL or max(1, cores // threads)
+    return workers, threads
+
+
+def _concat_list(paths: List[str], list_path: str) -> str:
+    with open(list_path, "w") as f:
+        for path in paths:
+            escaped = os.path.abspath(path).replace("'", r"'\''")
+            f.write(f"file '{escaped}'\n")
+    return list_path
+
+
+def _normalize_filter() -> str:
+    return (
+        f"scale={TARGET_RES}:force_original_aspect_ratio=decrease,"
+        f"pad={TARGET_RES}:(ow-iw)/2:(oh-ih)/2:color=black,"
+        f"setsar=1,"
+        f"fps={TARGET_FPS}"
+    )
+
+
+def concatenate_audio_tracks(track_paths: List[str], output_path: str) -> str:
+    """Join Suno tracks end to end (same codec, so stream copy is exact for audio)."""
+    if len(track_paths) == 1:
+        _run(
+            ["ffmpeg", "-y", "-i", track_paths[0], "-c", "copy", output_path, "-loglevel", "error"],
+            "concatenate_audio_tracks",
+        )
+        return output_path
+
+    concat_file = _concat_list(track_paths, output_path + "_concat.txt")
+    _run(
+        [
+            "ffmpeg", "-y",
+            "-f", "concat", "-safe", "0",
+            "-i", concat_file,
+            "-c", "copy",
+            output_path,
+            "-loglevel", "error",
+        ],
+        "concatenate_audio_tracks",
+    )
+    return output_path
+
+
+def trim_and_normalize(
+    raw_path: str,
+    output_path: str,
+    beat_dur_sec: float,
+    crf: int = NORM_CRF,
+    preset: str = NORM_PRESET,
+    threads: int = 0,
+    timeout: Optional[float] = None,
+) -> str:
+    """
+    Frame-perfect trim to beat_dur_sec AND normalize to TARGET_RES @ TARGET_FPS
+    in one pass. Always re-encodes: -c copy snaps to keyframes and breaks
+    beat sync (Guide Appendix B). threads=0 lets ffmpeg pick.
+    """
+    _run(
+        [
+            "ffmpeg", "-y",
+            "-i", raw_path,
+            "-t", f"{beat_dur_sec:.6f}",
+            "-vf", _normalize_filter(),
+            "-c:v", "libx264",
+            "-crf", str(crf),
+            "-preset", preset,
+            "-pix_fmt", "yuv420p",
+            "-threads", str(threads),
+            "-an",
+            output_path,
+            "-loglevel", "error",
+        ],
+        f"trim_and_normalize for {os.path.basename(raw_path)}",
+        timeout=timeout,
+    )
+    return output_path
+
+
+def _normalize_one(clip: Dict, threads: int) -> Dict:
+    started = time.perf_counter()
+    last_error = None
+    # Encode beside the target and rename, so a killed encode never leaves
+    # a truncated clip that looks finished
+    stem, ext = os.path.splitext(clip["output_path"])
+    part_path = f"{stem}.part{ext}"
+    for attempt in range(1, settings.FFMPEG_CLIP_RETRIES + 2):
+        try:
+            trim_and_normalize(
+                clip["raw_path"],
+                part_path,
+                clip["beat_dur_sec"],
+                threads=threads,
+                timeout=settings.FFMPEG_CLIP_TIMEOUT_SEC,
+            )
+            os.replace(part_path, clip["output_path"])
+            return {
+                "output_path": clip["output_path"],
+                "seconds": round(time.perf_counter() - started, 2),
+                "attempts": attempt,
+            }
+        except RuntimeError as e:
+            last_error = str(e)
+            logger.warning(f"Normalize attempt {attempt} for {os.path.basename(clip['raw_path'])} failed: {e}")
+    return {
+        "output_path": clip["output_path"],
+        "seconds": round(time.perf_counter() - started, 2),
+        "attempts": settings.FFMPEG_CLIP_RETRIES + 1,
+        "error": last_error,
+    }
+
+
+def normalize_clips(clips: List[Dict]) -> List[Dict]:
+    """
+    Run trim_and_normalize over clips ({raw_path, output_path, beat_dur_sec})
+    as a work queue of encode_slots() concurrent ffmpeg processes, retrying
+    each clip up to FFMPEG_CLIP_RETRIES times.
+    Returns {output_path, seconds, attempts[, error]} per clip in input order;
+    every clip is attempted even if some fail.
+    """
+    if not clips:
+        return []
+    workers, threads = encode_slots()
+    workers = min(workers, len(clips))
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ffmpeg-norm") as pool:
+        results = list(pool.map(lambda clip: _normalize_one(clip, threads), clips))
+    logger.info(
+        f"Normalized {len(clips)} clips in {time.perf_counter() - started:.1f}s "
+        f"({workers} parallel x {threads} threads, "
+        f"{sum(r['seconds'] for r in results):.1f}s total encode time)"
+    )
+    return results
+
+
+def _file_digest(path: str, index: Dict) -> str:
+    """sha256 of a file, memoized in index by (size, mtime) so unchanged sources aren't re-read."""
+    stat = os.stat(path)
+    key = os.path.abspath(path)
+    entry = index.get(key)
+    if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+        return entry["sha256"]
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    index[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest.hexdigest()}
+    return index[key]["sha256"]
+
+
+def normalized_clip_key(source_digest: str, beat_dur_sec: float) -> str:
+    """Cache key covering everything that changes a normalized clip's bytes."""
+    material = json.dumps([
+        source_digest, round(beat_dur_sec, 6), TARGET_RES, TARGET_FPS, NORM_CRF, NORM_PRESET,
+    ])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()[:32]
+
+
+def normalize_clips_cached(clips: List[Dict], cache_dir: str) -> List[Dict]:
+    """
+    normalize_clips backed by a content-addressed cache in cache_dir: each
+    clip ({raw_path, beat_dur_sec}) is stored as <key>.mp4, keyed by the
+    source file's digest, beat_dur_sec and the encode settings, and only
+    clips whose key has no file yet are re-encoded. Returns normalize_clips
+    results plus "cached": True for reused clips. Entries no longer used by
+    any of these clips are removed.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    index_path = os.path.join(cache_dir, "sources.json")
+    try:
+        with open(index_path) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = {}
+
+    keyed = []
+    for clip in clips:
+        key = normalized_clip_key(_file_digest(clip["raw_path"], index), clip["beat_dur_sec"])
+        keyed.append({**clip, "output_path": os.path.join(cache_dir, f"{key}.mp4")})
+
+    # Identical scenes share one key; encode each missing key once
+    misses = {
+        clip["output_path"]: clip for clip in keyed if not os.path.exists(clip["output_path"])
+    }
+    encoded = dict(zip(misses, normalize_clips(list(misses.values()))))
+    results = [
+        encoded.get(clip["output_path"])
+        or {"output_path": clip["output_path"], "seconds": 0.0, "attempts": 0, "cached": True}
+        for clip in keyed
+    ]
+    logger.info(f"Normalized clip cache: {len(keyed) - len(misses)} reused, {len(misses)} encoded")
+
+    live = {os.path.basename(clip["output_path"]) for clip in keyed}
+    for name in os.listdir(cache_dir):
+        if name.endswith(".mp4") and name not in live:
+            os.remove(os.path.join(cache_dir, name))
+    sources = {os.path.abspath(clip["raw_path"]) for clip in clips}
+    index = {path: entry for path, entry in index.items() if path in sources}
+    with open(index_path + ".tmp", "w") as f:
+        json.dump(index, f)
+    os.replace(index_path + ".tmp", index_path)
+    return results
+
+
+def probe_duration(path: str) -> float:
+    """Exact container duration via ffprobe."""
+    r = subprocess.run(
+        ["ffprobe", "-v", "quiet", "-print_format", "json", "-show_format", path],
+        capture_output=True, text=True, check=True,
+    )
+    return float(json.loads(r.stdout)["format"]["duration"])
+
+
+def apply_ken_burns(
+    image_path: str,
+    output_path: str,
+    duration_sec: float,
+    direction: str = "zoom_in",
+    fps: int = 24,
+) -> str:
+    """
+    Animate a still with the zoompan filter. Output matches TARGET_RES @ fps.
+    Local operation — the last step of the animation fallback chain.
+    """
+    n_frames = int(duration_sec * fps)
+    w, h = TARGET_RES.split(":")
+
+    direction_map = {
+        "zoom_in": "z='min(zoom+0.0015,1.08)':x='iw/2-(iw/zoom/2)':y='ih/2-(ih/zoom/2)'",
+        "zoom_out": "z='if(lte(zoom,1.0),1.08,max(zoom-0.0015,1.0))':x='iw/2-(iw/zoom/2)':y='ih/2-(ih/zoom/2)'",
+        "pan_right": "z=1.05:x='min(x+0.5,iw*(1-1/zoom))':y='ih/2-(ih/zoom/2)'",
+        "pan_left": "z=1.05:x='max(x-0.5,0)':y='ih/2-(ih/zoom/2)'",
+    }
+    zp = direction_map.get(direction, direction_map["zoom_in"])
+
+    vf = (
+        f"scale=8000:-1,"   # upscale for zoom room
+        f"zoompan={zp}:d={n_frames}:s={w}x{h}:fps={fps},"
+        f"setsar=1"
+    )
+    _run(
+        [
+            "ffmpeg", "-y",
+            "-loop", "1", "-i", image_path,
+            "-t", f"{duration_sec:.6f}",
+            "-vf", vf,
+            "-c:v", "libx264", "-crf", "18", "-preset", "fast",
+            "-pix_fmt", "yuv420p", "-an",
+            output_path,
+            "-loglevel", "error",
+        ],
+        f"apply_ken_burns for {os.path.basename(image_path)}",
+    )
+    return output_path
+
+
+def assemble_scenes(norm_clips: List[str], output_path: str) -> str:
+    """
+    Concatenate normalized clips with the concat demuxer. Stream copy is safe
+    here because trim_and_normalize made every clip identical in format.
+    """
+    concat_file = _concat_list(norm_clips, output_path.replace(".mp4", "_concat.txt"))
+    _run(
+        [
+            "ffmpeg", "-y",
+            "-f", "concat", "-safe", "0",
+            "-i", concat_file,
+            "-c", "copy",
+            output_path,
+            "-loglevel", "error",
+        ],
+        "assemble_scenes",
+    )
+    return output_path
+
+
+def assemble_single_pass(
+    clips: List[Dict],
+    audio_path: str,
+    output_path: str,
+    fade_start: float,
+    threads: int = 0,
+) -> str:
+    """
+    Alternative to trim_and_normalize + assemble_scenes + merge_audio_video:
+    one filter_complex trims and normalizes every raw clip
+    ({raw_path, beat_dur_sec}), concatenates them, applies the fade-out and
+    muxes the soundtrack, so each frame is encoded exactly once.
+    Trades the per-clip cache for a single encode.
+    """
+    inputs, chains, labels = [], [], []
+    for i, clip in enumerate(clips):
+        dur = f"{clip['beat_dur_sec']:.6f}"
+        # -t stops demuxing at the cut; trim makes the cut frame-exact after fps
+        inputs += ["-t", dur, "-i", clip["raw_path"]]
+        chains.append(
+            f"[{i}:v]{_normalize_filter()},trim=duration={dur},setpts=PTS-STARTPTS[v{i}]"
+        )
+        labels.append(f"[v{i}]")
+    n = len(clips)
+    chains.append(
+        f"{''.join(labels)}concat=n={n}:v=1:a=0,"
+        f"fade=t=out:st={fade_start:.4f}:d={FADE_SEC}[vout]"
+    )
+    chains.append(f"[{n}:a]afade=t=out:st={fade_start:.4f}:d={FADE_SEC}[aout]")
+
+    _run(
+        [
+            "ffmpeg", "-y",
+            *inputs,
+            "-i", audio_path,
+            "-filter_complex", ";".join(chains),
+            "-map", "[vout]",
+            "-map", "[aout]",
+            "-c:v", "libx264", "-crf", "17", "-preset", "slow",
+            "-c:a", "aac", "-b:a", "192k",
+            "-pix_fmt", "yuv420p",
+            "-threads", str(threads),
+            "-shortest",
+            "-movflags", "+faststart",
+            output_path,
+            "-loglevel", "warning",
+        ],
+        "assemble_single_pass",
+        tail=400,
+    )
+    return output_path
+
+
+def merge_audio_video(
+    video_path: str,
+    audio_path: str,
+    output_path: str,
+    fade_start: float,
+) -> str:
+    """
+    Mux the assembled video with the soundtrack and apply the FADE_SEC
+    video + audio fade-out. -shortest cuts the output at the shorter stream.
+    """
+    _run(
+        [
+            "ffmpeg", "-y",
+            "-i", video_path,
+            "-i", audio_path,
+            "-map", "0:v",
+            "-map", "1:a",
+            "-vf", f"fade=t=out:st={fade_start:.4f}:d={FADE_SEC}",
+            "-af", f"afade=t=out:st={fade_start:.4f}:d={FADE_SEC}",
+            "-c:v", "libx264", "-crf", "17", "-preset", "slow",
+            "-c:a", "aac", "-b:a", "192k",
+            "-pix_fmt", "yuv420p",
+            "-shortest",
+            "-movflags", "+faststart",
+            output_path,
+            "-loglevel", "warning",
+        ],
+        "merge_audio_video",
+        tail=400,
+    )
+    return output_path
@@ -0,0 +1,120 @@
+"""
+Process-wide registry of pooled httpx clients, one per upstream host and
+event loop (httpx pools are bound to the loop that created them).
+Clients speak HTTP/2 when h2 is installed and keep connections alive
+between requests, so CometAPI calls, Suno polls and media downloads stop
+paying a TCP + TLS handshake per request.
+Per-host metrics count requests against newly opened connections; the
+difference is the number of requests served on a reused connection.
+"""
+import asyncio
+import logging
+import threading
+import weakref
+from collections import defaultdict
+from typing import Dict
+from urllib.parse import urlparse
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401  (httpx[http2])
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+
+class HttpClientRegistry:
+    def __init__(self):
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._metrics_lock = threading.Lock()
+        self._metrics: dict = defaultdict(lambda: {
+            "clients": 0,
+            "requests": 0,
+            "new_connections": 0,
+            "errors": 0,
+            "http_versions": defaultdict(int),
+        })
+
+    def _count(self, host: str, key: str):
+        with self._metrics_lock:
+            self._metrics[host][key] += 1
+
+    def _event_hooks(self, host: str) -> dict:
+        async def trace(event_name: str, info: dict):
+            if event_name == "connection.connect_tcp.complete":
+                self._count(host, "new_connections")
+
+        async def on_request(request: httpx.Request):
+            request.extensions["trace"] = trace
+
+        async def on_response(response: httpx.Response):
+            with self._metrics_lock:
+                host_metrics = self._metrics[host]
+                host_metrics["requests"] += 1
+                host_metrics["http_versions"][response.http_version] += 1
+                if response.status_code >= 500:
+                    host_metrics["errors"] += 1
+
+        return {"request": [on_request], "response": [on_response]}
+
+    def _new_client(self, host: str) -> httpx.AsyncClient:
+        if settings.HTTP2_ENABLED and not _HTTP2_AVAILABLE:
+            logger.warning("HTTP2_ENABLED but h2 is not installed; using HTTP/1.1")
+        self._count(host, "clients")
+        return httpx.AsyncClient(
+            http2=settings.HTTP2_ENABLED and _HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SEC,
+            ),
+            timeout=httpx.Timeout(
+                settings.HTTP_TIMEOUT_SEC, connect=settings.HTTP_CONNECT_TIMEOUT_SEC
+            ),
+            event_hooks=self._event_hooks(host),
+        )
+
+    def get(self, url: str) -> httpx.AsyncClient:
+        """Pooled client for url's host on the running event loop."""
+        host = urlparse(url).netloc
+        clients = self._clients.setdefault(asyncio.get_running_loop(), {})
+        client = clients.get(host)
+        if client is None or client.is_closed:
+            client = self._new_client(host)
+            clients[host] = client
+        return client
+
+    async def aclose(self):
+        """Close every client bound to the running event loop."""
+        clients = self._clients.pop(asyncio.get_running_loop(), {})
+        for host, client in clients.items():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing HTTP client for {host}: {e}")
+
+    def metrics(self) -> dict:
+        with self._metrics_lock:
+            snapshot = {}
+            for host, m in self._metrics.items():
+                reused = max(m["requests"] - m["new_connections"], 0)
+                snapshot[host] = {
+                    "clients": m["clients"],
+                    "requests": m["requests"],
+                    "new_connections": m["new_connections"],
+                    "reused_connections": reused,
+                    "reuse_ratio": round(reused / m["requests"], 3) if m["requests"] else 0.0,
+                    "server_errors": m["errors"],
+                    "http_versions": dict(m["http_versions"]),
+                }
+            return snapshot
+
+
+http_clients = HttpClientRegistry()
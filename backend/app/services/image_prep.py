@@ -0,0 +1,125 @@
+"""
+Image preparation for Claude vision input.
+Decodes whatever the source returned (JPEG/WebP/PNG...), downsizes to
+VISION_MAX_EDGE, re-encodes as JPEG at VISION_JPEG_QUALITY and caches the
+result on disk by key (e.g. video_id), so briefs send small, correctly
+typed images. Cached images expire VISION_IMAGE_CACHE_TTL_HOURS after they
+were written; once the directory exceeds VISION_IMAGE_CACHE_MAX_MB the
+oldest are evicted. Cache access is blocking file I/O — call from a
+worker thread.
+"""
+import base64
+import hashlib
+import io
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from PIL import Image, UnidentifiedImageError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_MEDIA_TYPE = "image/jpeg"
+
+_cache_lock = threading.Lock()
+_cache_bytes: Optional[int] = None  # approximate; rescanned on first write
+
+
+def _cache_path(key: str) -> Path:
+    # Encoding settings are part of the key so config changes invalidate old entries
+    digest = hashlib.sha256(
+        f"{key}:{settings.VISION_MAX_EDGE}:{settings.VISION_JPEG_QUALITY}".encode()
+    ).hexdigest()
+    return Path(settings.VISION_IMAGE_CACHE_DIR) / f"{digest}.jpg"
+
+
+def load_cached(key: str) -> Optional[str]:
+    """Return cached base64 JPEG for key, or None if missing or expired."""
+    path = _cache_path(key)
+    try:
+        if time.time() - path.stat().st_mtime > settings.VISION_IMAGE_CACHE_TTL_HOURS * 3600:
+            path.unlink()
+            return None
+        return base64.b64encode(path.read_bytes()).decode()
+    except OSError:
+        return None
+
+
+def _cache_entries() -> list:
+    entries = []
+    for path in Path(settings.VISION_IMAGE_CACHE_DIR).glob("*.jpg"):
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+    return entries
+
+
+def _account_write(size: int):
+    """Track the cache size and drop the oldest images past the cap, down to 90% of it."""
+    global _cache_bytes
+    max_bytes = settings.VISION_IMAGE_CACHE_MAX_MB * 1024 * 1024
+    with _cache_lock:
+        if _cache_bytes is None:
+            _cache_bytes = sum(size for _, size, _ in _cache_entries())
+        else:
+            _cache_bytes += size
+        if _cache_bytes <= max_bytes:
+            return
+        entries = sorted(_cache_entries())
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, path in entries:
+            if total <= int(max_bytes * 0.9):
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            evicted += 1
+        _cache_bytes = total
+    logger.info(f"Vision image cache evicted {evicted} images ({total / 1024 / 1024:.1f} MB left)")
+
+
+def prepare_for_vision(raw: bytes, cache_key: Optional[str] = None) -> Optional[str]:
+    """
+    Downscale and re-encode an image for Claude vision input.
+    Returns raw base64 JPEG (no data URI prefix), or None if the bytes are
+    not a decodable image. CPU-bound — call from a worker thread.
+    """
+    try:
+        with Image.open(io.BytesIO(raw)) as img:
+            logger.debug(f"Preparing {img.format} image {img.size[0]}x{img.size[1]}")
+            img = img.convert("RGB")
+            img.thumbnail(
+                (settings.VISION_MAX_EDGE, settings.VISION_MAX_EDGE),
+                Image.Resampling.LANCZOS,
+            )
+            out = io.BytesIO()
+            img.save(out, format="JPEG", quality=settings.VISION_JPEG_QUALITY, optimize=True)
+    except (UnidentifiedImageError, OSError, ValueError) as e:
+        logger.warning(f"Could not decode image for vision input: {e}")
+        return None
+
+    data = out.getvalue()
+    if cache_key:
+        path = _cache_path(cache_key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to cache prepared image {cache_key}: {e}")
+        else:
+            _account_write(len(data))
+    return base64.b64encode(data).decode()
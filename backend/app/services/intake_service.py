@@ -1,14 +1,20 @@
 """Research Brief Intake Service — Claude Sonnet integration + audio metadata extraction."""
 
+import asyncio
 import base64
 import json
 import logging
+import multiprocessing
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import List, Optional
 
-from anthropic import AsyncAnthropic
+import numpy as np
 
 from app.core.config import settings
 from app.schemas.research import ResearchBriefResponse
+from app.services.llm_gateway import llm_gateway
 
 logger = logging.getLogger(__name__)
 
@@ -80,24 +86,123 @@ Return ONLY the JSON object. No preamble, no explanation, no markdown fences."""
 
 def _extract_audio_metadata(raw_bytes: bytes) -> dict:
     """Extract BPM and duration from uploaded audio bytes.
-    Uses librosa in-memory — does not write to disk."""
+    Uses librosa in-memory — does not write to disk. Only the first
+    AUDIO_INTAKE_WINDOW_SEC are decoded (mono @ AUDIO_INTAKE_SR) for the
+    BPM estimate; for longer tracks the duration comes from the file header
+    (libsndfile, else ffprobe) and is None if neither can read it — the
+    track is never fully decoded just for its length.
+    CPU-bound — run via extract_audio_metadata() from async code."""
     try:
         import io
         import librosa
+        import soundfile
 
-        buffer = io.BytesIO(raw_bytes)
-        y, sr = librosa.load(buffer, sr=None, mono=True)
+        y, sr = librosa.load(
+            io.BytesIO(raw_bytes),
+            sr=settings.AUDIO_INTAKE_SR,
+            mono=True,
+            duration=settings.AUDIO_INTAKE_WINDOW_SEC,
+        )
         tempo, _ = librosa.beat.beat_track(y=y, sr=sr)
+
         duration = librosa.get_duration(y=y, sr=sr)
+        if duration >= settings.AUDIO_INTAKE_WINDOW_SEC - 1.0:
+            # Window was filled, so the track is longer — read the real length
+            try:
+                duration = soundfile.info(io.BytesIO(raw_bytes)).duration
+            except Exception:
+                # Header not readable by libsndfile (e.g. older builds and MP3)
+                duration = _probe_duration(raw_bytes)
         return {
-            "estimated_bpm": round(float(tempo), 1),
-            "duration_sec": round(duration, 1),
+            "estimated_bpm": round(float(np.squeeze(tempo)), 1),
+            "duration_sec": round(float(duration), 1) if duration is not None else None,
         }
     except Exception as e:
         logger.warning(f"Audio metadata extraction failed: {e}")
         return {"estimated_bpm": None, "duration_sec": None}
 
 
+def _probe_duration(raw_bytes: bytes) -> Optional[float]:
+    """Container/bitrate duration from ffprobe on stdin; None if unavailable."""
+    try:
+        result = subprocess.run(
+            [
+                "ffprobe", "-v", "error",
+                "-show_entries", "format=duration",
+                "-of", "default=noprint_wrappers=1:nokey=1",
+                "-i", "pipe:0",
+            ],
+            input=raw_bytes,
+            capture_output=True,
+            timeout=5,
+        )
+        return float(result.stdout.strip())
+    except Exception:
+        return None
+
+
+_audio_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_audio_pool() -> ProcessPoolExecutor:
+    global _audio_pool
+    if _audio_pool is None:
+        # spawn, not fork: the API process already runs threads (anyio, SDK pools)
+        _audio_pool = ProcessPoolExecutor(
+            max_workers=settings.AUDIO_INTAKE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _audio_pool
+
+
+async def extract_audio_metadata(raw_bytes: bytes) -> dict:
+    """Run _extract_audio_metadata in the intake process pool with a timeout,
+    so decoding never blocks the event loop. Returns null metadata on
+    timeout or worker failure; the brief is generated without it."""
+    loop = asyncio.get_running_loop()
+    pool = _get_audio_pool()
+    try:
+        future = loop.run_in_executor(pool, _extract_audio_metadata, raw_bytes)
+        return await asyncio.wait_for(future, timeout=settings.AUDIO_INTAKE_TIMEOUT_SEC)
+    except asyncio.TimeoutError:
+        logger.warning(
+            f"Audio metadata extraction exceeded {settings.AUDIO_INTAKE_TIMEOUT_SEC}s; "
+            f"skipping and recycling the intake pool"
+        )
+        # The worker keeps decoding after wait_for gives up; left alone, a
+        # few slow files would occupy the pool for every later request
+        _discard_audio_pool(pool, terminate=True)
+    except BrokenProcessPool as e:
+        logger.error(f"Audio intake worker died: {e}")
+        _discard_audio_pool(pool)
+    return {"estimated_bpm": None, "duration_sec": None}
+
+
+def _discard_audio_pool(pool: ProcessPoolExecutor, terminate: bool = False):
+    """
+    Replace pool with a fresh one on next use; terminate=True also kills its
+    workers (other in-flight requests on it fall back to null metadata).
+    A pool already replaced by another request is left to that request.
+    """
+    global _audio_pool
+    if _audio_pool is pool:
+        _audio_pool = None
+    processes = list((getattr(pool, "_processes", None) or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    if terminate:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+
+def shutdown_audio_pool():
+    """Stop intake workers; called from the API shutdown hook."""
+    global _audio_pool
+    if _audio_pool is not None:
+        _audio_pool.shutdown(wait=False, cancel_futures=True)
+        _audio_pool = None
+
+
 def _build_user_message(
     topic: str,
     style_notes: Optional[str],
@@ -113,10 +218,13 @@ def _build_user_message(
     if style_notes:
         text_parts.append(f"Style notes: {style_notes}")
     if audio_meta:
-        text_parts.append(
-            f"Reference audio metadata: {audio_meta['duration_sec']}s, "
-            f"estimated {audio_meta['estimated_bpm']} BPM"
-        )
+        details = []
+        if audio_meta.get("duration_sec") is not None:
+            details.append(f"{audio_meta['duration_sec']}s")
+        if audio_meta.get("estimated_bpm") is not None:
+            details.append(f"estimated {audio_meta['estimated_bpm']} BPM")
+        if details:
+            text_parts.append(f"Reference audio metadata: {', '.join(details)}")
     if previous_answer:
         text_parts.append(
             f"My answer to your clarifying question: {previous_answer}"
@@ -152,8 +260,7 @@ async def generate_research_brief(
         topic, style_notes, previous_answer, image_b64_list or [], audio_meta
     )
 
-    client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
-    response = await client.messages.create(
+    response = await llm_gateway.create_message(
         model=settings.CLAUDE_FAST_MODEL,
         max_tokens=1200,
         system=INTAKE_SYSTEM_PROMPT,
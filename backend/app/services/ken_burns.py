@@ -0,0 +1,128 @@
+"""
+Ken Burns renderer for the animation fallback chain (Guide §8.5) that
+replaces ffmpeg's zoompan on an 8000px upscale.
+The still is cover-fitted once to TARGET_RES x MAX_ZOOM (so the tightest
+crop still has a source pixel per output pixel), the crop window for every
+frame is computed up front with NumPy, and each frame is a bilinear resize
+of its float crop box — sub-pixel positions, so slow pans don't
+stair-step — piped to ffmpeg as raw RGB.
+Blocking — run from a worker thread.
+
+Zooms keep zoompan's 1.0 <-> 1.08 end points. Pans deliberately differ:
+zoompan moved 0.5 px/frame on the 8000px source (about 15 output px over
+a 5 s clip) and pan_left never left x=0, so both were near-static; here
+both pans sweep the whole 1.05x slack (about 95 output px) over the clip.
+"""
+import logging
+import os
+import subprocess
+import tempfile
+
+import numpy as np
+from PIL import Image
+
+from app.services.ffmpeg_service import TARGET_RES
+
+logger = logging.getLogger(__name__)
+
+MAX_ZOOM = 1.08   # same end points as the zoompan version
+PAN_ZOOM = 1.05
+
+DIRECTIONS = ("zoom_in", "zoom_out", "pan_right", "pan_left")
+
+# The clip is an intermediate: normalize (or single-pass assembly) always
+# re-encodes it, so trade file-size efficiency for encode speed. x264 is
+# most of the render time; veryfast/16 is ~3x faster than fast/18 at about
+# the same size and within 1 dB PSNR.
+ENCODE_PRESET = "veryfast"
+ENCODE_CRF = 16
+
+
+def _crop_windows(direction: str, n_frames: int, src_w: int, src_h: int) -> np.ndarray:
+    """(n_frames, 4) array of x, y, w, h crop windows in source pixels."""
+    t = np.linspace(0.0, 1.0, n_frames) if n_frames > 1 else np.zeros(1)
+    if direction == "zoom_out":
+        zoom = MAX_ZOOM - (MAX_ZOOM - 1.0) * t
+    elif direction in ("pan_right", "pan_left"):
+        zoom = np.full_like(t, PAN_ZOOM)
+    else:
+        zoom = 1.0 + (MAX_ZOOM - 1.0) * t
+
+    # The source is MAX_ZOOM x the output: zoom 1.0 shows all of it, MAX_ZOOM is 1:1
+    w = src_w / zoom
+    h = src_h / zoom
+    slack_x = src_w - w
+    if direction == "pan_right":
+        x = slack_x * t
+    elif direction == "pan_left":
+        x = slack_x * (1.0 - t)
+    else:
+        x = slack_x / 2
+    y = (src_h - h) / 2
+    return np.column_stack([np.broadcast_to(x, t.shape), y, w, h])
+
+
+def _cover_fit(image: Image.Image, width: int, height: int) -> Image.Image:
+    """Scale to cover width x height, then centre-crop (no letterbox, no stretch)."""
+    scale = max(width / image.width, height / image.height)
+    resized = image.resize(
+        (max(width, round(image.width * scale)), max(height, round(image.height * scale))),
+        Image.LANCZOS,
+    )
+    left = (resized.width - width) // 2
+    top = (resized.height - height) // 2
+    return resized.crop((left, top, left + width, top + height))
+
+
+def render_ken_burns(
+    image_path: str,
+    output_path: str,
+    duration_sec: float,
+    direction: str = "zoom_in",
+    fps: int = 24,
+    threads: int = 0,
+) -> str:
+    """
+    Animate a still into a TARGET_RES @ fps clip of duration_sec.
+    Unknown directions fall back to zoom_in, as in apply_ken_burns.
+    """
+    out_w, out_h = (int(v) for v in TARGET_RES.split(":"))
+    n_frames = max(1, round(duration_sec * fps))
+    if direction not in DIRECTIONS:
+        direction = "zoom_in"
+
+    with Image.open(image_path) as im:
+        source = _cover_fit(
+            im.convert("RGB"), round(out_w * MAX_ZOOM), round(out_h * MAX_ZOOM)
+        )
+    windows = _crop_windows(direction, n_frames, source.width, source.height)
+
+    cmd = [
+        "ffmpeg", "-y",
+        "-f", "rawvideo", "-pix_fmt", "rgb24",
+        "-s", f"{out_w}x{out_h}", "-r", str(fps),
+        "-i", "-",
+        "-frames:v", str(n_frames),
+        "-c:v", "libx264", "-crf", str(ENCODE_CRF), "-preset", ENCODE_PRESET,
+        "-pix_fmt", "yuv420p", "-threads", str(threads), "-an",
+        output_path,
+        "-loglevel", "error",
+    ]
+    # stderr goes to a file: an undrained pipe could fill and block ffmpeg
+    # while we are blocked writing frames to its stdin
+    with tempfile.TemporaryFile() as errfile:
+        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=errfile)
+        try:
+            for x, y, w, h in windows:
+                # Float box: separable bilinear resample of the sub-pixel window
+                frame = source.resize((out_w, out_h), Image.BILINEAR, box=(x, y, x + w, y + h))
+                proc.stdin.write(frame.tobytes())
+            proc.stdin.close()
+        except BrokenPipeError:
+            pass  # ffmpeg exited early; its stderr says why
+        returncode = proc.wait()
+        errfile.seek(0)
+        stderr = errfile.read().decode(errors="replace")
+    if returncode != 0:
+        raise RuntimeError(f"render_ken_burns for {os.path.basename(image_path)} failed: {stderr[-300:]}")
+    return output_path
@@ -0,0 +1,136 @@
+"""
+Kling 3.0 direct API client (Guide §8): JWT auth, image-to-video
+submission and task queries. Scheduling — the concurrent-task cap,
+polling and the fallback chain — lives in tasks.kling_poller.
+The signed JWT is reused until KLING_JWT_REFRESH_SEC before it expires
+instead of being re-signed for every call.
+"""
+import base64
+import io
+import logging
+import math
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import jwt
+from PIL import Image
+
+from app.core.config import settings
+from app.services.http_clients import http_clients
+
+logger = logging.getLogger(__name__)
+
+MIN_DURATION_SEC = 3
+MAX_DURATION_SEC = 15
+QUOTA_ERROR_CODE = 1303  # parallel tasks over the resource pack limit
+
+
+class KlingError(Exception):
+    """Kling rejected a request or returned something unusable."""
+
+
+class KlingQuotaExceeded(KlingError):
+    """The account's parallel-task quota is full; the submission can be retried as is."""
+
+
+def kling_duration(beat_dur_sec: float) -> int:
+    """
+    Integer seconds to request for a scene: the ceiling of its beat
+    duration, so there is footage to trim to the exact cut (Guide §8.2).
+    """
+    return min(MAX_DURATION_SEC, max(MIN_DURATION_SEC, math.ceil(beat_dur_sec)))
+
+
+def image_to_b64(path: str, max_dim: int = 1536) -> str:
+    """Raw base64 JPEG, no data URI prefix — Kling rejects the prefix (Guide §6.3)."""
+    with Image.open(path) as im:
+        img = im.convert("RGB")
+    img.thumbnail((max_dim, max_dim), Image.LANCZOS)
+    buf = io.BytesIO()
+    img.save(buf, format="JPEG", quality=88)
+    return base64.b64encode(buf.getvalue()).decode()
+
+
+class KlingService:
+    def __init__(self):
+        self.api_base = settings.KLING_API_BASE.rstrip("/")
+        self._token: Optional[str] = None
+        self._token_exp = 0.0
+        self._token_lock = threading.Lock()
+
+    def configured(self) -> bool:
+        return bool(settings.KLING_ACCESS_KEY and settings.KLING_SECRET_KEY)
+
+    def _bearer(self) -> str:
+        now = time.time()
+        with self._token_lock:
+            if self._token is None or now >= self._token_exp - settings.KLING_JWT_REFRESH_SEC:
+                self._token_exp = now + settings.KLING_JWT_TTL_SEC
+                self._token = jwt.encode(
+                    {"iss": settings.KLING_ACCESS_KEY, "exp": int(self._token_exp), "nbf": int(now) - 5},
+                    settings.KLING_SECRET_KEY,
+                    algorithm="HS256",
+                )
+            return self._token
+
+    def _headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self._bearer()}", "Content-Type": "application/json"}
+
+    async def _request(self, method: str, path: str, **kwargs) -> Dict[str, Any]:
+        url = f"{self.api_base}{path}"
+        response = await http_clients.get(url).request(method, url, headers=self._headers(), **kwargs)
+        try:
+            body = response.json()
+        except ValueError:
+            body = {"message": response.text[:200]}
+        if response.status_code == 429 or body.get("code") == QUOTA_ERROR_CODE:
+            raise KlingQuotaExceeded(body.get("message") or "parallel task quota exceeded")
+        if response.status_code not in (200, 201) or body.get("code") != 0:
+            raise KlingError(f"HTTP {response.status_code}: {body.get('message') or body}")
+        return body.get("data") or {}
+
+    async def submit_image_to_video(
+        self,
+        image_b64: str,
+        prompt: str,
+        negative_prompt: str,
+        mode: str,
+        duration_sec: int,
+        image_tail_b64: Optional[str] = None,
+        model: str = "kling-v3",
+        cfg_scale: float = 0.5,
+    ) -> str:
+        """Submit an image-to-video task and return its task_id."""
+        payload = {
+            "model_name": model,
+            "mode": mode,
+            "duration": str(duration_sec),  # must be a string
+            "image": image_b64,
+            "prompt": prompt or "",
+            "negative_prompt": negative_prompt or "",
+            "cfg_scale": cfg_scale,
+        }
+        if image_tail_b64:
+            payload["image_tail"] = image_tail_b64
+        data = await self._request("POST", "/v1/videos/image2video", json=payload, timeout=45.0)
+        return data["task_id"]
+
+    async def get_task(self, task_id: str) -> Dict[str, Any]:
+        """
+        {"status": "submitted" | "processing" | "succeed" | "failed",
+         "video_url": str (succeed), "error": str (failed)}
+        """
+        data = await self._request("GET", f"/v1/videos/image2video/{task_id}", timeout=30.0)
+        status = data.get("task_status", "processing")
+        if status == "succeed":
+            videos = data.get("task_result", {}).get("videos", [])
+            if not videos:
+                raise KlingError(f"Task {task_id} succeeded without videos")
+            return {"status": "succeed", "video_url": videos[0]["url"]}
+        if status == "failed":
+            return {"status": "failed", "error": data.get("task_status_msg") or "unknown error"}
+        return {"status": status}
+
+
+kling_service = KlingService()
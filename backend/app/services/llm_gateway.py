@@ -0,0 +1,232 @@
+"""
+Shared Anthropic gateway used by every Claude caller (research analysis,
+intake briefs, creative/production prompts).
+Owns one pooled client per event loop, enforces per-loop and per-model
+concurrency (per event loop, so per worker process in prefork Celery and
+per app process in uvicorn) plus a process-wide tokens-per-minute budget, retries 429/5xx/529 with
+jittered exponential backoff, and records latency/token metrics.
+"""
+import asyncio
+import logging
+import random
+import threading
+import time
+import weakref
+from collections import defaultdict
+from typing import Any
+
+import httpx
+from anthropic import AsyncAnthropic, APIConnectionError, APIStatusError, DefaultAsyncHttpxClient
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504, 529}
+CHARS_PER_TOKEN = 4
+
+
+class TokenBudget:
+    """
+    Tokens-per-minute bucket shared across event loops (thread lock, async wait).
+    Requests reserve an estimate up front and reconcile with real usage after.
+    """
+
+    def __init__(self, tokens_per_minute: int):
+        self.capacity = float(tokens_per_minute)
+        self.refill_per_sec = tokens_per_minute / 60.0
+        self._available = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._available = min(
+            self.capacity, self._available + (now - self._updated) * self.refill_per_sec
+        )
+        self._updated = now
+
+    async def acquire(self, tokens: int):
+        if self.capacity <= 0:
+            return
+        tokens = min(tokens, self.capacity)
+        while True:
+            with self._lock:
+                self._refill()
+                if self._available >= tokens:
+                    self._available -= tokens
+                    return
+                wait = (tokens - self._available) / self.refill_per_sec
+            await asyncio.sleep(min(wait, 5.0))
+
+    def adjust(self, delta: int):
+        """Charge (positive) or refund (negative) the difference from the estimate."""
+        if self.capacity <= 0:
+            return
+        with self._lock:
+            self._refill()
+            self._available = min(self.capacity, self._available - delta)
+
+
+class _LoopState:
+    """Client and semaphores bound to a single event loop."""
+
+    def __init__(self):
+        # DefaultAsyncHttpxClient keeps the SDK's own transport defaults;
+        # the pool is sized to the loop's concurrency limit
+        self.client = AsyncAnthropic(
+            api_key=settings.ANTHROPIC_API_KEY,
+            max_retries=0,  # retries are handled by the gateway
+            timeout=settings.LLM_TIMEOUT_SEC,
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=settings.LLM_MAX_CONCURRENCY,
+                    max_keepalive_connections=settings.LLM_MAX_CONCURRENCY,
+                ),
+                timeout=settings.LLM_TIMEOUT_SEC,
+            ),
+        )
+        # Per event loop, not per process: each loop gets its own slots
+        self.loop_slots = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+        self.model_slots: dict = defaultdict(
+            lambda: asyncio.Semaphore(settings.LLM_MODEL_CONCURRENCY)
+        )
+
+
+class LLMGateway:
+    def __init__(self):
+        self._states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._budget = TokenBudget(settings.LLM_TOKENS_PER_MINUTE)
+        self._metrics_lock = threading.Lock()
+        self._metrics: dict = defaultdict(lambda: {
+            "requests": 0,
+            "errors": 0,
+            "retries": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "latency_total_sec": 0.0,
+            "latency_max_sec": 0.0,
+        })
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        state = self._states.get(loop)
+        if state is None:
+            state = _LoopState()
+            self._states[loop] = state
+        return state
+
+    async def create_message(self, **kwargs: Any):
+        """
+        Drop-in for client.messages.create(**kwargs) with pooling,
+        concurrency limits, TPM budgeting and retry.
+        """
+        model = kwargs["model"]
+        state = self._state()
+        estimate = _estimate_input_tokens(kwargs) + kwargs.get("max_tokens", 0)
+
+        for attempt in range(settings.LLM_MAX_RETRIES + 1):
+            await self._budget.acquire(estimate)
+            async with state.loop_slots, state.model_slots[model]:
+                started = time.perf_counter()
+                try:
+                    response = await state.client.messages.create(**kwargs)
+                except (APIStatusError, APIConnectionError) as e:
+                    status = getattr(e, "status_code", None)
+                    retryable = isinstance(e, APIConnectionError) or status in RETRYABLE_STATUS
+                    self._budget.adjust(-estimate)
+                    if not retryable or attempt == settings.LLM_MAX_RETRIES:
+                        self._record(model, time.perf_counter() - started, error=True)
+                        raise
+                    delay = _backoff_delay(attempt, e)
+                    self._record(model, time.perf_counter() - started, retry=True)
+                    logger.warning(
+                        f"Claude {model} returned {status or type(e).__name__}; "
+                        f"retry {attempt + 1}/{settings.LLM_MAX_RETRIES} in {delay:.1f}s"
+                    )
+                except BaseException:
+                    # Bad kwargs, cancellation, ...: nothing was spent
+                    self._budget.adjust(-estimate)
+                    self._record(model, time.perf_counter() - started, error=True)
+                    raise
+                else:
+                    usage = response.usage
+                    self._budget.adjust(usage.input_tokens + usage.output_tokens - estimate)
+                    self._record(
+                        model,
+                        time.perf_counter() - started,
+                        input_tokens=usage.input_tokens,
+                        output_tokens=usage.output_tokens,
+                    )
+                    return response
+            # Sleep outside the semaphores so other callers can proceed
+            await asyncio.sleep(delay)
+
+    def metrics(self) -> dict:
+        with self._metrics_lock:
+            snapshot = {}
+            for model, m in self._metrics.items():
+                completed = m["requests"] - m["errors"]
+                snapshot[model] = {
+                    **m,
+                    "latency_avg_sec": round(m["latency_total_sec"] / completed, 3) if completed else 0.0,
+                }
+            return snapshot
+
+    def _record(
+        self,
+        model: str,
+        latency: float,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        error: bool = False,
+        retry: bool = False,
+    ):
+        with self._metrics_lock:
+            m = self._metrics[model]
+            if retry:
+                m["retries"] += 1
+                return
+            m["requests"] += 1
+            if error:
+                m["errors"] += 1
+                return
+            m["input_tokens"] += input_tokens
+            m["output_tokens"] += output_tokens
+            m["latency_total_sec"] += latency
+            m["latency_max_sec"] = max(m["latency_max_sec"], latency)
+
+
+def _estimate_input_tokens(kwargs: dict) -> int:
+    """Cheap size estimate for budgeting; images count as a flat ~1.6k tokens."""
+    chars = len(kwargs.get("system") or "")
+    images = 0
+    for message in kwargs.get("messages", []):
+        content = message.get("content")
+        if isinstance(content, str):
+            chars += len(content)
+            continue
+        for block in content or []:
+            if block.get("type") == "text":
+                chars += len(block.get("text", ""))
+            elif block.get("type") == "image":
+                images += 1
+    return chars // CHARS_PER_TOKEN + images * 1600
+
+
+def _backoff_delay(attempt: int, error: Exception) -> float:
+    """Honour retry-after when present, otherwise full-jitter exponential backoff."""
+    response = getattr(error, "response", None)
+    if response is not None:
+        retry_after = response.headers.get("retry-after")
+        if retry_after:
+            try:
+                return float(retry_after) + random.uniform(0, 1)
+            except ValueError:
+                pass
+    return random.uniform(0, min(60.0, 2.0 ** (attempt + 1)))
+
+
+llm_gateway = LLMGateway()
@@ -1,7 +1,7 @@
-import httpx
 import logging
 from typing import Dict, Any, List
 from app.core.config import settings
+from app.services.http_clients import http_clients
 
 logger = logging.getLogger(__name__)
 
@@ -16,39 +16,30 @@ class MediaGenService:
         Generate a cinematic image based on the prompt using CometAPI.
         """
         try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                response = await client.post(
-                    self.api_url,
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": model,
-                        "prompt": prompt,
-                        "n": 1,
-                        "size": "1024x1024",
-                        "response_format": "url"
-                    }
-                )
-                response.raise_for_status()
-                data = response.json()
-                return {
-                    "url": data['data'][0]['url'],
+            response = await http_clients.get(self.api_url).post(
+                self.api_url,
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json"
+                },
+                json={
                     "model": model,
-                    "revised_prompt": data['data'][0].get('revised_prompt', prompt)
-                }
+                    "prompt": prompt,
+                    "n": 1,
+                    "size": "1024x1024",
+                    "response_format": "url"
+                },
+                timeout=120.0,
+            )
+            response.raise_for_status()
+            data = response.json()
+            return {
+                "url": data['data'][0]['url'],
+                "model": model,
+                "revised_prompt": data['data'][0].get('revised_prompt', prompt)
+            }
         except Exception as e:
             logger.error(f"Image generation error ({model}): {e}")
             return {"error": str(e)}
 
-    async def animate_image(self, image_url: str, prompt: str = "", model: str = "Wan2.6") -> Dict[str, Any]:
-        """
-        Animate an existing image using video generation models (Wan2.6, Kling, etc.)
-        Placeholder for Phase 5, but implemented now for future use.
-        """
-        # Note: Video generation endpoints differ; this is a placeholder implementation
-        logger.info(f"Triggering animation for {image_url} using {model}")
-        return {"id": "job_placeholder", "status": "pending"}
-
 media_gen_service = MediaGenService()
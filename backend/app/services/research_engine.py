@@ -0,0 +1,168 @@
+"""
+Bounded-concurrency research engine (Stage 1).
+Fans YouTube searches and transcript extraction out over a shared worker pool
+so the blocking googleapiclient / yt-dlp calls never run on the event loop.
+"""
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import AsyncIterator, Callable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.transcript_cache import transcript_cache
+from app.services.youtube_service import youtube_service, MAX_IDS_PER_VIDEOS_CALL
+
+logger = logging.getLogger(__name__)
+
+
+class HostRateLimiter:
+    """
+    Spaces calls to one upstream host at most `rate` per second.
+    Uses a thread lock rather than an asyncio primitive so a single limiter
+    can be shared by FastAPI background tasks and Celery worker loops.
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    async def acquire(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class StageTimer:
+    """Collects wall-clock timings per pipeline stage, e.g. {"search_sec": 1.2}."""
+
+    def __init__(self):
+        self.timings: dict = {}
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[f"{name}_sec"] = round(time.perf_counter() - start, 3)
+
+    def finish(self) -> dict:
+        self.timings["total_sec"] = round(time.perf_counter() - self._started, 3)
+        return self.timings
+
+
+class ResearchEngine:
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.RESEARCH_MAX_WORKERS,
+            thread_name_prefix="research",
+        )
+        self.youtube_api_limiter = HostRateLimiter(settings.YOUTUBE_API_RATE_LIMIT)
+        self.ytdlp_limiter = HostRateLimiter(settings.YTDLP_RATE_LIMIT)
+
+    async def run_blocking(
+        self,
+        limiter: HostRateLimiter,
+        semaphore: asyncio.Semaphore,
+        fn: Callable,
+        *args,
+    ):
+        """Run a blocking call in the worker pool under a semaphore and rate limit."""
+        async with semaphore:
+            await limiter.acquire()
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+
+    async def search(self, queries: List[str]) -> List[dict]:
+        """
+        Run all search queries concurrently.
+        Returns videos de-duplicated by video_id, in query order.
+        """
+        semaphore = asyncio.Semaphore(settings.RESEARCH_SEARCH_CONCURRENCY)
+        per_query = await asyncio.gather(*(
+            self.run_blocking(
+                self.youtube_api_limiter, semaphore, youtube_service.search_videos, q
+            )
+            for q in queries
+        ))
+
+        all_videos = []
+        seen_ids = set()
+        for videos in per_query:
+            for v in videos:
+                if v["video_id"] not in seen_ids:
+                    seen_ids.add(v["video_id"])
+                    all_videos.append(v)
+        return all_videos
+
+    async def hydrate_metadata(self, video_ids: List[str]) -> dict:
+        """
+        Fetch statistics/duration for all candidates in 50-ID batches.
+        Returns {video_id: {channel, views, likes, duration_seconds, published_at}}.
+        """
+        semaphore = asyncio.Semaphore(settings.RESEARCH_SEARCH_CONCURRENCY)
+        batches = [
+            video_ids[i:i + MAX_IDS_PER_VIDEOS_CALL]
+            for i in range(0, len(video_ids), MAX_IDS_PER_VIDEOS_CALL)
+        ]
+        per_batch = await asyncio.gather(*(
+            self.run_blocking(
+                self.youtube_api_limiter, semaphore, youtube_service.get_videos_metadata, b
+            )
+            for b in batches
+        ))
+
+        metadata = {}
+        for batch_result in per_batch:
+            metadata.update(batch_result)
+        return metadata
+
+    async def iter_transcripts(
+        self, videos: List[dict], bypass_cache: bool = False
+    ) -> AsyncIterator[Tuple[dict, Optional[str]]]:
+        """
+        Fetch transcripts concurrently, yielding (video, transcript) pairs
+        in completion order so callers can persist results as they arrive.
+        Cache hits return straight away; only downloads take a transcript
+        slot and a yt-dlp rate-limit token.
+        bypass_cache forces a fresh yt-dlp download for every video.
+        """
+        semaphore = asyncio.Semaphore(settings.RESEARCH_TRANSCRIPT_CONCURRENCY)
+        loop = asyncio.get_running_loop()
+
+        async def fetch(video: dict):
+            try:
+                if not bypass_cache:
+                    cached = await loop.run_in_executor(
+                        self._executor, transcript_cache.get, video["video_id"]
+                    )
+                    if cached is not None:
+                        return video, cached
+                # Already missed the cache above; download (and write back) only
+                transcript = await self.run_blocking(
+                    self.ytdlp_limiter,
+                    semaphore,
+                    youtube_service.get_transcript,
+                    video["video_id"],
+                    True,
+                )
+            except Exception as e:
+                logger.error(f"Transcript fetch failed for {video['video_id']}: {e}")
+                transcript = None
+            return video, transcript
+
+        for next_done in asyncio.as_completed([fetch(v) for v in videos]):
+            yield await next_done
+
+
+research_engine = ResearchEngine()
@@ -0,0 +1,83 @@
+"""
+Redis-backed cache of Claude responses for the claude_service generators.
+Keys hash (model, system prompt, message content, max_tokens); image blocks
+contribute the digest of their data rather than the base64 itself.
+Cache failures are logged and never break generation.
+"""
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import weakref
+from typing import Optional
+
+import redis.asyncio as redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "ymf:claude:"
+
+
+def _sha256(data: str) -> str:
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, url: str, ttl_hours: float):
+        self.url = url
+        self.ttl_sec = int(ttl_hours * 3600)
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, redis.Redis]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _client(self) -> redis.Redis:
+        # redis.asyncio pools are bound to the loop that created them
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = redis.Redis.from_url(self.url, decode_responses=True)
+            self._clients[loop] = client
+        return client
+
+    def key(self, request: dict) -> str:
+        messages = copy.deepcopy(request.get("messages", []))
+        for message in messages:
+            if isinstance(message.get("content"), list):
+                for block in message["content"]:
+                    source = block.get("source", {})
+                    if block.get("type") == "image" and "data" in source:
+                        source["data"] = _sha256(source["data"])
+
+        material = json.dumps({
+            "model": request["model"],
+            "system": _sha256(request.get("system") or ""),
+            "messages": _sha256(json.dumps(messages, sort_keys=True)),
+            "max_tokens": request.get("max_tokens"),
+        }, sort_keys=True)
+        return KEY_PREFIX + _sha256(material)
+
+    async def get(self, key: str) -> Optional[str]:
+        if self.ttl_sec <= 0:
+            return None
+        try:
+            return await self._client().get(key)
+        except Exception as e:
+            logger.warning(f"Claude response cache read failed: {e}")
+            return None
+
+    async def set(self, key: str, text: str):
+        if self.ttl_sec <= 0:
+            return
+        try:
+            await self._client().set(key, text, ex=self.ttl_sec)
+        except Exception as e:
+            logger.warning(f"Claude response cache write failed: {e}")
+
+
+response_cache = ResponseCache(
+    url=settings.REDIS_URL,
+    ttl_hours=settings.CLAUDE_CACHE_TTL_HOURS,
+)
@@ -0,0 +1,96 @@
+"""
+In-memory subtitle parsers for YouTube caption tracks (VTT, SRV3, TTML).
+Each parser streams cue text line by line; parse_subtitles joins the result
+into plain transcript text with consecutive duplicate lines removed.
+"""
+import html
+import io
+import re
+import xml.etree.ElementTree as ET
+from typing import Iterable, Iterator
+
+# Caption formats we can parse, in order of preference
+SUPPORTED_FORMATS = ("vtt", "srv3", "ttml")
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_VTT_BLOCK_HEADERS = ("NOTE", "STYLE", "REGION")
+
+
+def _vtt_blocks(text: str) -> Iterator[list]:
+    """Yield the stripped lines of each blank-line-separated WebVTT block."""
+    block = []
+    for raw_line in io.StringIO(text):
+        line = raw_line.strip()
+        if line:
+            block.append(line)
+        elif block:
+            yield block
+            block = []
+    if block:
+        yield block
+
+
+def parse_vtt(text: str) -> Iterator[str]:
+    """
+    Yield cue text lines from a WebVTT document. Only blocks with a timing
+    line are cues: the optional identifier before it (numeric or not) and
+    the timing itself are dropped, and NOTE/STYLE/REGION/WEBVTT header
+    blocks are recognised by their first line only, so cue text such as
+    "1999" or "NOTE to self" is kept.
+    """
+    for block in _vtt_blocks(text):
+        if block[0].startswith(_VTT_BLOCK_HEADERS) or block[0].startswith("WEBVTT"):
+            continue
+        if "-->" in block[0]:
+            payload = block[1:]
+        elif len(block) > 1 and "-->" in block[1]:
+            payload = block[2:]
+        else:
+            continue
+        for line in payload:
+            # Auto-captions carry inline word timings: <00:00:01.280><c> word</c>
+            cleaned = html.unescape(_TAG_RE.sub("", line)).strip()
+            if cleaned:
+                yield cleaned
+
+
+def _iter_xml_paragraphs(data: bytes) -> Iterator[str]:
+    """Yield the text of every <p> element (namespace-agnostic) without building the full tree."""
+    for _, elem in ET.iterparse(io.BytesIO(data), events=("end",)):
+        if elem.tag.rsplit("}", 1)[-1] == "p":
+            text = " ".join(" ".join(elem.itertext()).split())
+            if text:
+                yield text
+            elem.clear()
+
+
+def parse_srv3(data: bytes) -> Iterator[str]:
+    """YouTube timedtext format 3: <timedtext><body><p t= d=><s>word</s>...</p>."""
+    return _iter_xml_paragraphs(data)
+
+
+def parse_ttml(data: bytes) -> Iterator[str]:
+    """W3C TTML: <tt><body><div><p begin= end=>text<br/>text</p>."""
+    return _iter_xml_paragraphs(data)
+
+
+def _dedupe_consecutive(lines: Iterable[str]) -> Iterator[str]:
+    """Caption tracks often repeat the previous line as cues roll over."""
+    previous = None
+    for line in lines:
+        if line != previous:
+            yield line
+        previous = line
+
+
+def parse_subtitles(data: bytes, ext: str) -> str:
+    """Parse a caption track held in memory into plain transcript text."""
+    if ext == "vtt":
+        lines = parse_vtt(data.decode("utf-8", errors="replace"))
+    elif ext == "srv3":
+        lines = parse_srv3(data)
+    elif ext == "ttml":
+        lines = parse_ttml(data)
+    else:
+        raise ValueError(f"Unsupported subtitle format: {ext}")
+    return " ".join(_dedupe_consecutive(lines))
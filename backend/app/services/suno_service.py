@@ -1,11 +1,28 @@
-import httpx
 import logging
 import asyncio
 from typing import Dict, Any, List
 from app.core.config import settings
+from app.services.http_clients import http_clients
 
 logger = logging.getLogger(__name__)
 
+
+def suno_clips(res: Any) -> List[Dict[str, Any]]:
+    """
+    CometAPI's Suno endpoints return a clip list, {"clips": [...]},
+    {"data": [...]} or a single clip/job object; always give a list.
+    """
+    if isinstance(res, list):
+        return [c for c in res if isinstance(c, dict)]
+    if isinstance(res, dict):
+        for key in ("clips", "data"):
+            if isinstance(res.get(key), list):
+                return suno_clips(res[key])
+        if "id" in res:
+            return [res]
+    return []
+
+
 class SunoService:
     def __init__(self):
         self.api_url = "https://api.cometapi.xyz/v1/audio/suno"
@@ -17,38 +34,39 @@ class SunoService:
         """
         combined_prompt = f"{mood} {prompt}".strip()
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    self.api_url,
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "prompt": combined_prompt,
-                        "make_instrumental": make_instrumental,
-                        "wait_for_model": False # Asynchronous
-                    }
-                )
-                response.raise_for_status()
-                return response.json() # Usually returns a list of clips or a job ID
+            response = await http_clients.get(self.api_url).post(
+                self.api_url,
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json"
+                },
+                json={
+                    "prompt": combined_prompt,
+                    "make_instrumental": make_instrumental,
+                    "wait_for_model": False # Asynchronous
+                },
+                timeout=60.0,
+            )
+            response.raise_for_status()
+            return response.json() # Usually returns a list of clips or a job ID
         except Exception as e:
             logger.error(f"Suno track creation error: {e}")
             return {"error": str(e)}
 
     async def poll_track(self, clip_ids: List[str]) -> List[Dict[str, Any]]:
         """
-        Poll for the status of generated Suno clips.
+        Poll for the status of generated Suno clips; always a list of clip
+        dicts (see suno_clips), empty on error.
         """
         try:
             ids_str = ",".join(clip_ids)
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(
-                    f"{self.api_url}/feed?ids={ids_str}",
-                    headers={"Authorization": f"Bearer {self.api_key}"}
-                )
-                response.raise_for_status()
-                return response.json()
+            response = await http_clients.get(self.api_url).get(
+                f"{self.api_url}/feed?ids={ids_str}",
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                timeout=30.0,
+            )
+            response.raise_for_status()
+            return suno_clips(response.json())
         except Exception as e:
             logger.error(f"Suno polling error: {e}")
             return []
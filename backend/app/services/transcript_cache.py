@@ -0,0 +1,150 @@
+"""
+Persistent on-disk transcript cache, keyed by video_id + language.
+Entries expire after TRANSCRIPT_CACHE_TTL_HOURS; once the directory exceeds
+TRANSCRIPT_CACHE_MAX_MB the least-recently-used entries are evicted.
+Safe to share between the API process and Celery workers (atomic writes).
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptCache:
+    def __init__(self, cache_dir: str, ttl_hours: float, max_mb: int):
+        self.cache_dir = Path(cache_dir)
+        self.ttl_sec = ttl_hours * 3600
+        self.max_bytes = max_mb * 1024 * 1024
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._approx_bytes: Optional[int] = None
+
+    def _path(self, video_id: str, lang: str) -> Path:
+        key = hashlib.sha256(f"{video_id}:{lang}".encode()).hexdigest()
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, video_id: str, lang: str = "en") -> Optional[str]:
+        path = self._path(video_id, lang)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self._count(hit=False)
+            return None
+
+        if time.time() - entry.get("fetched_at", 0) > self.ttl_sec:
+            self._remove(path)
+            self._count(hit=False)
+            return None
+
+        # Touch mtime so eviction treats this entry as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self._count(hit=True)
+        return entry["text"]
+
+    def put(self, video_id: str, text: str, lang: str = "en"):
+        path = self._path(video_id, lang)
+        payload = json.dumps({
+            "video_id": video_id,
+            "lang": lang,
+            "fetched_at": time.time(),
+            "text": text,
+        }).encode("utf-8")
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to cache transcript for {video_id}: {e}")
+            return
+
+        with self._lock:
+            if self._approx_bytes is None:
+                self._approx_bytes = self._scan_size()
+            else:
+                self._approx_bytes += len(payload)
+            if self._approx_bytes > self.max_bytes:
+                self._evict()
+
+    def stats(self, since: Optional[dict] = None) -> dict:
+        """
+        Cumulative hit/miss counters for this process, or — given an earlier
+        stats() snapshot — only the lookups made since it.
+        """
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        if since:
+            hits -= since["hits"]
+            misses -= since["misses"]
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 3) if total else 0.0,
+        }
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _entries(self) -> list:
+        if not self.cache_dir.exists():
+            return []
+        entries = []
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        """Drop least-recently-used entries until the cache is under 90% of its cap."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            self._remove(path)
+            total -= size
+            evicted += 1
+        self._approx_bytes = total
+        logger.info(f"Transcript cache evicted {evicted} entries ({total / 1024 / 1024:.1f} MB left)")
+
+    def _remove(self, path: Path):
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+transcript_cache = TranscriptCache(
+    cache_dir=settings.TRANSCRIPT_CACHE_DIR,
+    ttl_hours=settings.TRANSCRIPT_CACHE_TTL_HOURS,
+    max_mb=settings.TRANSCRIPT_CACHE_MAX_MB,
+)
@@ -0,0 +1,137 @@
+"""
+Token-budgeted transcript condensation for research analysis.
+Chunks every transcript, drops passages that near-duplicate earlier ones
+(shingle containment), ranks the rest by TF-IDF similarity to the topic and
+research brief, and packs the best chunks into a fixed token budget.
+Pure Python — no network or model calls.
+"""
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+# Rough English average used for budgeting; close enough for prompt sizing
+CHARS_PER_TOKEN = 4
+SHINGLE_SIZE = 5
+DUPLICATE_CONTAINMENT = 0.8
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have i in is it its of on or "
+    "so that the this to was we were will with you your they them their our "
+    "just like yeah um uh okay oh gonna really very".split()
+)
+
+
+@dataclass
+class Chunk:
+    video_index: int
+    position: int
+    text: str
+    terms: List[str] = field(default_factory=list)
+    score: float = 0.0
+
+    @property
+    def tokens(self) -> int:
+        return len(self.text) // CHARS_PER_TOKEN + 1
+
+
+def _terms(text: str) -> List[str]:
+    return [w for w in _WORD_RE.findall(text.lower()) if w not in _STOPWORDS]
+
+
+def _chunk(transcripts: List[str], chunk_words: int) -> List[Chunk]:
+    chunks = []
+    for video_index, transcript in enumerate(transcripts):
+        words = transcript.split()
+        for position, start in enumerate(range(0, len(words), chunk_words)):
+            text = " ".join(words[start:start + chunk_words])
+            chunks.append(Chunk(video_index, position, text, _terms(text)))
+    return chunks
+
+
+def _drop_near_duplicates(chunks: List[Chunk]) -> List[Chunk]:
+    """Keep a chunk only if most of its word shingles have not been seen before."""
+    seen = set()
+    kept = []
+    for chunk in chunks:
+        words = chunk.text.lower().split()
+        shingles = {
+            hash(tuple(words[i:i + SHINGLE_SIZE]))
+            for i in range(max(1, len(words) - SHINGLE_SIZE + 1))
+        }
+        if shingles and len(shingles & seen) / len(shingles) >= DUPLICATE_CONTAINMENT:
+            continue
+        seen |= shingles
+        kept.append(chunk)
+    return kept
+
+
+def _score(chunks: List[Chunk], query: str):
+    """TF-IDF cosine similarity between each chunk and the query text."""
+    doc_freq = Counter()
+    for chunk in chunks:
+        doc_freq.update(set(chunk.terms))
+    n_docs = len(chunks)
+
+    def vector(terms: List[str]) -> dict:
+        tf = Counter(terms)
+        return {
+            t: (1 + math.log(c)) * math.log((1 + n_docs) / (1 + doc_freq[t]))
+            for t, c in tf.items()
+        }
+
+    query_vec = vector(_terms(query))
+    query_norm = math.sqrt(sum(v * v for v in query_vec.values())) or 1.0
+
+    for chunk in chunks:
+        vec = vector(chunk.terms)
+        norm = math.sqrt(sum(v * v for v in vec.values())) or 1.0
+        dot = sum(w * vec.get(t, 0.0) for t, w in query_vec.items())
+        chunk.score = dot / (norm * query_norm)
+
+
+def _brief_query(topic: str, research_brief: Optional[dict]) -> str:
+    parts = [topic]
+    if research_brief:
+        for key in ("intent_summary", "mood", "visual_style", "audio_character"):
+            if research_brief.get(key):
+                parts.append(research_brief[key])
+        parts.extend(research_brief.get("youtube_search_queries") or [])
+    return " ".join(parts)
+
+
+def condense_transcripts(
+    transcripts: List[str],
+    topic: str,
+    research_brief: Optional[dict] = None,
+    token_budget: int = 12000,
+    chunk_words: int = 150,
+) -> str:
+    """
+    Return the most relevant, non-redundant transcript passages that fit
+    within token_budget, grouped by source video in original order.
+    """
+    chunks = _drop_near_duplicates(_chunk(transcripts, chunk_words))
+    if not chunks:
+        return ""
+    _score(chunks, _brief_query(topic, research_brief))
+
+    selected = []
+    used = 0
+    for chunk in sorted(chunks, key=lambda c: c.score, reverse=True):
+        if used + chunk.tokens > token_budget:
+            continue
+        selected.append(chunk)
+        used += chunk.tokens
+
+    selected.sort(key=lambda c: (c.video_index, c.position))
+    sections = []
+    current_video = None
+    for chunk in selected:
+        if chunk.video_index != current_video:
+            current_video = chunk.video_index
+            sections.append(f"\n[Video {current_video + 1}]")
+        sections.append(chunk.text)
+    return "\n".join(sections).strip()
@@ -1,19 +1,41 @@
+import json
 import os
-from pathlib import Path
+import threading
+from typing import Dict, List, Optional
+import isodate
 import yt_dlp
 import logging
+from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
+from googleapiclient.http import MediaFileUpload
 from app.core.config import settings
+from app.services.subtitle_parser import parse_subtitles, SUPPORTED_FORMATS
+from app.services.transcript_cache import transcript_cache
 
 logger = logging.getLogger(__name__)
 
+# videos().list accepts at most 50 comma-separated IDs per call
+MAX_IDS_PER_VIDEOS_CALL = 50
+
 class YouTubeService:
     def __init__(self):
-        try:
-            self.youtube = build('youtube', 'v3', developerKey=settings.YOUTUBE_API_KEY)
-        except Exception as e:
-            logger.error(f"Failed to initialize YouTube API: {e}")
-            self.youtube = None
+        self._local = threading.local()
+
+    @property
+    def youtube(self):
+        """
+        googleapiclient resources share an httplib2 connection and are not
+        thread-safe, so each research worker thread builds its own.
+        """
+        client = getattr(self._local, "client", None)
+        if client is None:
+            try:
+                client = build('youtube', 'v3', developerKey=settings.YOUTUBE_API_KEY)
+            except Exception as e:
+                logger.error(f"Failed to initialize YouTube API: {e}")
+                return None
+            self._local.client = client
+        return client
 
     def search_videos(self, query: str, max_results: int = 5):
         """Search for videos based on a query."""
@@ -73,68 +95,165 @@ class YouTubeService:
             logger.error(f"Error fetching video metadata: {e}")
             return None
 
-    def get_transcript(self, video_id: str):
+    def get_videos_metadata(self, video_ids: List[str]) -> Dict[str, dict]:
+        """
+        Batch-fetch channel, statistics and duration for many videos.
+        Issues one videos().list call (1 quota unit) per 50 IDs.
+        Returns {video_id: {channel, views, likes, duration_seconds, published_at}};
+        videos missing from the response (private/deleted) are omitted.
+        """
+        if not self.youtube or not video_ids:
+            return {}
+
+        results = {}
+        for i in range(0, len(video_ids), MAX_IDS_PER_VIDEOS_CALL):
+            batch = video_ids[i:i + MAX_IDS_PER_VIDEOS_CALL]
+            try:
+                response = self.youtube.videos().list(
+                    id=','.join(batch),
+                    part='snippet,statistics,contentDetails',
+                    maxResults=MAX_IDS_PER_VIDEOS_CALL,
+                ).execute()
+            except Exception as e:
+                logger.error(f"Error fetching metadata batch ({len(batch)} videos): {e}")
+                continue
+
+            for item in response.get('items', []):
+                results[item['id']] = self._parse_video_item(item)
+        return results
+
+    def _parse_video_item(self, item: dict) -> dict:
+        """Map a videos().list item onto ResearchVideo column names."""
+        snippet = item.get('snippet', {})
+        stats = item.get('statistics', {})
+        details = item.get('contentDetails', {})
+
+        duration_seconds = None
+        if details.get('duration'):
+            try:
+                duration_seconds = int(isodate.parse_duration(details['duration']).total_seconds())
+            except (isodate.ISO8601Error, ValueError):
+                pass
+
+        published_at = None
+        if snippet.get('publishedAt'):
+            try:
+                published_at = isodate.parse_datetime(snippet['publishedAt'])
+            except (isodate.ISO8601Error, ValueError):
+                pass
+
+        return {
+            'channel': snippet.get('channelTitle'),
+            'views': int(stats['viewCount']) if 'viewCount' in stats else None,
+            'likes': int(stats['likeCount']) if 'likeCount' in stats else None,
+            'duration_seconds': duration_seconds,
+            'published_at': published_at,
+        }
+
+    def get_transcript(self, video_id: str, bypass_cache: bool = False):
         """
-        Extract transcript text using yt-dlp.
-        Note: This is a simplified version that attempts to get the first available English transcript.
+        Get the English transcript for a video.
+        Served from the persistent transcript cache unless bypass_cache is set;
+        fresh downloads are always written back to the cache.
+        """
+        if not bypass_cache:
+            cached = transcript_cache.get(video_id)
+            if cached is not None:
+                return cached
+
+        transcript = self._download_transcript(video_id)
+        if transcript:
+            transcript_cache.put(video_id, transcript)
+        return transcript
+
+    def _download_transcript(self, video_id: str, lang: str = 'en'):
+        """
+        Extract transcript text via yt-dlp without touching disk.
+        Resolves the caption track URL from extract_info (manual subtitles
+        first, then automatic captions) and parses it in memory.
         """
         url = f"https://www.youtube.com/watch?v={video_id}"
-        
-        jobs_dir = Path(__file__).parent.parent.parent / "jobs"
-        if not jobs_dir.exists():
-            jobs_dir.mkdir(parents=True, exist_ok=True)
-            
-        # Temporary file for transcript
-        transcript_path = os.path.join(str(jobs_dir), f"transcript_{video_id}")
-        
         ydl_opts = {
             'skip_download': True,
-            'writesubtitles': True,
-            'writeautomaticsub': True,
-            'subtitleslangs': ['en'],
-            'outtmpl': transcript_path,
             'quiet': True,
             'no_warnings': True,
         }
-        
+
         try:
-                
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([url])
-            
-            # Find the downloaded transcript file (it will have an extension added)
-            # yt-dlp adds .en.vtt or similar
-            for ext in ['.en.vtt', '.en.ttml', '.en.srv1', '.en.srv2', '.en.srv3']:
-                full_path = transcript_path + ext
-                if os.path.exists(full_path):
-                    with open(full_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    # Clean up
-                    os.remove(full_path)
-                    return self._clean_vtt(content)
-            
-            return None
+                info = ydl.extract_info(url, download=False)
+                track = self._select_caption_track(info, lang)
+                if not track:
+                    return None
+                # urlopen reuses yt-dlp's cookies, headers and proxy settings
+                data = ydl.urlopen(track['url']).read()
+
+            return parse_subtitles(data, track['ext']) or None
         except Exception as e:
-            logger.error(f"Error extracting transcript: {e}")
+            logger.error(f"Error extracting transcript for {video_id}: {e}")
             return None
 
-    def _clean_vtt(self, vtt_content: str):
-        """Very basic VTT cleaning to extract raw text."""
-        lines = vtt_content.split('\n')
-        text_lines = []
-        for line in lines:
-            # Skip timestamps, headers, and metadata
-            if '-->' in line or line.startswith('WEBVTT') or line.startswith('Kind:') or line.startswith('Language:'):
-                continue
-            if line.strip():
-                text_lines.append(line.strip())
-        
-        # Deduplicate consecutive identical lines (VTT often has overlap)
-        deduped = []
-        for line in text_lines:
-            if not deduped or line != deduped[-1]:
-                deduped.append(line)
-                
-        return " ".join(deduped)
+    def _select_caption_track(self, info: dict, lang: str):
+        """Pick the best parseable caption track for `lang` (e.g. 'en', 'en-US')."""
+        for source in ('subtitles', 'automatic_captions'):
+            tracks_by_lang = info.get(source) or {}
+            candidates = [
+                key for key in tracks_by_lang
+                if key == lang or key.startswith(f"{lang}-")
+            ]
+            # Prefer the exact language code over regional variants
+            candidates.sort(key=lambda key: key != lang)
+            for key in candidates:
+                formats = {t.get('ext'): t for t in tracks_by_lang[key] if t.get('url')}
+                for ext in SUPPORTED_FORMATS:
+                    if ext in formats:
+                        return formats[ext]
+        return None
+
+    def can_upload(self) -> bool:
+        return os.path.exists(settings.YOUTUBE_CREDENTIALS_PATH)
+
+    def upload_video(
+        self,
+        video_path: str,
+        title: str,
+        description: str,
+        tags: List[str],
+        hashtags: List[str],
+        category_id: str = "10",
+    ) -> Optional[str]:
+        """
+        Resumable upload of the final video (Guide §10.2). Returns the new
+        video ID. Needs pre-authorised OAuth2 user credentials at
+        YOUTUBE_CREDENTIALS_PATH — the API key client cannot upload.
+        """
+        with open(settings.YOUTUBE_CREDENTIALS_PATH) as f:
+            creds = Credentials.from_authorized_user_info(json.load(f))
+        client = build('youtube', 'v3', credentials=creds)
+
+        body = {
+            "snippet": {
+                "title": title[:70],
+                "description": description + "\n\n" + " ".join(hashtags),
+                "tags": tags,
+                "categoryId": category_id,
+            },
+            "status": {
+                "privacyStatus": settings.YOUTUBE_UPLOAD_PRIVACY,
+                "selfDeclaredMadeForKids": False,
+            },
+        }
+        media = MediaFileUpload(
+            video_path,
+            mimetype="video/mp4",
+            resumable=True,
+            chunksize=10 * 1024 * 1024,
+        )
+        request = client.videos().insert(part="snippet,status", body=body, media_body=media)
+
+        response = None
+        while response is None:
+            _, response = request.next_chunk()
+        return response.get("id")
 
 youtube_service = YouTubeService()
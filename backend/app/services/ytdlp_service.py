@@ -4,58 +4,78 @@ Guide §3.2 — extracts title, description, thumbnail (as base64 for Claude vis
 """
 import yt_dlp
 import asyncio
-import base64
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 import httpx
 
+from app.core.config import settings
+from app.services import image_prep
+
 logger = logging.getLogger(__name__)
 
+# Dedicated pool so slow yt-dlp extractions never starve the default executor
+_ydl_executor = ThreadPoolExecutor(
+    max_workers=settings.YTDLP_MAX_WORKERS, thread_name_prefix="ytdlp"
+)
+
 
 async def extract_metadata(video_ids: list[str], job_dir: str = "") -> list[dict]:
     """
     Extract title, description, and thumbnail for each selected video.
-    Returns list of dicts: {video_id, title, description, thumbnail_url, thumbnail_b64}
-    
-    thumbnail_b64 is raw base64 (no data URI prefix) for direct use in Claude vision input.
+    Returns list of dicts: {video_id, title, description, thumbnail_url,
+    thumbnail_b64, thumbnail_media_type} in the same order as video_ids.
+
+    Videos are processed concurrently (yt-dlp in a dedicated thread pool,
+    thumbnails over one shared HTTP client); a failure on one video yields
+    an empty entry for it without affecting the others.
+    thumbnail_b64 is raw base64 (no data URI prefix) for direct use in Claude vision input,
+    downscaled and re-encoded by image_prep and cached per video_id.
     """
-    results = []
     async with httpx.AsyncClient(timeout=30) as client:
-        for vid in video_ids:
-            try:
-                url = f"https://www.youtube.com/watch?v={vid}"
-                ydl_opts = {"quiet": True, "skip_download": True, "no_warnings": True}
-                loop = asyncio.get_event_loop()
-                info = await loop.run_in_executor(None, _ydl_extract, url, ydl_opts)
+        return list(await asyncio.gather(
+            *(_extract_one(vid, client) for vid in video_ids)
+        ))
 
-                thumb_url = info.get("thumbnail", "")
-                thumb_b64 = ""
-                if thumb_url:
-                    try:
-                        r = await client.get(thumb_url)
-                        if r.status_code == 200:
-                            thumb_b64 = base64.b64encode(r.content).decode()
-                    except Exception as e:
-                        logger.warning(f"Failed to download thumbnail for {vid}: {e}")
 
-                results.append({
-                    "video_id":      vid,
-                    "title":         info.get("title", ""),
-                    "description":   (info.get("description", "") or "")[:500],
-                    "thumbnail_url": thumb_url,
-                    "thumbnail_b64": thumb_b64,
-                })
+async def _extract_one(vid: str, client: httpx.AsyncClient) -> dict:
+    try:
+        url = f"https://www.youtube.com/watch?v={vid}"
+        ydl_opts = {"quiet": True, "skip_download": True, "no_warnings": True}
+        loop = asyncio.get_running_loop()
+        info = await loop.run_in_executor(_ydl_executor, _ydl_extract, url, ydl_opts)
+
+        thumb_url = info.get("thumbnail", "")
+        thumb_b64 = await asyncio.to_thread(image_prep.load_cached, vid) or ""
+        if thumb_url and not thumb_b64:
+            try:
+                r = await client.get(thumb_url)
+                if r.status_code == 200:
+                    thumb_b64 = await asyncio.to_thread(
+                        image_prep.prepare_for_vision, r.content, vid
+                    ) or ""
             except Exception as e:
-                logger.error(f"Failed to extract metadata for video {vid}: {e}")
-                results.append({
-                    "video_id":      vid,
-                    "title":         "",
-                    "description":   "",
-                    "thumbnail_url": "",
-                    "thumbnail_b64": "",
-                })
-    return results
+                logger.warning(f"Failed to download thumbnail for {vid}: {e}")
+
+        return {
+            "video_id":      vid,
+            "title":         info.get("title", ""),
+            "description":   (info.get("description", "") or "")[:500],
+            "thumbnail_url": thumb_url,
+            "thumbnail_b64": thumb_b64,
+            "thumbnail_media_type": image_prep.OUTPUT_MEDIA_TYPE,
+        }
+    except Exception as e:
+        logger.error(f"Failed to extract metadata for video {vid}: {e}")
+        return {
+            "video_id":      vid,
+            "title":         "",
+            "description":   "",
+            "thumbnail_url": "",
+            "thumbnail_b64": "",
+            "thumbnail_media_type": image_prep.OUTPUT_MEDIA_TYPE,
+        }
 
 
 def _ydl_extract(url: str, opts: dict) -> dict:
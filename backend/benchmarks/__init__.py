@@ -0,0 +1,4 @@
+"""
+Standalone performance benchmarks. Run from backend/, e.g.
+    python -m benchmarks.bench_image_prompts
+"""
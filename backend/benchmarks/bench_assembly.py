@@ -0,0 +1,94 @@
+"""
+Assembly engines on synthetic jobs: the Guide §9 clip path (parallel
+trim + normalize, concat copy, merge re-encode) vs the single-pass
+filter_complex in ffmpeg_service.assemble_single_pass.
+Raw clips are generated locally with testsrc at 1280x720@30 so both
+engines have to scale, pad and re-time every frame; the soundtrack is a
+sine tone. Reports wall time and CPU seconds (user + sys of the ffmpeg
+children) per engine. The clip path runs twice: from an empty cache, then
+again with the cache warm, as on a re-assembly where no scene changed
+(concat copy plus the merge re-encode only).
+
+Requires ffmpeg/ffprobe on PATH.
+
+    python -m benchmarks.bench_assembly [scenes ...]
+"""
+import os
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from app.services import ffmpeg_service
+
+DEFAULT_SCENES = (20, 60)
+MIN_CLIP_SEC = 3.0
+MAX_CLIP_SEC = 8.0
+
+
+def _ffmpeg(*args: str):
+    subprocess.run(["ffmpeg", "-y", *args, "-loglevel", "error"], check=True)
+
+
+def _make_job(workdir: str, n: int, rng: random.Random) -> tuple:
+    clips = []
+    for i in range(n):
+        beat_dur = round(rng.uniform(MIN_CLIP_SEC, MAX_CLIP_SEC), 3)
+        raw = os.path.join(workdir, f"raw_{i:02d}.mp4")
+        _ffmpeg(
+            "-f", "lavfi", "-i", f"testsrc=size=1280x720:rate=30:duration={beat_dur + 1.0}",
+            "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p", raw,
+        )
+        clips.append({"raw_path": raw, "beat_dur_sec": beat_dur})
+    total = sum(c["beat_dur_sec"] for c in clips)
+    audio = os.path.join(workdir, "audio.m4a")
+    _ffmpeg("-f", "lavfi", "-i", f"sine=frequency=440:duration={total + 1.0}", "-c:a", "aac", audio)
+    return clips, audio, total
+
+
+def _children_cpu() -> float:
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _clip_engine(clips, audio, out, fade_start, workdir):
+    results = ffmpeg_service.normalize_clips_cached(clips, os.path.join(workdir, "norm_cache"))
+    assembled = os.path.join(workdir, "assembled_raw.mp4")
+    ffmpeg_service.assemble_scenes([r["output_path"] for r in results], assembled)
+    ffmpeg_service.merge_audio_video(assembled, audio, out, fade_start)
+
+
+def _single_pass_engine(clips, audio, out, fade_start, workdir):
+    ffmpeg_service.assemble_single_pass(clips, audio, out, fade_start)
+
+
+def main(scene_counts):
+    if not (shutil.which("ffmpeg") and shutil.which("ffprobe")):
+        sys.exit("ffmpeg and ffprobe must be on PATH")
+
+    rng = random.Random(7)
+    workers, threads = ffmpeg_service.encode_slots()
+    print(f"{ffmpeg_service.available_cores()} cores, clip path runs {workers} x {threads}-thread encodes\n")
+    print(f"{'scenes':>6} {'engine':>12} {'wall s':>8} {'cpu s':>8} {'output s':>9}")
+    for n in scene_counts:
+        with tempfile.TemporaryDirectory(prefix="bench_assembly_") as workdir:
+            clips, audio, total = _make_job(workdir, n, rng)
+            fade_start = total - ffmpeg_service.FADE_SEC
+            engines = (
+                ("clips", _clip_engine),
+                ("clips_warm", _clip_engine),
+                ("single_pass", _single_pass_engine),
+            )
+            for name, engine in engines:
+                out = os.path.join(workdir, f"final_{name}.mp4")
+                cpu0, wall0 = _children_cpu(), time.perf_counter()
+                engine(clips, audio, out, fade_start, workdir)
+                wall, cpu = time.perf_counter() - wall0, _children_cpu() - cpu0
+                print(f"{n:>6} {name:>12} {wall:>8.1f} {cpu:>8.1f} {ffmpeg_service.probe_duration(out):>9.2f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or DEFAULT_SCENES)
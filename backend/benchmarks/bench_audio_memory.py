@@ -0,0 +1,67 @@
+"""
+Peak-RSS comparison of AudioAnalysisService full-load vs block-streaming
+analysis on synthetic 2, 10 and 60-minute tracks (44.1 kHz mono WAV).
+Each measurement runs in a fresh interpreter so peaks don't mix.
+
+    python -m benchmarks.bench_audio_memory [minutes ...]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+import soundfile as sf
+
+SR = 44100
+DEFAULT_MINUTES = (2, 10, 60)
+
+_MEASURE = """
+import resource, sys, time
+from app.services.audio_analysis import audio_analysis_service
+start = time.perf_counter()
+result = audio_analysis_service.analyze(sys.argv[1], use_cache=False, streaming=sys.argv[2] == "stream")
+assert "error" not in result, result
+peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print(f"{peak_mb:.0f} {time.perf_counter() - start:.1f} {result['tempo_bpm']:.1f}")
+"""
+
+
+def _write_track(path: str, minutes: int):
+    """Click track at 120 BPM over pink-ish noise, written in 60s chunks."""
+    rng = np.random.default_rng(0)
+    click = (np.sin(2 * np.pi * 880 * np.arange(800) / SR) * np.exp(-np.arange(800) / 200)).astype(np.float32)
+    with sf.SoundFile(path, "w", samplerate=SR, channels=1, subtype="PCM_16") as f:
+        for _ in range(minutes):
+            chunk = (rng.standard_normal(SR * 60) * 0.02).astype(np.float32)
+            for beat in range(0, SR * 60, SR // 2):
+                chunk[beat:beat + len(click)] += click
+            f.write(chunk)
+
+
+def _measure(path: str, mode: str) -> tuple:
+    out = subprocess.run(
+        [sys.executable, "-c", _MEASURE, path, mode],
+        capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    ).stdout.split()
+    return float(out[0]), float(out[1]), float(out[2])
+
+
+def main(minutes_list):
+    print(f"{'minutes':>7} {'full MB':>8} {'stream MB':>10} {'full s':>7} {'stream s':>9} {'bpm full/stream':>16}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for minutes in minutes_list:
+            path = os.path.join(tmp, f"track_{minutes}m.wav")
+            _write_track(path, minutes)
+            full_mb, full_s, full_bpm = _measure(path, "full")
+            stream_mb, stream_s, stream_bpm = _measure(path, "stream")
+            print(
+                f"{minutes:>7} {full_mb:>8.0f} {stream_mb:>10.0f} {full_s:>7.1f} {stream_s:>9.1f}"
+                f" {full_bpm:>8.1f}/{stream_bpm:.1f}"
+            )
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main([int(m) for m in sys.argv[1:]] or DEFAULT_MINUTES)
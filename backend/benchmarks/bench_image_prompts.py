@@ -0,0 +1,58 @@
+"""
+Wall-clock comparison of image prompt generation strategies against a local
+mock Messages API: the old one-call-per-scene loop versus batched structured
+calls (generate_image_prompts). Both paths bypass the Claude response cache so
+every run measures real round-trips.
+
+    python -m benchmarks.bench_image_prompts
+"""
+import asyncio
+import os
+import time
+
+from benchmarks.mock_anthropic import start_mock_server
+
+SCENE_COUNTS = (10, 20, 40)
+
+
+def _brief(n_scenes: int) -> dict:
+    return {
+        "theme": "neon rain over a sleeping city",
+        "palette": ["teal", "magenta", "sodium orange"],
+        "mood": "melancholic, hopeful",
+        "scenes": [
+            {"scene_number": i + 1, "description": f"Wide shot {i + 1} of wet streets at night"}
+            for i in range(n_scenes)
+        ],
+    }
+
+
+async def main():
+    server = await start_mock_server()
+    port = server.sockets[0].getsockname()[1]
+    os.environ["ANTHROPIC_BASE_URL"] = f"http://127.0.0.1:{port}"
+    os.environ.setdefault("ANTHROPIC_API_KEY", "bench")
+
+    from app.services import claude_service
+
+    print(f"{'scenes':>6} {'sequential':>12} {'batched':>10} {'speedup':>8}")
+    for n in SCENE_COUNTS:
+        brief = _brief(n)
+
+        start = time.perf_counter()
+        for scene in brief["scenes"]:
+            await claude_service._image_prompt_single(brief, scene, bypass_cache=True)
+        sequential = time.perf_counter() - start
+
+        start = time.perf_counter()
+        prompts = await claude_service.generate_image_prompts(brief, bypass_cache=True)
+        batched = time.perf_counter() - start
+        assert len(prompts) == n
+
+        print(f"{n:>6} {sequential:>11.2f}s {batched:>9.2f}s {sequential / batched:>7.1f}x")
+
+    server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,74 @@
+"""
+Ken Burns fallback renderers: ffmpeg zoompan on an 8000px upscale
+(ffmpeg_service.apply_ken_burns, Guide §9) vs the NumPy crop-window
+renderer piping raw frames (app.services.ken_burns.render_ken_burns).
+Renders every direction from a synthetic 1024x1024 still (the image
+generator's size). Each render runs in a fresh interpreter and reports
+wall time, CPU seconds (Python plus ffmpeg) and peak RSS (Python + ffmpeg).
+Each engine uses its own x264 settings: zoompan fast/CRF 18, numpy
+ken_burns.ENCODE_PRESET/ENCODE_CRF. The encode dominates both.
+
+Requires ffmpeg on PATH.
+
+    python -m benchmarks.bench_ken_burns [seconds]
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+from PIL import Image
+
+from app.services.ken_burns import DIRECTIONS
+
+DEFAULT_SECONDS = 5.0
+
+_MEASURE = """
+import resource, sys, time
+from app.services import ffmpeg_service
+from app.services.ken_burns import render_ken_burns
+render = ffmpeg_service.apply_ken_burns if sys.argv[1] == "zoompan" else render_ken_burns
+start = time.perf_counter()
+render(sys.argv[2], sys.argv[3], float(sys.argv[4]), sys.argv[5])
+wall = time.perf_counter() - start
+own = resource.getrusage(resource.RUSAGE_SELF)
+kids = resource.getrusage(resource.RUSAGE_CHILDREN)
+cpu = own.ru_utime + own.ru_stime + kids.ru_utime + kids.ru_stime
+print(f"{wall:.2f} {cpu:.2f} {(own.ru_maxrss + kids.ru_maxrss) / 1024:.0f}")
+"""
+
+
+def _write_still(path: str):
+    """Gradient plus fine checkerboard, so resampling quality shows in the output."""
+    yy, xx = np.mgrid[0:1024, 0:1024]
+    img = np.stack([xx / 4, yy / 4, ((xx // 8 + yy // 8) % 2) * 255], axis=-1)
+    Image.fromarray(img.astype(np.uint8)).save(path)
+
+
+def main(seconds: float):
+    if not shutil.which("ffmpeg"):
+        sys.exit("ffmpeg must be on PATH")
+
+    print(f"{seconds:.0f}s clips from a 1024x1024 still, one interpreter per render\n")
+    print(f"{'direction':>10} {'engine':>8} {'wall s':>7} {'cpu s':>7} {'peak MB':>8}")
+    totals = {"zoompan": 0.0, "numpy": 0.0}
+    with tempfile.TemporaryDirectory(prefix="bench_ken_burns_") as workdir:
+        still = os.path.join(workdir, "still.png")
+        _write_still(still)
+        for direction in DIRECTIONS:
+            for engine in totals:
+                out = os.path.join(workdir, f"{direction}_{engine}.mp4")
+                result = subprocess.run(
+                    [sys.executable, "-c", _MEASURE, engine, still, out, str(seconds), direction],
+                    capture_output=True, text=True, check=True,
+                )
+                wall, cpu, peak = result.stdout.split()
+                totals[engine] += float(wall)
+                print(f"{direction:>10} {engine:>8} {wall:>7} {cpu:>7} {peak:>8}")
+    print(f"\nspeed-up {totals['zoompan'] / totals['numpy']:.1f}x")
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SECONDS)
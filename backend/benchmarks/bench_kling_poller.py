@@ -0,0 +1,148 @@
+"""
+Drives the Kling scheduler (tasks.kling_poller.run_cycle) against the
+local stub in benchmarks/mock_kling.py, with in-memory scene rows instead
+of the database, and compares it with the guide's per-scene loop (§8.5:
+each scene submits, then polls its own task at a fixed interval).
+Reports wall time, requests, quota rejections, peak parallel tasks, JWTs
+signed and connection reuse.
+
+    python -m benchmarks.bench_kling_poller [scenes]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from PIL import Image
+
+from benchmarks import mock_kling
+
+DEFAULT_SCENES = 40
+QUOTA = 5
+POLL_SEC = 0.25
+
+
+def _configure(port: int):
+    os.environ.update({
+        "KLING_API_BASE": f"http://127.0.0.1:{port}",
+        "KLING_ACCESS_KEY": "stub-access",
+        "KLING_SECRET_KEY": mock_kling.SECRET_KEY,
+        "KLING_MAX_CONCURRENT_TASKS": str(QUOTA),
+        "KLING_POLL_MIN_INTERVAL_SEC": str(POLL_SEC),
+        "KLING_POLL_MAX_INTERVAL_SEC": str(POLL_SEC * 4),
+    })
+
+
+def _rows(n: int, workdir: str) -> list:
+    still = os.path.join(workdir, "still.png")
+    Image.new("RGB", (1024, 1024), (90, 120, 160)).save(still)
+    return [
+        SimpleNamespace(
+            id=uuid.uuid4(), scene_number=i + 1, job_dir=workdir,
+            description="scene", motion_prompt="slow push in", negative_prompt="blur",
+            kling_model="kling-v3", kling_mode="pro" if i % 4 == 0 else "std",
+            kling_request_dur=5, local_image_path=still, tail_image_path=None,
+            kling_status="queued", kling_task_id=None, kling_attempts=0,
+            kling_submitted_at=None, kling_next_poll_at=None,
+            raw_video_url=None, raw_video_path=None, animation_method="kling", error_message=None,
+        )
+        for i in range(n)
+    ]
+
+
+async def _scheduler(rows: list) -> int:
+    from tasks.kling_poller import ACTIVE_STATUSES, run_cycle
+
+    by_id = {r.id: r for r in rows}
+    cycles = 0
+    while True:
+        active = [r for r in rows if r.kling_status in ACTIVE_STATUSES]
+        if not active:
+            return cycles
+        changes, next_due = await run_cycle(active, datetime.now(timezone.utc))
+        cycles += 1
+        for change in changes:
+            row = by_id[change["scene_id"]]
+            for key, value in change.items():
+                if not key.startswith("prev_"):
+                    setattr(row, key, value)
+        if next_due is not None:
+            await asyncio.sleep(max((next_due - datetime.now(timezone.utc)).total_seconds(), 0.0))
+
+
+async def _per_scene(rows: list) -> int:
+    """Guide §8.5 shape: every scene submits immediately and polls on its own."""
+    import jwt
+    from app.core.config import settings
+    from app.services.http_clients import http_clients
+    from app.services.kling_service import image_to_b64
+
+    def headers():
+        now = int(time.time())
+        token = jwt.encode(
+            {"iss": settings.KLING_ACCESS_KEY, "exp": now + 1800, "nbf": now - 5},
+            settings.KLING_SECRET_KEY, algorithm="HS256",
+        )
+        return {"Authorization": f"Bearer {token}"}
+
+    base = settings.KLING_API_BASE
+    client = http_clients.get(base)
+
+    async def one(row):
+        image = await asyncio.to_thread(image_to_b64, row.local_image_path)
+        for attempt in range(6):
+            r = await client.post(f"{base}/v1/videos/image2video", headers=headers(), json={
+                "model_name": "kling-v3", "mode": row.kling_mode, "duration": "5", "image": image,
+            })
+            if r.status_code == 200:
+                break
+            await asyncio.sleep(POLL_SEC * 4)
+        else:
+            row.kling_status = "failed"
+            return
+        task_id = r.json()["data"]["task_id"]
+        while True:
+            await asyncio.sleep(POLL_SEC)
+            data = (await client.get(f"{base}/v1/videos/image2video/{task_id}", headers=headers())).json()["data"]
+            if data["task_status"] in ("succeed", "failed"):
+                row.kling_status = data["task_status"]
+                return
+
+    await asyncio.gather(*(one(r) for r in rows))
+    return 0
+
+
+async def main(n: int):
+    server = await mock_kling.start_mock_server()
+    _configure(server.sockets[0].getsockname()[1])
+    mock_kling.QUOTA = QUOTA
+    from app.services.http_clients import http_clients
+
+    print(f"{n} scenes, quota {QUOTA} parallel tasks, {mock_kling.RENDER_SEC:.1f}s renders\n")
+    print(f"{'mode':>10} {'wall s':>7} {'submits':>8} {'429s':>5} {'polls':>6} "
+          f"{'peak':>5} {'JWTs':>5} {'reused':>7} {'ok':>4}")
+    for name, run in (("per-scene", _per_scene), ("scheduler", _scheduler)):
+        mock_kling.STATS.update(submits=0, rejected_quota=0, polls=0, max_in_flight=0, tokens_seen=set())
+        mock_kling._tasks.clear()
+        with tempfile.TemporaryDirectory(prefix="bench_kling_") as workdir:
+            rows = _rows(n, workdir)
+            started = time.perf_counter()
+            await run(rows)
+            wall = time.perf_counter() - started
+        metrics = http_clients.metrics().get(f"127.0.0.1:{server.sockets[0].getsockname()[1]}", {})
+        await http_clients.aclose()
+        s = mock_kling.STATS
+        print(f"{name:>10} {wall:>7.1f} {s['submits']:>8} {s['rejected_quota']:>5} {s['polls']:>6} "
+              f"{s['max_in_flight']:>5} {len(s['tokens_seen']):>5} "
+              f"{metrics.get('reuse_ratio', 0):>7.2f} "
+              f"{sum(r.kling_status == 'succeed' for r in rows):>4}")
+        http_clients._metrics.clear()
+    server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SCENES))
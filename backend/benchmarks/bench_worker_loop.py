@@ -0,0 +1,83 @@
+"""
+Per-task overhead of running async task bodies with a fresh event loop per
+task (the old get_event_loop / new_event_loop juggling) versus the
+persistent per-process loop in tasks.worker_loop.
+Each "task" makes one Claude call through llm_gateway against a local
+zero-latency mock, so the difference is client construction, connection
+setup and loop creation rather than upstream time.
+
+    python -m benchmarks.bench_worker_loop [tasks]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import threading
+import time
+
+from benchmarks import mock_anthropic
+
+DEFAULT_TASKS = 200
+
+
+def _serve_in_background() -> int:
+    mock_anthropic.TTFT_SEC = 0.0
+    mock_anthropic.SEC_PER_OUTPUT_TOKEN = 0.0
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(mock_anthropic.start_mock_server())
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return server.sockets[0].getsockname()[1]
+
+
+async def _task_body():
+    from app.services.llm_gateway import llm_gateway
+
+    await llm_gateway.create_message(
+        model="bench-model",
+        max_tokens=16,
+        messages=[{"role": "user", "content": "ping"}],
+    )
+
+
+def _loop_per_task():
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(_task_body())
+    finally:
+        loop.close()
+
+
+def _persistent_loop():
+    from tasks.worker_loop import run_async
+
+    run_async(_task_body())
+
+
+def _measure(run, n: int) -> list:
+    run()  # warm imports
+    timings = []
+    for _ in range(n):
+        start = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main(n: int):
+    port = _serve_in_background()
+    os.environ["ANTHROPIC_BASE_URL"] = f"http://127.0.0.1:{port}"
+    os.environ.setdefault("ANTHROPIC_API_KEY", "bench")
+
+    print(f"{n} tasks, one Claude call each (mock upstream, zero latency)\n")
+    print(f"{'mode':>16} {'mean ms':>8} {'p50 ms':>7} {'p95 ms':>7} {'total s':>8}")
+    for name, run in (("loop per task", _loop_per_task), ("persistent loop", _persistent_loop)):
+        timings = _measure(run, n)
+        p95 = statistics.quantiles(timings, n=20)[-1]
+        print(
+            f"{name:>16} {statistics.mean(timings):>8.2f} {statistics.median(timings):>7.2f} "
+            f"{p95:>7.2f} {sum(timings) / 1000:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TASKS)
@@ -0,0 +1,65 @@
+"""
+Minimal local stand-in for the Anthropic Messages API, for benchmarks.
+Latency is simulated as a fixed time-to-first-token plus a per-output-token
+generation cost, so batched and per-scene strategies can be compared.
+"""
+import asyncio
+import json
+import re
+
+TTFT_SEC = 0.6
+SEC_PER_OUTPUT_TOKEN = 0.004
+PROMPT_WORDS = 90
+
+_SCENE_RE = re.compile(r"^Scene (\d+):", re.MULTILINE)
+
+
+def _reply_text(body: dict) -> str:
+    message = body["messages"][0]["content"]
+    if "JSON array" in (body.get("system") or ""):
+        numbers = [int(n) for n in _SCENE_RE.findall(message)]
+        return json.dumps([
+            {"scene_number": n, "prompt": " ".join(["cinematic"] * PROMPT_WORDS)}
+            for n in numbers
+        ])
+    return " ".join(["cinematic"] * PROMPT_WORDS)
+
+
+async def _handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.decode().split("\r\n"):
+                if line.lower().startswith("content-length:"):
+                    length = int(line.split(":", 1)[1])
+            body = json.loads(await reader.readexactly(length))
+
+            text = _reply_text(body)
+            output_tokens = len(text) // 4
+            await asyncio.sleep(TTFT_SEC + output_tokens * SEC_PER_OUTPUT_TOKEN)
+
+            payload = json.dumps({
+                "id": "msg_bench",
+                "type": "message",
+                "role": "assistant",
+                "model": body["model"],
+                "content": [{"type": "text", "text": text}],
+                "stop_reason": "end_turn",
+                "stop_sequence": None,
+                "usage": {"input_tokens": len(json.dumps(body)) // 4, "output_tokens": output_tokens},
+            }).encode()
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                + f"Content-Length: {len(payload)}\r\n\r\n".encode()
+                + payload
+            )
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionResetError, asyncio.CancelledError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_mock_server(port: int = 0) -> asyncio.base_events.Server:
+    return await asyncio.start_server(_handle, "127.0.0.1", port)
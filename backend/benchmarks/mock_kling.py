@@ -0,0 +1,113 @@
+"""
+Minimal local stand-in for the Kling image-to-video API, for benchmarks.
+Verifies the HS256 bearer token, enforces a parallel-task quota the way
+the real account does (HTTP 429, code 1303), renders each task for
+RENDER_SEC and fails FAIL_EVERY-th submission, then serves a small dummy
+MP4 for the result URL. Counts what it saw in STATS.
+"""
+import asyncio
+import itertools
+import json
+import time
+
+import jwt
+
+SECRET_KEY = "stub-secret"
+QUOTA = 5
+RENDER_SEC = 1.0
+FAIL_EVERY = 0          # 0 = never
+VIDEO_BYTES = b"\x00\x00\x00\x18ftypmp42" + b"\x00" * 4096
+
+STATS = {"submits": 0, "rejected_quota": 0, "polls": 0, "max_in_flight": 0, "tokens_seen": set()}
+
+_tasks: dict = {}
+_ids = itertools.count(1)
+
+
+def _in_flight() -> int:
+    now = time.monotonic()
+    return sum(1 for t in _tasks.values() if t["done_at"] > now)
+
+
+def _status(task: dict) -> dict:
+    if time.monotonic() < task["done_at"]:
+        return {"task_id": task["id"], "task_status": "processing"}
+    if task["fail"]:
+        return {"task_id": task["id"], "task_status": "failed", "task_status_msg": "stub render failure"}
+    return {
+        "task_id": task["id"],
+        "task_status": "succeed",
+        "task_result": {"videos": [{"id": task["id"], "url": f"{task['base']}/videos/{task['id']}.mp4"}]},
+    }
+
+
+def _route(method: str, path: str, headers: dict, body: bytes, base: str) -> tuple:
+    if path.startswith("/videos/"):
+        return 200, "video/mp4", VIDEO_BYTES
+
+    token = headers.get("authorization", "").removeprefix("Bearer ")
+    try:
+        jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
+    except jwt.PyJWTError as e:
+        return 401, "application/json", json.dumps({"code": 1000, "message": str(e)}).encode()
+    STATS["tokens_seen"].add(token)
+
+    if method == "POST" and path == "/v1/videos/image2video":
+        if _in_flight() >= QUOTA:
+            STATS["rejected_quota"] += 1
+            return 429, "application/json", json.dumps(
+                {"code": 1303, "message": "parallel task over resource pack limit"}
+            ).encode()
+        payload = json.loads(body)
+        STATS["submits"] += 1
+        task_id = f"task-{next(_ids)}"
+        _tasks[task_id] = {
+            "id": task_id,
+            "base": base,
+            "done_at": time.monotonic() + RENDER_SEC,
+            "fail": bool(FAIL_EVERY) and STATS["submits"] % FAIL_EVERY == 0,
+            "mode": payload["mode"],
+        }
+        STATS["max_in_flight"] = max(STATS["max_in_flight"], _in_flight())
+        data = {"task_id": task_id, "task_status": "submitted"}
+    elif method == "GET" and path.startswith("/v1/videos/image2video/"):
+        STATS["polls"] += 1
+        task = _tasks.get(path.rsplit("/", 1)[1])
+        if task is None:
+            return 404, "application/json", json.dumps({"code": 1201, "message": "no such task"}).encode()
+        data = _status(task)
+    else:
+        return 404, "application/json", json.dumps({"code": 1200, "message": "not found"}).encode()
+    return 200, "application/json", json.dumps({"code": 0, "message": "SUCCEED", "data": data}).encode()
+
+
+async def _handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    host, port = writer.get_extra_info("sockname")[:2]
+    base = f"http://{host}:{port}"
+    try:
+        while True:
+            head = (await reader.readuntil(b"\r\n\r\n")).decode()
+            request_line, *lines = head.split("\r\n")
+            method, path, _ = request_line.split(" ", 2)
+            headers = {}
+            for line in lines:
+                if ":" in line:
+                    name, value = line.split(":", 1)
+                    headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+            status, content_type, payload = _route(method, path, headers, body, base)
+            writer.write(
+                f"HTTP/1.1 {status} X\r\nContent-Type: {content_type}\r\n".encode()
+                + f"Content-Length: {len(payload)}\r\n\r\n".encode()
+                + payload
+            )
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionResetError, asyncio.CancelledError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_mock_server(port: int = 0) -> asyncio.base_events.Server:
+    return await asyncio.start_server(_handle, "127.0.0.1", port)
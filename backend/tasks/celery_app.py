@@ -8,7 +8,9 @@ celery_app = Celery(
     include=[
         "tasks.research",
         "tasks.curation", 
-        "tasks.production"
+        "tasks.production",
+        "tasks.suno_poller",
+        "tasks.kling_poller"
     ]
 )
 
@@ -32,12 +32,18 @@ def _extract_genre_mood(res_job: ResearchJob) -> str:
     return res_job.genre_topic or "cinematic"
 
 
-async def run_briefing_pipeline(curation_job_id: str, research_job_id: str, selected_video_ids: list | None = None):
+async def run_briefing_pipeline(
+    curation_job_id: str,
+    research_job_id: str,
+    selected_video_ids: list | None = None,
+    bypass_cache: bool = False,
+):
     """
     Full briefing pipeline per Guide §3.5:
     1. Extract metadata via yt-dlp (thumbnails + descriptions)
     2. Generate Creative Brief via Claude (with vision input)
     3. Store brief and mark status = 'ready'
+    bypass_cache forces a fresh Claude response (user-requested regeneration).
     """
     async with AsyncSessionLocal() as db:
         try:
@@ -94,6 +100,7 @@ async def run_briefing_pipeline(curation_job_id: str, research_job_id: str, sele
                 genre_mood=genre_mood,
                 num_scenes=num_scenes,
                 audio_duration_hint=audio_duration_hint,
+                bypass_cache=bypass_cache,
             )
 
             # --- Step 3: Store and mark ready ---
@@ -0,0 +1,297 @@
+"""
+Central Kling scheduler shared by every production job (Guide §8).
+animate_scene only marks a scene kling_status='queued'; a single
+self-rescheduling poll_kling_tasks task then, on each run:
+
+  1. polls every submitted/processing task whose next poll is due,
+     concurrently, downloading finished clips into the job directory;
+  2. submits queued scenes while fewer than KLING_MAX_CONCURRENT_TASKS are
+     in flight across all jobs, so the account's parallel-task quota is
+     never exceeded however many workers animate at once;
+  3. writes every changed scene in one executemany.
+
+Failed, rejected or timed-out tasks are resubmitted along the fallback
+chain — the scene's kling_mode, then pro, then std, KLING_ATTEMPTS_PER_MODE
+times each — before the scene is marked failed and animate_scene falls
+back to Ken Burns. Poll intervals back off with task age, as in
+tasks.suno_poller, and the same Redis key scheme keeps one poller
+scheduled.
+
+run_cycle works on plain rows, so it can be driven against a local stub
+server without a database (benchmarks/bench_kling_poller.py).
+"""
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select, update, bindparam
+from sqlalchemy.orm import aliased
+
+from tasks.celery_app import celery_app
+from tasks.worker_loop import get_redis, run_async
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal as async_session_factory
+from app.models import ProductionJob, ProductionScene
+from app.services.downloader import download
+from app.services.kling_service import KlingQuotaExceeded, kling_service, image_to_b64
+
+logger = logging.getLogger(__name__)
+
+POLLER_KEY = "ymf:kling:poller"
+POLLER_KEY_TTL_SEC = int(settings.KLING_POLL_MAX_INTERVAL_SEC * 3)
+
+IN_FLIGHT_STATUSES = ("submitted", "processing")
+ACTIVE_STATUSES = ("queued",) + IN_FLIGHT_STATUSES
+
+# Scene columns the scheduler writes
+SCHEDULER_COLUMNS = (
+    "kling_status", "kling_task_id", "kling_mode", "kling_attempts",
+    "kling_submitted_at", "kling_next_poll_at",
+    "raw_video_url", "raw_video_path", "animation_method", "error_message",
+)
+
+
+def mode_chain(mode: Optional[str]) -> List[str]:
+    """Guide §8.5: the directed mode first, then pro, then std."""
+    return list(dict.fromkeys([mode or "std", "pro", "std"]))
+
+
+def max_attempts(mode: Optional[str]) -> int:
+    return len(mode_chain(mode)) * settings.KLING_ATTEMPTS_PER_MODE
+
+
+def _attempt_mode(mode: Optional[str], attempts: Optional[int]) -> str:
+    """Mode for the next (or, once succeeded, the winning) attempt."""
+    return mode_chain(mode)[(attempts or 0) // settings.KLING_ATTEMPTS_PER_MODE]
+
+
+def poll_interval(age_sec: float) -> float:
+    """Seconds until a task of this age is polled again."""
+    return min(
+        settings.KLING_POLL_MAX_INTERVAL_SEC,
+        settings.KLING_POLL_MIN_INTERVAL_SEC + max(age_sec, 0.0) * settings.KLING_POLL_BACKOFF,
+    )
+
+
+def _attempt_failed(values: Dict[str, Any], mode: Optional[str], error: str):
+    """Requeue for the next step of the fallback chain, or give up."""
+    values["kling_attempts"] = (values["kling_attempts"] or 0) + 1
+    values["kling_task_id"] = None
+    values["kling_next_poll_at"] = None
+    values["error_message"] = f"Kling: {error}"
+    values["kling_status"] = "failed" if values["kling_attempts"] >= max_attempts(mode) else "queued"
+
+
+async def _poll_one(row, values: Dict[str, Any], now: datetime):
+    age = (now - row.kling_submitted_at).total_seconds() if row.kling_submitted_at else 0.0
+    try:
+        result = await kling_service.get_task(row.kling_task_id)
+    except Exception as e:
+        # Transient: keep the stored status, only schedule the next poll
+        logger.warning(f"Kling poll for task {row.kling_task_id} failed: {e}")
+        _poll_again(row, values, now, age)
+        return
+
+    if result["status"] == "failed":
+        _attempt_failed(values, row.kling_mode, result["error"])
+        return
+
+    if result["status"] == "succeed":
+        # Own file name, so a late download never replaces a Ken Burns raw_XX.mp4
+        path = os.path.join(row.job_dir, f"raw_{row.scene_number:02d}_kling.mp4")
+        try:
+            await download(result["video_url"], path, expected_type="video/")
+        except Exception as e:
+            logger.warning(f"Kling clip for task {row.kling_task_id} download failed, retrying: {e}")
+        else:
+            values.update(
+                kling_status="succeed",
+                kling_mode=_attempt_mode(row.kling_mode, values["kling_attempts"]),
+                kling_next_poll_at=None,
+                raw_video_url=result["video_url"],
+                raw_video_path=path,
+                animation_method="kling",
+                error_message=None,
+            )
+            return
+    else:
+        values["kling_status"] = "processing"
+
+    _poll_again(row, values, now, age)
+
+
+def _poll_again(row, values: Dict[str, Any], now: datetime, age: float):
+    if age >= settings.KLING_TASK_TIMEOUT_SEC:
+        _attempt_failed(values, row.kling_mode, f"timed out after {age:.0f}s")
+    else:
+        values["kling_next_poll_at"] = now + timedelta(seconds=poll_interval(age))
+
+
+async def _submit_one(row, values: Dict[str, Any], now: datetime):
+    mode = _attempt_mode(row.kling_mode, values["kling_attempts"])
+    try:
+        image_b64 = await asyncio.to_thread(image_to_b64, row.local_image_path)
+        tail_b64 = (
+            await asyncio.to_thread(image_to_b64, row.tail_image_path)
+            if row.tail_image_path else None
+        )
+        task_id = await kling_service.submit_image_to_video(
+            image_b64,
+            row.motion_prompt or row.description,
+            row.negative_prompt,
+            mode,
+            row.kling_request_dur,
+            image_tail_b64=tail_b64,
+            model=row.kling_model or "kling-v3",
+        )
+    except KlingQuotaExceeded as e:
+        # Tasks outside this scheduler hold slots; stay queued without using an attempt
+        logger.info(f"Kling quota full, scene {row.scene_number} stays queued: {e}")
+        return
+    except Exception as e:
+        logger.warning(f"Kling {mode} submission for scene {row.scene_number} failed: {e}")
+        _attempt_failed(values, row.kling_mode, str(e))
+        return
+    values.update(
+        kling_status="submitted",
+        kling_task_id=task_id,
+        kling_submitted_at=now,
+        kling_next_poll_at=now + timedelta(seconds=poll_interval(0.0)),
+    )
+
+
+async def run_cycle(rows: List[Any], now: datetime) -> Tuple[List[Dict[str, Any]], Optional[datetime]]:
+    """
+    One scheduler pass over the active scenes (queued first-come first).
+    Returns (changed column values per scene, when the next pass is due or
+    None when nothing is active any more).
+    """
+    values = {
+        r.id: {
+            "scene_id": r.id,
+            # What the pass started from; the write is skipped if the row moved on
+            "prev_kling_status": r.kling_status,
+            "prev_kling_task_id": r.kling_task_id,
+            **{c: getattr(r, c) for c in SCHEDULER_COLUMNS},
+        }
+        for r in rows
+    }
+    touched = set()
+
+    due = [
+        r for r in rows
+        if r.kling_status in IN_FLIGHT_STATUSES
+        and (r.kling_next_poll_at is None or r.kling_next_poll_at <= now)
+    ]
+    await asyncio.gather(*(_poll_one(r, values[r.id], now) for r in due))
+    touched.update(r.id for r in due)
+
+    in_flight = sum(v["kling_status"] in IN_FLIGHT_STATUSES for v in values.values())
+    free = max(settings.KLING_MAX_CONCURRENT_TASKS - in_flight, 0)
+    # Scenes requeued by this pass wait for the next one
+    queued = [r for r in rows if r.kling_status == "queued"][:free]
+    await asyncio.gather(*(_submit_one(r, values[r.id], now) for r in queued))
+    touched.update(r.id for r in queued)
+
+    changes = [values[r.id] for r in rows if r.id in touched]
+    polls = [v["kling_next_poll_at"] for v in values.values() if v["kling_status"] in IN_FLIGHT_STATUSES]
+    waiting = any(v["kling_status"] == "queued" for v in values.values())
+    if waiting and len(polls) < settings.KLING_MAX_CONCURRENT_TASKS:
+        # A slot is free: submit the requeued scenes on the next pass
+        return changes, now + timedelta(seconds=settings.KLING_POLL_MIN_INTERVAL_SEC)
+    return changes, min(polls) if polls else None
+
+
+async def ensure_kling_poller():
+    """Schedule the central scheduler unless a run is already scheduled."""
+    try:
+        started = await get_redis().set(POLLER_KEY, "1", nx=True, ex=POLLER_KEY_TTL_SEC)
+    except Exception as e:
+        logger.warning(f"Kling poller lock unavailable, starting a run anyway: {e}")
+        started = True
+    if started:
+        poll_kling_tasks.delay()
+
+
+@celery_app.task(name="tasks.kling_poller.poll_kling_tasks")
+def poll_kling_tasks():
+    try:
+        next_due = run_async(_poll_kling_tasks_async())
+    except Exception as e:
+        logger.error(f"Kling poller run failed: {e}", exc_info=True)
+        next_due = datetime.now(timezone.utc) + timedelta(seconds=settings.KLING_POLL_MAX_INTERVAL_SEC)
+    run_async(_reschedule(next_due))
+
+
+async def _reschedule(next_due: Optional[datetime]):
+    client = get_redis()
+    if next_due is None:
+        await client.delete(POLLER_KEY)
+        return
+    countdown = (next_due - datetime.now(timezone.utc)).total_seconds()
+    countdown = min(max(countdown, 1.0), settings.KLING_POLL_MAX_INTERVAL_SEC)
+    await client.set(POLLER_KEY, "1", ex=int(countdown) + POLLER_KEY_TTL_SEC)
+    poll_kling_tasks.apply_async(countdown=countdown)
+
+
+async def _bulk_update_scenes(changes: List[Dict[str, Any]]):
+    """
+    Write every changed scene's scheduler columns in one executemany.
+    Rows whose kling_status or kling_task_id changed since the pass read
+    them — e.g. animate_scene gave up waiting and rendered Ken Burns — are
+    left alone rather than overwritten with the stale snapshot.
+    """
+    table = ProductionScene.__table__
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("b_scene_id"))
+        .where(table.c.kling_status == bindparam("b_prev_kling_status"))
+        .where(table.c.kling_task_id.is_not_distinct_from(bindparam("b_prev_kling_task_id")))
+        .values(**{column: bindparam(f"b_{column}") for column in SCHEDULER_COLUMNS})
+    )
+    async with async_session_factory() as db:
+        await db.execute(stmt, [
+            {f"b_{key}": value for key, value in change.items()} for change in changes
+        ])
+        await db.commit()
+
+
+async def _poll_kling_tasks_async() -> Optional[datetime]:
+    now = datetime.now(timezone.utc)
+    tail = aliased(ProductionScene)
+    async with async_session_factory() as db:
+        result = await db.execute(
+            select(
+                *(getattr(ProductionScene, c) for c in SCHEDULER_COLUMNS),
+                ProductionScene.id,
+                ProductionScene.scene_number,
+                ProductionScene.description,
+                ProductionScene.motion_prompt,
+                ProductionScene.negative_prompt,
+                ProductionScene.kling_model,
+                ProductionScene.kling_request_dur,
+                ProductionScene.local_image_path,
+                tail.local_image_path.label("tail_image_path"),
+                ProductionJob.job_dir,
+            )
+            .join(ProductionJob, ProductionScene.job_id == ProductionJob.id)
+            .outerjoin(tail, ProductionScene.image_tail_scene_id == tail.id)
+            .where(ProductionScene.kling_status.in_(ACTIVE_STATUSES))
+            .order_by(ProductionJob.created_at, ProductionScene.scene_number)
+        )
+        rows = result.all()
+    if not rows:
+        return None
+
+    changes, next_due = await run_cycle(rows, now)
+    if changes:
+        await _bulk_update_scenes(changes)
+
+    statuses = [c["kling_status"] for c in changes]
+    logger.info(
+        f"Kling poller: {len(rows)} active scenes, {statuses.count('submitted')} submitted, "
+        f"{statuses.count('succeed')} finished, {statuses.count('failed')} failed"
+    )
+    return next_due
@@ -1,18 +1,80 @@
+"""
+Stage 3 production pipeline — Guide §11.
+run_production_pipeline creates the job's scene/track rows and launches a
+Celery canvas:
+
+    ┌ music:  generate_music → collect_music → sync_scene_cuts ┐
+    │                                                           ├→ run_creative_direction
+    └ images: prepare_image_prompts → [generate_scene_image]×N ┘
+        → [animate_scene]×N → assemble_video → publish_video → complete_production
+
+collect_music only waits for tracks settled by the central Suno poller
+(tasks.suno_poller), which polls every job's clips in batched requests.
+Likewise animate_scene only queues Kling scenes and waits for the central
+Kling scheduler (tasks.kling_poller), which keeps every job's tasks
+within the account's parallel-task quota.
+
+Each node records {status, started_at, finished_at, error, ...} under
+ProductionJob.pipeline_nodes; a failing node marks the job failed and
+stops everything downstream of it.
+
+Runs are resumable: re-running a job reuses its existing rows, skips
+nodes already recorded as succeeded and, inside nodes, skips tracks and
+scenes whose output is already on disk, so only missing work is redone.
+"""
 import asyncio
 import logging
+import math
 import os
-import uuid
+import time
+from datetime import datetime, timezone
 from typing import List, Dict, Any
-from sqlalchemy import select, update
+
+from sqlalchemy import select, update, bindparam, func, literal, literal_column, Text
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from tasks.celery_app import celery_app
+from tasks.suno_poller import ensure_suno_poller
+from tasks.kling_poller import ACTIVE_STATUSES as KLING_ACTIVE_STATUSES, ensure_kling_poller
+from tasks.worker_loop import run_async
+from app.core.config import settings
 from app.db.session import AsyncSessionLocal as async_session_factory
 from app.models import ProductionJob, CurationJob, ProductionScene, ProductionTrack
+from app.services import claude_service, ffmpeg_service
+from app.services.audio_analysis import audio_analysis_service
+from app.services.cut_planner import plan_scene_cuts
+from app.services.downloader import download, url_suffix
+from app.services.image_prep import prepare_for_vision
+from app.services.ken_burns import render_ken_burns
+from app.services.kling_service import kling_duration, kling_service
 from app.services.media_gen_service import media_gen_service
-from app.services.suno_service import suno_service
-from celery import group, chord
+from app.services.suno_service import suno_clips, suno_service
+from app.services.youtube_service import youtube_service
+from celery import chain, group, chord
 
 logger = logging.getLogger(__name__)
 
+PIPELINE_NODES = ("music", "beat_sync", "images", "direction", "animation", "assembly", "publish")
+TERMINAL_NODE_STATUSES = ("succeeded", "failed", "skipped")
+DONE_NODE_STATUSES = ("succeeded", "skipped")
+FINISHED_JOB_STATUSES = ("completed", "published")
+# Redeliver a node if its worker dies mid-task; every node is idempotent
+NODE_TASK_OPTIONS = {"acks_late": True, "reject_on_worker_lost": True}
+
+
+class MusicNotReady(Exception):
+    """Suno clips still rendering — collect_music retries later."""
+
+
+class AnimationNotReady(Exception):
+    """Kling task queued or rendering — animate_scene retries later."""
+
+
+def _utcnow() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+def _exists(path: str) -> bool:
+    return bool(path) and os.path.exists(path)
+
 async def _update_job_status(job_id: str, status: str, error: str = None):
     async with async_session_factory() as db:
         stmt = update(ProductionJob).where(ProductionJob.id == job_id).values(
@@ -22,136 +84,826 @@ async def _update_job_status(job_id: str, status: str, error: str = None):
         await db.execute(stmt)
         await db.commit()
 
-@celery_app.task(name="tasks.production.start_production_job")
+async def _set_node(job_id: str, node: str, status: str, **fields):
+    """
+    Merge {status, **fields} into pipeline_nodes[node] in a single UPDATE,
+    so concurrent branches never overwrite each other's nodes.
+    started_at is kept from the first 'running' write.
+    """
+    payload = {"status": status, **fields}
+    defaults = {}
+    if status == "running":
+        defaults["started_at"] = _utcnow()
+    elif status in TERMINAL_NODE_STATUSES:
+        payload.setdefault("finished_at", _utcnow())
+
+    empty = literal_column("'{}'::jsonb")
+    current = func.coalesce(ProductionJob.pipeline_nodes.op("->", return_type=JSONB)(node), empty)
+    merged = (
+        literal(defaults, JSONB).op("||")(current).op("||")(literal(payload, JSONB))
+    )
+    value = func.jsonb_set(
+        func.coalesce(ProductionJob.pipeline_nodes, empty),
+        literal([node], ARRAY(Text)),
+        merged,
+        type_=JSONB,
+    )
+    async with async_session_factory() as db:
+        await db.execute(
+            update(ProductionJob).where(ProductionJob.id == job_id).values(pipeline_nodes=value)
+        )
+        await db.commit()
+
+async def _run_node(job_id: str, node: str, body, *args, job_status: str = None, finish: bool = True):
+    """
+    Run one DAG node: mark it running, await body(job_id, *args) and record
+    the summary dict it returns (a "status" key overrides "succeeded").
+    Failures mark the node and the job failed and re-raise so the canvas
+    stops downstream. finish=False leaves the node running for a later task.
+    Nodes already checkpointed as done are skipped.
+    """
+    async with async_session_factory() as db:
+        nodes = (await db.get(ProductionJob, job_id)).pipeline_nodes or {}
+    if nodes.get(node, {}).get("status") in DONE_NODE_STATUSES:
+        logger.info(f"Production job {job_id}: node '{node}' already done, skipping")
+        return {}
+
+    await _set_node(job_id, node, "running")
+    if job_status:
+        await _update_job_status(job_id, job_status)
+    try:
+        summary = await body(job_id, *args) or {}
+    except MusicNotReady:
+        raise
+    except Exception as e:
+        logger.error(f"Production job {job_id}: node '{node}' failed: {e}", exc_info=True)
+        await _set_node(job_id, node, "failed", error=str(e))
+        await _update_job_status(job_id, "failed", f"{node}: {e}")
+        raise
+    if finish:
+        await _set_node(job_id, node, summary.pop("status", "succeeded"), **summary)
+    return summary
+
+def _suno_clip_id(res: Any) -> str:
+    """First clip id of a create_track response, whatever its shape (suno_clips)."""
+    clips = suno_clips(res)
+    if not clips:
+        raise ValueError(f"Suno response has no clip id: {str(res)[:200]}")
+    return clips[0]["id"]
+
+async def _load_job_brief(db, job_id: str):
+    result = await db.execute(
+        select(ProductionJob, CurationJob.user_approved_brief)
+        .join(CurationJob, ProductionJob.curation_job_id == CurationJob.id)
+        .where(ProductionJob.id == job_id)
+    )
+    row = result.one_or_none()
+    if not row:
+        raise ValueError(f"Production job {job_id} not found")
+    return row
+
+async def _load_scenes(db, job_id: str) -> List[ProductionScene]:
+    result = await db.execute(
+        select(ProductionScene)
+        .where(ProductionScene.job_id == job_id)
+        .order_by(ProductionScene.scene_number)
+    )
+    return list(result.scalars().all())
+
+async def _bulk_update_scene_cuts(session, job_id: str, cuts: List[Dict[str, Any]]):
+    """Write beat_start/end/duration/drift for all of a job's scenes in one executemany."""
+    table = ProductionScene.__table__
+    stmt = (
+        update(table)
+        .where(
+            table.c.job_id == bindparam("b_job_id"),
+            table.c.scene_number == bindparam("b_scene_number"),
+        )
+        .values(
+            beat_start_sec=bindparam("b_beat_start_sec"),
+            beat_end_sec=bindparam("b_beat_end_sec"),
+            beat_duration_sec=bindparam("b_beat_duration_sec"),
+            beat_drift_ms=bindparam("b_beat_drift_ms"),
+        )
+    )
+    await session.execute(stmt, [
+        {"b_job_id": job_id, **{f"b_{key}": value for key, value in cut.items()}}
+        for cut in cuts
+    ])
+    await session.commit()
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+@celery_app.task(name="tasks.production.start_production_job", **NODE_TASK_OPTIONS)
 def start_production_job(job_id: str):
     """
-    Entry point for production job. Orchestrates parallel asset generation.
+    Entry point for production job — also used to resume a crashed or
+    failed one. Creates missing scene/track rows and launches the DAG for
+    whatever work is still outstanding.
     """
-    loop = asyncio.get_event_loop()
-    return loop.run_until_complete(run_production_pipeline(job_id))
+    return run_async(run_production_pipeline(job_id))
 
 async def run_production_pipeline(job_id: str):
     logger.info(f"Starting production pipeline for job {job_id}")
-    
+    try:
+        await _create_production_rows(job_id)
+        plan = await _plan_resume(job_id)
+    except Exception as e:
+        logger.error(f"Production job {job_id} could not start: {e}", exc_info=True)
+        await _update_job_status(job_id, "failed", str(e))
+        return
+
+    if plan is None:
+        logger.info(f"Production job {job_id} already finished")
+        return
+    image_scene_ids, animate_scene_ids = plan
+    result = build_production_pipeline(job_id, image_scene_ids, animate_scene_ids).apply_async()
     async with async_session_factory() as db:
-        # Load job and curation info
-        result = await db.execute(
-            select(ProductionJob, CurationJob)
-            .join(CurationJob, ProductionJob.curation_job_id == CurationJob.id)
+        await db.execute(
+            update(ProductionJob)
             .where(ProductionJob.id == job_id)
+            .values(status="generating_assets", celery_task_id=result.id, queued_at=None)
         )
-        row = result.one_or_none()
-        if not row:
-            logger.error(f"Job {job_id} not found")
-            return
+        await db.commit()
+    return result.id
 
-        job, curation = row
-        brief = curation.user_approved_brief
-        
-        if not brief or 'storyboard' not in brief:
-            await _update_job_status(job_id, "failed", "No approved storyboard found")
-            return
+async def _create_production_rows(job_id: str):
+    """
+    One ProductionScene per brief scene and one ProductionTrack per track
+    (Guide §12.2). Rows that already exist are kept, so re-running a job
+    never collides with the (job_id, scene_number) / (job_id, track_number)
+    unique constraints.
+    """
+    async with async_session_factory() as db:
+        job, brief = await _load_job_brief(db, job_id)
+        if not brief or not brief.get("scenes"):
+            raise ValueError("No approved brief with scenes found")
 
-        # 1. Initialize Scenes
-        scenes = []
-        for scene_data in brief['storyboard']:
-            new_scene = ProductionScene(
+        job.job_dir = job.job_dir or os.path.join(settings.JOB_FILES_DIR, str(job.id))
+        os.makedirs(job.job_dir, exist_ok=True)
+        job.num_scenes = len(brief["scenes"])
+        if not job.pipeline_nodes:
+            job.pipeline_nodes = {node: {"status": "pending"} for node in PIPELINE_NODES}
+
+        by_number = {s.scene_number: s for s in await _load_scenes(db, job_id)}
+        result = await db.execute(
+            select(ProductionTrack.track_number).where(ProductionTrack.job_id == job_id)
+        )
+        existing_tracks = set(result.scalars().all())
+
+        for scene_data in brief["scenes"]:
+            if scene_data["scene_number"] in by_number:
+                continue
+            scene = ProductionScene(
                 job_id=job.id,
-                scene_number=scene_data.get('scene_index'),
-                description=scene_data.get('narration'),
-                image_prompt=scene_data.get('visual_prompt'),
-                image_model="SeeDream4K", # Default from plan
-                status="pending"
+                scene_number=scene_data["scene_number"],
+                description=scene_data.get("description"),
+                lyric_or_timestamp=scene_data.get("lyric_or_timestamp"),
+                target_duration_sec=scene_data.get("target_duration_sec"),
+                kling_model=scene_data.get("kling_model", "kling-v3"),
+                kling_mode=scene_data.get("kling_mode", "std"),
+                motion_prompt=scene_data.get("motion_prompt"),
+                negative_prompt=scene_data.get("negative_prompt"),
+                animation_method=scene_data.get("animation_method", "kling"),
+                image_model="SeeDream4K",
             )
-            db.add(new_scene)
-            scenes.append(new_scene)
-        
-        # 2. Initialize Music Track
-        new_track = ProductionTrack(
-            job_id=job.id,
-            track_number=1,
-            song_prompt=brief.get('narrative_goal', 'Cinematic documentary'),
-            suno_status="pending"
-        )
-        db.add(new_track)
-        
-        await db.commit()
-        
-        # 3. Trigger Parallel Generation
-        # For simplicity in this iteration, we trigger them one by one asynchronously
-        # In a full production env, we'd use Celery signatures for better tracking
-        
-        await _update_job_status(job_id, "processing")
-        
-        # Trigger Image Generation tasks
-        image_tasks = [generate_scene_image.s(str(scene.id)) for scene in scenes]
-        
-        # Trigger Music Generation task
-        music_task = generate_music_track.s(str(new_track.id), brief.get('music_mood', 'Cinematic'))
-        
-        # We can use chord to detect when all scenes are done to proceed to Phase 5
-        # pipeline = chord(image_tasks)(finalize_production_assets.s(job_id))
-        
-        # For now, just fire and forget them as separate tasks
-        for t in image_tasks:
-            t.delay()
-        music_task.delay()
-
-@celery_app.task(name="tasks.production.generate_scene_image")
-def generate_scene_image(scene_id: str):
-    loop = asyncio.get_event_loop()
-    return loop.run_until_complete(_generate_scene_image_async(scene_id))
-
-async def _generate_scene_image_async(scene_id: str):
-    async with async_session_factory() as db:
-        result = await db.execute(select(ProductionScene).where(ProductionScene.id == scene_id))
-        scene = result.scalar_one_or_none()
-        if not scene: return
-        
-        scene.status = "generating"
-        await db.commit()
-        
-        # Call MediaGenService
-        res = await media_gen_service.generate_image(scene.image_prompt)
-        
-        if "error" in res:
-            scene.status = "failed"
-            scene.error_message = res["error"]
-        else:
-            scene.image_url = res["url"]
-            scene.status = "completed"
-            
+            db.add(scene)
+            by_number[scene.scene_number] = scene
+
+        for track_number in range(1, (job.num_tracks or 1) + 1):
+            if track_number not in existing_tracks:
+                db.add(ProductionTrack(job_id=job.id, track_number=track_number, suno_status="pending"))
+
+        await db.flush()
+        for scene_data in brief["scenes"]:
+            scene = by_number[scene_data["scene_number"]]
+            tail = by_number.get(scene_data.get("image_tail_scene"))
+            if tail is not None and scene.image_tail_scene_id is None:
+                scene.image_tail_scene_id = tail.id
+
+        await db.commit()
+
+async def _plan_resume(job_id: str):
+    """
+    Reconcile checkpoints with what is actually on disk and return
+    (scene ids needing an image, scene ids needing a clip), or None when
+    the job has nothing left to do. Unfinished nodes go back to pending;
+    outputs whose files have vanished are cleared along with the nodes
+    that depend on them.
+    """
+    async with async_session_factory() as db:
+        job = await db.get(ProductionJob, job_id)
+        if job.status in FINISHED_JOB_STATUSES:
+            return None
+
+        nodes = {node: dict(state) for node, state in (job.pipeline_nodes or {}).items()}
+        scenes = await _load_scenes(db, job_id)
+        result = await db.execute(select(ProductionTrack).where(ProductionTrack.job_id == job_id))
+        tracks = result.scalars().all()
+
+        def reopen(*names):
+            for name in names:
+                nodes[name] = {"status": "pending"}
+
+        for track in tracks:
+            if track.suno_status == "succeed" and not _exists(track.local_audio_path):
+                # Suno URL is still valid — the poller downloads it again
+                track.suno_status = "processing"
+                track.suno_next_poll_at = None
+                reopen("music", "beat_sync")
+            elif track.suno_status == "failed":
+                track.suno_status = "pending"
+        if not _exists(job.concatenated_audio_path) and nodes.get("music", {}).get("status") in DONE_NODE_STATUSES:
+            reopen("music", "beat_sync")
+
+        for scene in scenes:
+            if scene.local_image_path and not _exists(scene.local_image_path):
+                scene.local_image_path = None
+                reopen("images", "direction")
+            if scene.raw_video_path and not _exists(scene.raw_video_path):
+                scene.raw_video_path = None
+                reopen("animation", "assembly")
+        if not _exists(job.final_video_path) and nodes.get("assembly", {}).get("status") in DONE_NODE_STATUSES:
+            reopen("assembly")
+
+        for name in PIPELINE_NODES:
+            if nodes.get(name, {}).get("status") not in DONE_NODE_STATUSES:
+                reopen(name)
+        job.pipeline_nodes = nodes
+        job.error_message = None
+        await db.commit()
+
+        pending = [name for name in PIPELINE_NODES if nodes[name]["status"] == "pending"]
+        logger.info(f"Production job {job_id}: outstanding nodes {pending}")
+        return (
+            [str(s.id) for s in scenes if not s.local_image_path],
+            [str(s.id) for s in scenes if not s.raw_video_path],
+        )
+
+def _fan_out(task, job_id: str, scene_ids: List[str], callback):
+    """chord over the scenes that still need work, or just the callback if none do."""
+    if not scene_ids:
+        return callback
+    return chord(group(task.si(job_id, scene_id) for scene_id in scene_ids), callback)
+
+def build_production_pipeline(
+    job_id: str, image_scene_ids: List[str], animate_scene_ids: List[str]
+):
+    """
+    Music and images run as parallel branches; creative direction waits for
+    both, every scene animates in parallel, and assembly waits for the
+    slowest clip. Only the listed scenes are fanned out — on resume the
+    others already have their outputs.
+    """
+    music_branch = chain(
+        generate_music.si(job_id),
+        collect_music.si(job_id),
+        sync_scene_cuts.si(job_id),
+    )
+    image_branch = chain(
+        prepare_image_prompts.si(job_id),
+        _fan_out(generate_scene_image, job_id, image_scene_ids, finalize_images.si(job_id)),
+    )
+    return chain(
+        chord(group(music_branch, image_branch), run_creative_direction.si(job_id)),
+        _fan_out(animate_scene, job_id, animate_scene_ids, assemble_video.si(job_id)),
+        publish_video.si(job_id),
+        complete_production.si(job_id),
+    )
+
+# ---------------------------------------------------------------------------
+# Branch A — music (Guide §5)
+# ---------------------------------------------------------------------------
+
+@celery_app.task(name="tasks.production.generate_music", **NODE_TASK_OPTIONS)
+def generate_music(job_id: str):
+    return run_async(_run_node(job_id, "music", _generate_music_async, finish=False))
+
+async def _generate_music_async(job_id: str):
+    async with async_session_factory() as db:
+        job, brief = await _load_job_brief(db, job_id)
+        result = await db.execute(
+            select(ProductionTrack)
+            .where(ProductionTrack.job_id == job_id)
+            .order_by(ProductionTrack.track_number)
+        )
+        tracks = [
+            t for t in result.scalars().all()
+            if t.suno_status not in ("processing", "succeed") or not t.suno_task_id
+        ]
+        if not tracks:
+            return
+
+        prompts = await claude_service.generate_music_prompts(brief, len(tracks))
+        track_prompts = [prompts[i % len(prompts)] for i in range(len(tracks))]
+        mood = brief.get("suno_music_direction", {}).get("mood", "")
+        responses = await asyncio.gather(*(
+            suno_service.create_track(prompt, mood=mood) for prompt in track_prompts
+        ))
+
+        for track, prompt, res in zip(tracks, track_prompts, responses):
+            track.song_prompt = prompt
+            if "error" in res:
+                track.suno_status = "failed"
+                track.error_message = res["error"]
+            else:
+                track.suno_task_id = _suno_clip_id(res)
+                track.suno_status = "processing"
+                track.suno_submitted_at = datetime.now(timezone.utc)
+                track.suno_next_poll_at = None
         await db.commit()
+        await ensure_suno_poller()
+
+        failed = [t.track_number for t in tracks if t.suno_status == "failed"]
+        if failed:
+            raise RuntimeError(f"Suno rejected track(s) {failed}")
 
-@celery_app.task(name="tasks.production.generate_music_track")
-def generate_music_track(track_id: str, mood: str):
-    loop = asyncio.get_event_loop()
-    return loop.run_until_complete(_generate_music_track_async(track_id, mood))
+@celery_app.task(
+    bind=True,
+    name="tasks.production.collect_music",
+    # Backstop only: the poller fails tracks after SUNO_TRACK_TIMEOUT_SEC
+    max_retries=math.ceil(settings.SUNO_TRACK_TIMEOUT_SEC / settings.SUNO_POLL_MIN_INTERVAL_SEC) + 1,
+    **NODE_TASK_OPTIONS,
+)
+def collect_music(self, job_id: str):
+    """
+    Wait for the central Suno poller (tasks.suno_poller) to settle this
+    job's tracks without holding a worker: re-queue until every clip is
+    downloaded, then concatenate.
+    """
+    try:
+        return run_async(_run_node(job_id, "music", _collect_music_async))
+    except MusicNotReady as e:
+        if self.request.retries >= self.max_retries:
+            run_async(_set_node(job_id, "music", "failed", error="Timed out waiting for Suno"))
+            run_async(_update_job_status(job_id, "failed", "music: timed out waiting for Suno"))
+            raise
+        raise self.retry(exc=e, countdown=settings.SUNO_POLL_MIN_INTERVAL_SEC)
 
-async def _generate_music_track_async(track_id: str, mood: str):
+async def _collect_music_async(job_id: str):
     async with async_session_factory() as db:
-        result = await db.execute(select(ProductionTrack).where(ProductionTrack.id == track_id))
-        track = result.scalar_one_or_none()
-        if not track: return
-        
-        track.suno_status = "generating"
+        job = await db.get(ProductionJob, job_id)
+        result = await db.execute(
+            select(ProductionTrack)
+            .where(ProductionTrack.job_id == job_id)
+            .order_by(ProductionTrack.track_number)
+        )
+        tracks = result.scalars().all()
+
+        failed = [t.track_number for t in tracks if t.suno_status == "failed"]
+        if failed:
+            raise RuntimeError(f"Suno track(s) {failed} failed")
+        waiting = [t.track_number for t in tracks if t.suno_status != "succeed"]
+        if waiting:
+            # Restarts the poller if its last run was lost
+            await ensure_suno_poller()
+            raise MusicNotReady(f"Tracks {waiting} still rendering")
+
+        if _exists(job.concatenated_audio_path):
+            return {"tracks": len(tracks)}
+
+        audio_path = os.path.join(job.job_dir, "audio" + os.path.splitext(tracks[0].local_audio_path)[1])
+        await asyncio.to_thread(
+            ffmpeg_service.concatenate_audio_tracks,
+            [t.local_audio_path for t in tracks],
+            audio_path,
+        )
+        job.concatenated_audio_path = audio_path
         await db.commit()
-        
-        # Call SunoService
-        res = await suno_service.create_track(track.song_prompt, mood=mood)
-        
+        return {"tracks": len(tracks)}
+
+@celery_app.task(name="tasks.production.sync_scene_cuts", **NODE_TASK_OPTIONS)
+def sync_scene_cuts(job_id: str):
+    return run_async(_run_node(job_id, "beat_sync", _sync_scene_cuts_async))
+
+async def _sync_scene_cuts_async(job_id: str):
+    """
+    Analyse the job's concatenated audio and snap every scene to the
+    beat/onset grid (Guide §5.3). Scenes without a target duration share
+    the usable length evenly.
+    """
+    async with async_session_factory() as db:
+        job = await db.get(ProductionJob, job_id)
+        if not job or not job.concatenated_audio_path:
+            raise ValueError("No concatenated audio to sync against")
+
+        analysis = await asyncio.to_thread(
+            audio_analysis_service.analyze, job.concatenated_audio_path
+        )
+        if "error" in analysis:
+            raise RuntimeError(f"Beat analysis failed: {analysis['error']}")
+
+        result = await db.execute(
+            select(ProductionScene.scene_number, ProductionScene.target_duration_sec)
+            .where(ProductionScene.job_id == job_id)
+            .order_by(ProductionScene.scene_number)
+        )
+        rows = result.all()
+        even_share = analysis["usable_duration_sec"] / max(len(rows), 1)
+        scene_targets = [
+            {
+                "scene_number": number,
+                "target_duration_sec": float(target) if target else even_share,
+            }
+            for number, target in rows
+        ]
+        cuts = plan_scene_cuts(analysis, scene_targets)
+
+        job.audio_duration_sec = analysis["audio_duration_sec"]
+        job.tempo_bpm = analysis["tempo_bpm"]
+        job.beat_interval_sec = analysis["beat_interval_sec"]
+        job.beat_timestamps = analysis["beat_times"]
+        await _bulk_update_scene_cuts(db, job_id, cuts)
+
+        total_drift = sum(abs(c["beat_drift_ms"]) for c in cuts)
+        logger.info(
+            f"Planned {len(cuts)} beat-matched cuts for job {job_id} "
+            f"(total drift {total_drift:.0f} ms)"
+        )
+        return {
+            "scenes": len(cuts),
+            "tempo_bpm": round(analysis["tempo_bpm"], 1),
+            "total_drift_ms": round(total_drift, 1),
+        }
+
+# ---------------------------------------------------------------------------
+# Branch B — scene images (Guide §6)
+# ---------------------------------------------------------------------------
+
+@celery_app.task(name="tasks.production.prepare_image_prompts", **NODE_TASK_OPTIONS)
+def prepare_image_prompts(job_id: str):
+    return run_async(_run_node(job_id, "images", _prepare_image_prompts_async, finish=False))
+
+async def _prepare_image_prompts_async(job_id: str):
+    async with async_session_factory() as db:
+        _, brief = await _load_job_brief(db, job_id)
+        result = await db.execute(
+            select(ProductionScene.scene_number).where(
+                ProductionScene.job_id == job_id,
+                ProductionScene.image_prompt.is_(None),
+            )
+        )
+        missing = set(result.scalars().all())
+        if not missing:
+            return
+        brief = {**brief, "scenes": [s for s in brief["scenes"] if s["scene_number"] in missing]}
+        prompts = await claude_service.generate_image_prompts(brief)
+        table = ProductionScene.__table__
+        await db.execute(
+            update(table)
+            .where(
+                table.c.job_id == bindparam("b_job_id"),
+                table.c.scene_number == bindparam("b_scene_number"),
+            )
+            .values(image_prompt=bindparam("b_image_prompt")),
+            [
+                {"b_job_id": job_id, "b_scene_number": scene["scene_number"], "b_image_prompt": prompt}
+                for scene, prompt in zip(brief["scenes"], prompts)
+            ],
+        )
+        await db.commit()
+
+@celery_app.task(
+    bind=True,
+    name="tasks.production.generate_scene_image",
+    max_retries=3,
+    default_retry_delay=10,
+    **NODE_TASK_OPTIONS,
+)
+def generate_scene_image(self, job_id: str, scene_id: str):
+    """
+    Generate + download one scene still. The final failure is recorded on
+    the scene instead of raised, so the chord still reaches finalize_images.
+    """
+    try:
+        return run_async(_generate_scene_image_async(job_id, scene_id))
+    except Exception as e:
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e)
+        logger.error(f"Scene {scene_id} image failed after retries: {e}")
+        run_async(_record_scene_error(scene_id, f"Image generation failed: {e}"))
+
+async def _record_scene_error(scene_id: str, error: str):
+    async with async_session_factory() as db:
+        await db.execute(
+            update(ProductionScene).where(ProductionScene.id == scene_id).values(error_message=error)
+        )
+        await db.commit()
+
+async def _generate_scene_image_async(job_id: str, scene_id: str):
+    async with async_session_factory() as db:
+        scene = await db.get(ProductionScene, scene_id)
+        if _exists(scene.local_image_path):
+            return
+        job = await db.get(ProductionJob, job_id)
+
+        res = await media_gen_service.generate_image(scene.image_prompt or scene.description)
         if "error" in res:
-            track.suno_status = "failed"
-            track.error_message = res["error"]
+            raise RuntimeError(res["error"])
+
+        path = os.path.join(
+            job.job_dir, f"scene_{scene.scene_number:02d}{url_suffix(res['url'], '.png')}"
+        )
+        scene.image_url = res["url"]
+        scene.local_image_path = await download(res["url"], path, expected_type="image/")
+        scene.error_message = None
+        await db.commit()
+
+@celery_app.task(name="tasks.production.finalize_images", **NODE_TASK_OPTIONS)
+def finalize_images(job_id: str):
+    return run_async(_run_node(job_id, "images", _finalize_images_async))
+
+async def _finalize_images_async(job_id: str):
+    async with async_session_factory() as db:
+        scenes = await _load_scenes(db, job_id)
+    missing = [s.scene_number for s in scenes if not s.local_image_path]
+    if missing:
+        raise RuntimeError(f"No image for scene(s) {missing}")
+    return {"scenes": len(scenes)}
+
+# ---------------------------------------------------------------------------
+# Creative direction (Guide §7) — waits for both branches
+# ---------------------------------------------------------------------------
+
+@celery_app.task(name="tasks.production.run_creative_direction", **NODE_TASK_OPTIONS)
+def run_creative_direction(job_id: str):
+    return run_async(
+        _run_node(job_id, "direction", _run_creative_direction_async, job_status="directing")
+    )
+
+async def _run_creative_direction_async(job_id: str):
+    """Claude reviews each still against its beat window; failures keep the brief's direction."""
+    async with async_session_factory() as db:
+        _, brief = await _load_job_brief(db, job_id)
+        scenes = await _load_scenes(db, job_id)
+        theme = brief.get("theme", "")
+
+        async def direct(scene: ProductionScene):
+            with open(scene.local_image_path, "rb") as f:
+                raw = f.read()
+            image_b64 = await asyncio.to_thread(prepare_for_vision, raw)
+            if image_b64 is None:
+                raise ValueError(f"Unreadable image {scene.local_image_path}")
+            return await claude_service.direct_scene(
+                scene_image_b64=image_b64,
+                scene_desc=scene.description or "",
+                theme=theme,
+                beat_start=float(scene.beat_start_sec or 0),
+                beat_end=float(scene.beat_end_sec or 0),
+                has_image_tail=scene.image_tail_scene_id is not None,
+            )
+
+        results = await asyncio.gather(*(direct(s) for s in scenes), return_exceptions=True)
+        directed = 0
+        for scene, direction in zip(scenes, results):
+            if isinstance(direction, Exception):
+                logger.warning(f"Scene {scene.scene_number} direction failed, keeping brief: {direction}")
+                continue
+            scene.motion_prompt = direction.get("motion_prompt", scene.motion_prompt)
+            scene.negative_prompt = direction.get("negative_prompt", scene.negative_prompt)
+            scene.kling_mode = direction.get("kling_mode", scene.kling_mode)
+            if not direction.get("image_tail_confirmed", True):
+                scene.image_tail_scene_id = None
+            directed += 1
+        await db.commit()
+        return {"directed": directed, "kept_brief": len(scenes) - directed}
+
+# ---------------------------------------------------------------------------
+# Animation (Guide §8) — one task per scene
+# ---------------------------------------------------------------------------
+
+@celery_app.task(
+    bind=True,
+    name="tasks.production.animate_scene",
+    # Waiting on the Kling scheduler; once exhausted the scene takes Ken Burns
+    max_retries=math.ceil(settings.KLING_WAIT_TIMEOUT_SEC / settings.KLING_POLL_MIN_INTERVAL_SEC) + 1,
+    default_retry_delay=15,
+    **NODE_TASK_OPTIONS,
+)
+def animate_scene(self, job_id: str, scene_id: str, failures: int = 0):
+    """
+    Wait for the central Kling scheduler without holding a worker: re-queue
+    until the scene's clip is downloaded or Kling gives up. Other failures
+    are retried once, then recorded on the scene; assemble_video decides
+    whether to stop.
+    """
+    wait_expired = self.request.retries >= self.max_retries
+    if self.request.retries == 0:
+        # Once per scene, not on every Kling wait
+        run_async(_start_animation_node(job_id))
+    try:
+        return run_async(_animate_scene_async(job_id, scene_id, wait_expired))
+    except AnimationNotReady as e:
+        raise self.retry(exc=e, countdown=settings.KLING_POLL_MIN_INTERVAL_SEC)
+    except Exception as e:
+        if failures < 1 and not wait_expired:
+            raise self.retry(exc=e, kwargs={"failures": failures + 1})
+        logger.error(f"Scene {scene_id} animation failed after retries: {e}")
+        run_async(_record_scene_error(scene_id, f"Animation failed: {e}"))
+
+async def _start_animation_node(job_id: str):
+    await _set_node(job_id, "animation", "running")
+    await _update_job_status(job_id, "animating")
+
+async def _animate_scene_async(job_id: str, scene_id: str, wait_expired: bool = False):
+    """
+    Produce the scene's raw clip (Guide §8). Kling scenes are queued at
+    kling_duration(beat_duration_sec) for tasks.kling_poller, which submits,
+    polls and downloads them; until then this raises AnimationNotReady.
+    Scenes directed to Ken Burns, scenes whose Kling chain failed or whose
+    wait expired, and all scenes when no Kling keys are configured take the
+    Ken Burns step of the fallback chain (Guide §8.5) at
+    ceil(beat_duration_sec) seconds.
+    """
+    async with async_session_factory() as db:
+        scene = await db.get(ProductionScene, scene_id)
+        if _exists(scene.raw_video_path):
+            return
+        job = await db.get(ProductionJob, job_id)
+
+        use_kling = scene.animation_method == "kling" and kling_service.configured()
+        if use_kling and not wait_expired and scene.kling_status != "failed":
+            if scene.kling_status not in KLING_ACTIVE_STATUSES:
+                scene.kling_status = "queued"
+                scene.kling_task_id = None
+                scene.kling_attempts = 0
+                scene.kling_request_dur = kling_duration(float(scene.beat_duration_sec))
+                scene.kling_submitted_at = None
+                scene.kling_next_poll_at = None
+                await db.commit()
+            # Also restarts the scheduler if its last run was lost
+            await ensure_kling_poller()
+            raise AnimationNotReady(f"Scene {scene.scene_number} is {scene.kling_status} on Kling")
+
+        if scene.kling_status in KLING_ACTIVE_STATUSES:
+            # Wait expired: take the scene out of the scheduler
+            scene.kling_status = "failed"
+            scene.kling_next_poll_at = None
+
+        duration = math.ceil(float(scene.beat_duration_sec))
+        raw_path = os.path.join(job.job_dir, f"raw_{scene.scene_number:02d}.mp4")
+        direction = ffmpeg_service.KEN_BURNS_DIRECTIONS[
+            scene.scene_number % len(ffmpeg_service.KEN_BURNS_DIRECTIONS)
+        ]
+        render = (
+            ffmpeg_service.apply_ken_burns
+            if settings.KEN_BURNS_ENGINE == "zoompan"
+            else render_ken_burns
+        )
+        await asyncio.to_thread(render, scene.local_image_path, raw_path, duration, direction)
+
+        scene.kling_request_dur = duration
+        scene.raw_video_path = raw_path
+        if scene.animation_method != "ken_burns":
+            scene.animation_method = "ken_burns_fallback"
+        scene.error_message = None
+        await db.commit()
+
+# ---------------------------------------------------------------------------
+# Assembly (Guide §9) and publish (Guide §10)
+# ---------------------------------------------------------------------------
+
+@celery_app.task(name="tasks.production.assemble_video", **NODE_TASK_OPTIONS)
+def assemble_video(job_id: str):
+    run_async(_run_node(job_id, "animation", _finalize_animation_async))
+    return run_async(
+        _run_node(job_id, "assembly", _assemble_video_async, job_status="assembling")
+    )
+
+async def _finalize_animation_async(job_id: str):
+    async with async_session_factory() as db:
+        scenes = await _load_scenes(db, job_id)
+    missing = [s.scene_number for s in scenes if not s.raw_video_path]
+    if missing:
+        raise RuntimeError(f"No clip for scene(s) {missing}")
+    return {
+        "scenes": len(scenes),
+        "ken_burns": sum(s.animation_method in ("ken_burns", "ken_burns_fallback") for s in scenes),
+    }
+
+async def _assemble_video_async(job_id: str):
+    """
+    Build final.mp4 from the scenes' raw clips and the soundtrack with the
+    ASSEMBLY_MODE engine, then record its duration and size.
+    """
+    async with async_session_factory() as db:
+        job = await db.get(ProductionJob, job_id)
+        scenes = await _load_scenes(db, job_id)
+
+        clips = [
+            {"raw_path": scene.raw_video_path, "beat_dur_sec": float(scene.beat_duration_sec)}
+            for scene in scenes
+        ]
+        fade_start = sum(c["beat_dur_sec"] for c in clips) - ffmpeg_service.FADE_SEC
+        final_path = os.path.join(job.job_dir, "final.mp4")
+
+        started = time.perf_counter()
+        if settings.ASSEMBLY_MODE == "single_pass":
+            await asyncio.to_thread(
+                ffmpeg_service.assemble_single_pass,
+                clips,
+                job.concatenated_audio_path,
+                final_path,
+                fade_start,
+            )
+            job.assembled_video_path = None
+            summary = {"mode": "single_pass"}
+        else:
+            summary = await _assemble_from_clips(db, job, scenes, clips, final_path, fade_start)
+            summary["mode"] = "clips"
+
+        job.final_video_path = final_path
+        job.total_duration_sec = await asyncio.to_thread(ffmpeg_service.probe_duration, final_path)
+        job.file_size_bytes = os.path.getsize(final_path)
+        await db.commit()
+        return {
+            "clips": len(clips),
+            **summary,
+            "assembly_sec": round(time.perf_counter() - started, 2),
+            "duration_sec": round(float(job.total_duration_sec), 2),
+        }
+
+async def _assemble_from_clips(db, job, scenes, clips, final_path: str, fade_start: float):
+    """
+    Guide §9 path: trim + normalize every clip in parallel, concat, then
+    merge with the soundtrack and fade out. Normalized clips are cached by
+    content under job_dir/norm_cache, so a re-run only re-encodes scenes
+    that changed.
+    """
+    started = time.perf_counter()
+    results = await asyncio.to_thread(
+        ffmpeg_service.normalize_clips_cached, clips, os.path.join(job.job_dir, "norm_cache")
+    )
+    normalize_sec = round(time.perf_counter() - started, 2)
+    failed = []
+    for scene, result in zip(scenes, results):
+        if "error" in result:
+            scene.error_message = f"normalize: {result['error']}"
+            failed.append(scene.scene_number)
         else:
-            # Suno usually returns clip info immediately or job ID
-            # Here we assume it returns something we can store
-            track.suno_task_id = res.get('id', 'unknown')
-            track.suno_status = "polling"
-            
+            scene.local_video_path = result["output_path"]
+    await db.commit()
+    if failed:
+        raise RuntimeError(f"Could not normalize clip(s) for scene(s) {failed}")
+
+    assembled_path = os.path.join(job.job_dir, "assembled_raw.mp4")
+    await asyncio.to_thread(
+        ffmpeg_service.assemble_scenes, [r["output_path"] for r in results], assembled_path
+    )
+    await asyncio.to_thread(
+        ffmpeg_service.merge_audio_video,
+        assembled_path,
+        job.concatenated_audio_path,
+        final_path,
+        fade_start,
+    )
+    job.assembled_video_path = assembled_path
+    return {
+        "normalize_sec": normalize_sec,
+        "clips_reused": sum(bool(r.get("cached")) for r in results),
+    }
+
+@celery_app.task(name="tasks.production.publish_video", **NODE_TASK_OPTIONS)
+def publish_video(job_id: str):
+    return run_async(_run_node(job_id, "publish", _publish_video_async, job_status="uploading"))
+
+async def _publish_video_async(job_id: str):
+    async with async_session_factory() as db:
+        job, brief = await _load_job_brief(db, job_id)
+        seo = await claude_service.generate_seo_metadata(brief)
+        job.youtube_title = seo.get("title")
+        job.youtube_description = seo.get("description")
+        job.youtube_hashtags = " ".join(seo.get("hashtags", []))
         await db.commit()
 
-@celery_app.task(name="tasks.production.finalize_production_assets")
-def finalize_production_assets(job_id: str):
-    # This task would check if everything is ready and mark the job as "ready_for_animation"
-    pass
+        if job.youtube_video_id:
+            return {"youtube_video_id": job.youtube_video_id}
+        if not youtube_service.can_upload():
+            return {"status": "skipped", "reason": "No YouTube OAuth credentials configured"}
+
+        job.youtube_video_id = await asyncio.to_thread(
+            youtube_service.upload_video,
+            job.final_video_path,
+            seo.get("title", ""),
+            seo.get("description", ""),
+            seo.get("tags", []),
+            seo.get("hashtags", []),
+            seo.get("category_id", "10"),
+        )
+        job.published_at = datetime.now(timezone.utc)
+        await db.commit()
+        return {"youtube_video_id": job.youtube_video_id}
+
+@celery_app.task(name="tasks.production.complete_production", **NODE_TASK_OPTIONS)
+def complete_production(job_id: str):
+    return run_async(_complete_production_async(job_id))
+
+async def _complete_production_async(job_id: str):
+    async with async_session_factory() as db:
+        job = await db.get(ProductionJob, job_id)
+        job.status = "published" if job.youtube_video_id else "completed"
+        job.error_message = None
+        await db.commit()
+        logger.info(f"Production job {job_id} → {job.status}")
@@ -2,18 +2,52 @@ import asyncio
 from typing import List, Optional
 from celery.utils.log import get_task_logger
 from tasks.celery_app import celery_app
-from app.services.youtube_service import youtube_service
+from tasks.worker_loop import run_async
+from app.services.research_engine import research_engine, StageTimer
 from app.services.ai_service import ai_service
+from app.services.transcript_cache import transcript_cache
 from app.db.session import AsyncSessionLocal
 from app.models import ResearchJob, ResearchVideo
-from sqlalchemy import select, update
+from sqlalchemy import bindparam, select, update
 
 logger = get_task_logger(__name__)
 
 
+async def _bulk_update_video_metadata(session, job_id: str, metadata: dict):
+    """Fill channel/views/likes/duration/published_at for a job's videos in one executemany."""
+    table = ResearchVideo.__table__
+    stmt = (
+        update(table)
+        .where(
+            table.c.job_id == bindparam("b_job_id"),
+            table.c.video_id == bindparam("b_video_id"),
+        )
+        .values(
+            channel=bindparam("b_channel"),
+            views=bindparam("b_views"),
+            likes=bindparam("b_likes"),
+            duration_seconds=bindparam("b_duration_seconds"),
+            published_at=bindparam("b_published_at"),
+        )
+    )
+    await session.execute(stmt, [
+        {
+            "b_job_id": job_id,
+            "b_video_id": video_id,
+            **{f"b_{key}": value for key, value in meta.items()},
+        }
+        for video_id, meta in metadata.items()
+    ])
+    await session.commit()
+
+
 async def _orchestrate_research(
-    job_id: str, topic: str, research_brief: Optional[dict] = None
+    job_id: str,
+    topic: str,
+    research_brief: Optional[dict] = None,
+    bypass_transcript_cache: bool = False,
 ):
+    timer = StageTimer()
     async with AsyncSessionLocal() as session:
         try:
             logger.info(f"Starting research job {job_id} for topic: {topic}")
@@ -42,15 +76,9 @@ async def _orchestrate_research(
                 search_queries = [topic]
                 logger.info("No research brief — using raw topic as query")
 
-            # 3. Search videos using all queries
-            all_videos = []
-            seen_ids = set()
-            for query in search_queries:
-                videos = youtube_service.search_videos(query)
-                for v in videos:
-                    if v["video_id"] not in seen_ids:
-                        seen_ids.add(v["video_id"])
-                        all_videos.append(v)
+            # 3. Search videos using all queries (concurrently, off the event loop)
+            with timer.stage("search"):
+                all_videos = await research_engine.search(search_queries)
 
             if not all_videos:
                 logger.warning(f"No videos found for topic: {topic}")
@@ -60,6 +88,7 @@ async def _orchestrate_research(
                     .values(
                         status="failed",
                         research_summary="No videos found",
+                        stage_timings=timer.finish(),
                     )
                 )
                 await session.commit()
@@ -69,28 +98,43 @@ async def _orchestrate_research(
                 f"Found {len(all_videos)} unique videos. Extracting transcripts..."
             )
 
-            # 4. Process each video
+            # 4. Hydrate stats/duration in 50-ID batches while transcripts download
+            async def _timed_hydration():
+                with timer.stage("metadata"):
+                    return await research_engine.hydrate_metadata(
+                        [v["video_id"] for v in all_videos]
+                    )
+
+            hydration = asyncio.create_task(_timed_hydration())
+
+            # 5. Process each video — rows are committed as transcripts arrive
             transcripts = []
-            for video_data in all_videos:
-                transcript = youtube_service.get_transcript(
-                    video_data["video_id"]
-                )
+            cache_before = transcript_cache.stats()
+            with timer.stage("transcripts"):
+                async for video_data, transcript in research_engine.iter_transcripts(
+                    all_videos, bypass_cache=bypass_transcript_cache
+                ):
+                    rv = ResearchVideo(
+                        job_id=job_id,
+                        video_id=video_data["video_id"],
+                        title=video_data["title"],
+                        description=video_data.get("description", ""),
+                        thumbnail_url=video_data.get("thumbnail_url", ""),
+                        url=f"https://www.youtube.com/watch?v={video_data['video_id']}",
+                    )
+                    session.add(rv)
+                    await session.commit()
+                    if transcript:
+                        transcripts.append(transcript)
 
-                rv = ResearchVideo(
-                    job_id=job_id,
-                    video_id=video_data["video_id"],
-                    title=video_data["title"],
-                    description=video_data.get("description", ""),
-                    thumbnail_url=video_data.get("thumbnail_url", ""),
-                    url=f"https://www.youtube.com/watch?v={video_data['video_id']}",
-                )
-                session.add(rv)
-                if transcript:
-                    transcripts.append(transcript)
+            logger.info(f"Transcript cache for job {job_id}: {transcript_cache.stats(since=cache_before)}")
 
-            await session.commit()
+            metadata = await hydration
+            if metadata:
+                await _bulk_update_video_metadata(session, job_id, metadata)
+                logger.info(f"Hydrated metadata for {len(metadata)} videos")
 
-            # 5. AI Analysis
+            # 6. AI Analysis
             if transcripts:
                 logger.info(
                     f"Extracted {len(transcripts)} transcripts. Running AI analysis..."
@@ -102,11 +146,12 @@ async def _orchestrate_research(
                 )
                 await session.commit()
 
-                analysis_result = await ai_service.analyze_transcripts(
-                    topic, transcripts
-                )
+                with timer.stage("analysis"):
+                    analysis_result = await ai_service.analyze_transcripts(
+                        topic, transcripts, research_brief
+                    )
 
-                # 6. Final update
+                # 7. Final update
                 if "error" in analysis_result:
                     await session.execute(
                         update(ResearchJob)
@@ -114,6 +159,7 @@ async def _orchestrate_research(
                         .values(
                             status="failed",
                             research_summary=f"AI Analysis error: {analysis_result['error']}",
+                            stage_timings=timer.finish(),
                         )
                     )
                 else:
@@ -125,6 +171,7 @@ async def _orchestrate_research(
                             research_summary=analysis_result.get(
                                 "raw_analysis", "Analysis failed"
                             ),
+                            stage_timings=timer.finish(),
                         )
                     )
                 await session.commit()
@@ -137,6 +184,7 @@ async def _orchestrate_research(
                     .values(
                         status="failed",
                         research_summary="No transcripts extracted",
+                        stage_timings=timer.finish(),
                     )
                 )
                 await session.commit()
@@ -146,25 +194,28 @@ async def _orchestrate_research(
             await session.execute(
                 update(ResearchJob)
                 .where(ResearchJob.id == job_id)
-                .values(status="failed", research_summary=str(e))
+                .values(
+                    status="failed",
+                    research_summary=str(e),
+                    stage_timings=timer.finish(),
+                )
             )
             await session.commit()
 
 
 @celery_app.task(name="tasks.research.start_research_job")
 def start_research_job(
-    job_id: str, topic: str, research_brief: Optional[dict] = None
+    job_id: str,
+    topic: str,
+    research_brief: Optional[dict] = None,
+    bypass_transcript_cache: bool = False,
 ):
     """Entry point for Celery to start the async orchestration."""
     try:
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-        return loop.run_until_complete(
-            _orchestrate_research(job_id, topic, research_brief)
+        return run_async(
+            _orchestrate_research(
+                job_id, topic, research_brief, bypass_transcript_cache
+            )
         )
     except Exception as e:
         logger.error(f"Failed to run async task: {e}")
@@ -0,0 +1,200 @@
+"""
+Central Suno poller shared by every production job.
+Instead of each job's collect_music task polling its own clips, a single
+self-rescheduling poll_suno_tracks task picks up every ProductionTrack in
+'processing' state whose next poll is due, queries /feed in batches of
+SUNO_FEED_BATCH_SIZE clip IDs, downloads finished audio concurrently into
+the owning job's directory (capped by the shared downloader) and writes all row changes in one executemany.
+
+Each track's poll interval starts at SUNO_POLL_MIN_INTERVAL_SEC and grows
+with its age (Suno rarely finishes in the first minute, and stragglers
+don't need second-by-second polling); tracks older than
+SUNO_TRACK_TIMEOUT_SEC are marked failed.
+
+A Redis key marks the poller as scheduled. ensure_suno_poller() starts it
+when the key is absent; the key expires on its own if a poller run is lost,
+and collect_music calls ensure_suno_poller() on every check, so polling
+always resumes.
+"""
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select, update, bindparam
+
+from tasks.celery_app import celery_app
+from tasks.worker_loop import get_redis, run_async
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal as async_session_factory
+from app.models import ProductionJob, ProductionTrack
+from app.services.downloader import download, url_suffix
+from app.services.suno_service import suno_service
+
+logger = logging.getLogger(__name__)
+
+POLLER_KEY = "ymf:suno:poller"
+POLLER_KEY_TTL_SEC = int(settings.SUNO_POLL_MAX_INTERVAL_SEC * 3)
+
+def poll_interval(age_sec: float) -> float:
+    """Seconds until a track of this age is polled again."""
+    return min(
+        settings.SUNO_POLL_MAX_INTERVAL_SEC,
+        settings.SUNO_POLL_MIN_INTERVAL_SEC + max(age_sec, 0.0) * settings.SUNO_POLL_BACKOFF,
+    )
+
+
+async def ensure_suno_poller():
+    """Schedule the central poller unless a run is already scheduled."""
+    try:
+        started = await get_redis().set(POLLER_KEY, "1", nx=True, ex=POLLER_KEY_TTL_SEC)
+    except Exception as e:
+        logger.warning(f"Suno poller lock unavailable, starting a run anyway: {e}")
+        started = True
+    if started:
+        poll_suno_tracks.delay()
+
+
+@celery_app.task(name="tasks.suno_poller.poll_suno_tracks")
+def poll_suno_tracks():
+    try:
+        next_due = run_async(_poll_suno_tracks_async())
+    except Exception as e:
+        logger.error(f"Suno poller run failed: {e}", exc_info=True)
+        next_due = datetime.now(timezone.utc) + timedelta(seconds=settings.SUNO_POLL_MAX_INTERVAL_SEC)
+    run_async(_reschedule(next_due))
+
+
+async def _reschedule(next_due: Optional[datetime]):
+    client = get_redis()
+    if next_due is None:
+        await client.delete(POLLER_KEY)
+        return
+    countdown = (next_due - datetime.now(timezone.utc)).total_seconds()
+    countdown = min(max(countdown, 1.0), settings.SUNO_POLL_MAX_INTERVAL_SEC)
+    await client.set(POLLER_KEY, "1", ex=int(countdown) + POLLER_KEY_TTL_SEC)
+    poll_suno_tracks.apply_async(countdown=countdown)
+
+
+async def _settle_track(row, clip: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+    """Work out a polled track's new column values, downloading it if finished."""
+    values = {
+        "track_id": row.id,
+        "suno_status": "processing",
+        "audio_url": row.audio_url,
+        "local_audio_path": row.local_audio_path,
+        "duration_seconds": row.duration_seconds,
+        "error_message": row.error_message,
+        "suno_next_poll_at": None,
+    }
+    age = (now - (row.suno_submitted_at or row.created_at)).total_seconds()
+
+    if clip.get("status") == "error":
+        values["suno_status"] = "failed"
+        values["error_message"] = clip.get("error_message") or "Suno generation failed"
+        return values
+
+    if clip.get("status") == "complete" and clip.get("audio_url"):
+        path = os.path.join(
+            row.job_dir,
+            f"track_{row.track_number:02d}{url_suffix(clip['audio_url'], '.mp3')}",
+        )
+        try:
+            await download(clip["audio_url"], path, expected_type="audio/")
+        except Exception as e:
+            logger.warning(f"Suno clip {row.suno_task_id} download failed, retrying next poll: {e}")
+        else:
+            values.update(
+                suno_status="succeed",
+                audio_url=clip["audio_url"],
+                local_audio_path=path,
+                duration_seconds=clip.get("metadata", {}).get("duration"),
+                error_message=None,
+            )
+            return values
+
+    if age >= settings.SUNO_TRACK_TIMEOUT_SEC:
+        values["suno_status"] = "failed"
+        values["error_message"] = "Timed out waiting for Suno"
+    else:
+        values["suno_next_poll_at"] = now + timedelta(seconds=poll_interval(age))
+    return values
+
+
+async def _bulk_update_tracks(changes):
+    """Write every polled track's new values in one executemany."""
+    table = ProductionTrack.__table__
+    columns = [key for key in changes[0] if key != "track_id"]
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("b_track_id"))
+        .values(**{column: bindparam(f"b_{column}") for column in columns})
+    )
+    async with async_session_factory() as db:
+        await db.execute(stmt, [
+            {f"b_{key}": value for key, value in change.items()} for change in changes
+        ])
+        await db.commit()
+
+
+async def _poll_suno_tracks_async() -> Optional[datetime]:
+    """
+    Poll every due track once. Returns when the next track falls due, or
+    None when nothing is left rendering.
+    """
+    now = datetime.now(timezone.utc)
+    async with async_session_factory() as db:
+        result = await db.execute(
+            select(
+                ProductionTrack.id,
+                ProductionTrack.track_number,
+                ProductionTrack.suno_task_id,
+                ProductionTrack.suno_submitted_at,
+                ProductionTrack.suno_next_poll_at,
+                ProductionTrack.created_at,
+                ProductionTrack.audio_url,
+                ProductionTrack.local_audio_path,
+                ProductionTrack.duration_seconds,
+                ProductionTrack.error_message,
+                ProductionJob.job_dir,
+            )
+            .join(ProductionJob, ProductionTrack.job_id == ProductionJob.id)
+            .where(
+                ProductionTrack.suno_status == "processing",
+                ProductionTrack.suno_task_id.isnot(None),
+            )
+        )
+        rows = result.all()
+    if not rows:
+        return None
+
+    due, waiting = [], []
+    for r in rows:
+        if r.suno_next_poll_at is None or r.suno_next_poll_at <= now:
+            due.append(r)
+        else:
+            waiting.append(r.suno_next_poll_at)
+
+    batch = settings.SUNO_FEED_BATCH_SIZE
+    feeds = await asyncio.gather(*(
+        suno_service.poll_track([r.suno_task_id for r in due[i:i + batch]])
+        for i in range(0, len(due), batch)
+    ))
+    clips = {clip.get("id"): clip for feed in feeds for clip in feed}
+
+    changes = await asyncio.gather(*(
+        _settle_track(r, clips.get(r.suno_task_id) or {}, now) for r in due
+    ))
+
+    if changes:
+        await _bulk_update_tracks(changes)
+
+    finished = sum(c["suno_status"] != "processing" for c in changes)
+    logger.info(
+        f"Suno poller: {len(due)} of {len(rows)} rendering tracks polled "
+        f"in {-(-len(due) // batch)} request(s), {finished} finished"
+    )
+
+    waiting += [c["suno_next_poll_at"] for c in changes if c["suno_status"] == "processing"]
+    return min(waiting) if waiting else None
@@ -0,0 +1,95 @@
+"""
+One long-lived asyncio event loop per Celery worker process.
+Tasks call run_async(coro) instead of creating or fetching a loop per
+call, so everything cached per loop — the SQLAlchemy async connection
+pool, the Claude gateway's client, pooled httpx clients, Redis clients — survives from one
+task to the next. The loop is created on worker_process_init (after
+fork, so no connections are shared with the parent) and closed, with
+the DB pool and HTTP clients closed, when the process shuts down.
+Solo pools create the loop lazily on the first task.
+
+Only the prefork and solo pools are supported: app.db.session.engine is
+module-global and its async connections are bound to the loop that
+opened them, so it cannot be shared between per-thread loops. A second
+thread asking for a loop (-P threads, or any other thread pool) raises.
+"""
+import asyncio
+import logging
+import threading
+
+import redis.asyncio as redis
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
+
+from app.core.config import settings
+from app.db.session import engine
+from app.services.http_clients import http_clients
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+_owner_thread = None  # ident of the one thread allowed a loop in this process
+
+
+def get_worker_loop() -> asyncio.AbstractEventLoop:
+    global _owner_thread
+    loop = getattr(_local, "loop", None)
+    if loop is None or loop.is_closed():
+        current = threading.get_ident()
+        if _owner_thread not in (None, current):
+            raise RuntimeError(
+                "tasks.worker_loop supports one event loop per process "
+                "(Celery prefork or solo pool); thread pools would share the "
+                "loop-bound DB engine across loops"
+            )
+        _owner_thread = current
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        _local.loop = loop
+        _local.redis = None  # redis.asyncio clients are bound to their loop
+    return loop
+
+
+def run_async(coro):
+    """Run a coroutine to completion on this worker's persistent loop."""
+    return get_worker_loop().run_until_complete(coro)
+
+
+def get_redis() -> redis.Redis:
+    """Redis client bound to this process's worker loop (call from inside run_async)."""
+    client = getattr(_local, "redis", None)
+    if client is None:
+        client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+        _local.redis = client
+    return client
+
+
+@worker_process_init.connect
+def _init_worker_loop(**_):
+    global _owner_thread
+    # Drop any pooled connections inherited from the parent across fork
+    engine.sync_engine.dispose(close=False)
+    _local.loop = None
+    _owner_thread = None
+    get_worker_loop()
+    logger.info("Worker process event loop ready")
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _close_worker_loop(**_):
+    loop = getattr(_local, "loop", None)
+    if loop is None or loop.is_closed():
+        return
+    try:
+        loop.run_until_complete(http_clients.aclose())
+        redis_client = getattr(_local, "redis", None)
+        if redis_client is not None:
+            loop.run_until_complete(redis_client.aclose())
+        loop.run_until_complete(engine.dispose())
+        loop.run_until_complete(loop.shutdown_asyncgens())
+    except Exception as e:
+        logger.warning(f"Error while closing worker event loop: {e}")
+    finally:
+        loop.close()
+        _local.loop = None
+        _local.redis = None